@@ -1,3 +1,28 @@
 # -*- coding: utf-8 -*-
 # Copyright © Felipe Bogaerts de Mattos
 # Contact: me@felipebm.com
+
+# Subpackages are imported on first attribute access (PEP 562), so importing
+# the package itself loads none of their dependencies.
+SUBMODULES = (
+    "benchmarks",
+    "catalog",
+    "config",
+    "export",
+    "modeler",
+    "simulation",
+    "utils",
+    "weather",
+)
+
+
+def __getattr__(name: str):
+    if name in SUBMODULES:
+        import importlib
+
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(SUBMODULES))
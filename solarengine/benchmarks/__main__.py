@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Runs the benchmark suite.
+
+Usage:
+python -m solarengine.benchmarks --output results.json
+python -m solarengine.benchmarks --baseline baseline.json --threshold 1.25
+
+Exits with status 1 if any case is slower than the baseline by more than the
+threshold. On machines whose speed varies between runs (e.g. shared or
+frequency scaled CPUs), "--runs 5" runs the suite 5 times and keeps the
+median of each case, both to record and to check a baseline.
+"""
+
+import argparse
+import sys
+
+from .cases import SCALES, get_benchmarks
+from .runner import (
+    compare_results,
+    load_results,
+    merge_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", help="JSON file to write results to")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=1)
+    arguments = parser.parse_args()
+
+    benchmarks = get_benchmarks(arguments.scales)
+    results = merge_results(
+        [
+            run_benchmarks(benchmarks, repeat=arguments.repeat)
+            for _ in range(arguments.runs)
+        ]
+    )
+    if arguments.output:
+        save_results(arguments.output, results)
+
+    if arguments.baseline:
+        regressions = compare_results(
+            results, load_results(arguments.baseline), arguments.threshold
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
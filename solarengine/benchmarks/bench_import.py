@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Import time of the package modules, measured in a fresh interpreter with
+"python -X importtime". IMPORT_BUDGETS sets the max. cumulative import time
+of the modules used by the sizing calls and the heavy dependencies they must
+not load. The tests only check the dependencies, since wall-clock budgets
+depend on the machine.
+
+Usage: python -m solarengine.benchmarks.bench_import [MODULE ...]
+"""
+
+import os
+import subprocess
+import sys
+
+# Cumulative import time (ms) and modules that must not be loaded, by module
+# relative to the package:
+IMPORT_BUDGETS = {
+    "": (20, ["numpy", "matplotlib"]),
+    "config": (20, ["numpy", "matplotlib"]),
+    "utils": (500, ["matplotlib"]),
+    "utils.plots": (500, ["matplotlib"]),
+    "modeler.plant": (500, ["matplotlib"]),
+}
+
+PACKAGE = __package__.split(".")[0]
+PACKAGE_PARENT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def get_import_times(module: str) -> tuple[list, set[str]]:
+    """
+    Imports the module in a new interpreter.
+
+    :param str module: Module name relative to the package, "" for the
+        package itself
+    :return: Depth, name and cumulative import time (ms) of every module
+        imported, in the order printed by "-X importtime" (children before
+        their parent), and the names of all modules loaded, including the
+        ones loaded at start up
+    :rtype: tuple[list, set[str]]
+    """
+    name = f"{PACKAGE}.{module}" if module else PACKAGE
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {name}; print(' '.join(sys.modules))",
+        ],
+        cwd=PACKAGE_PARENT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, imported = line[len("import time:") :].split("|")
+        depth = (len(imported) - len(imported.lstrip()) - 1) // 2
+        times.append((depth, imported.strip(), int(cumulative) / 1000))
+
+    return times, set(process.stdout.split())
+
+
+def get_module_time(times: list, name: str) -> tuple[float, list]:
+    """
+    :param list times: Result of "get_import_times"
+    :param str name: Full module name
+    :return: Cumulative import time of the module (ms) and the name and
+        time of its direct imports
+    :rtype: tuple[float, list]
+    """
+    for position, (depth, imported, cumulative) in enumerate(times):
+        if imported == name:
+            break
+    else:
+        return 0.0, []
+
+    children = []
+    for child_depth, child, child_time in reversed(times[:position]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 1:
+            children.append((child, child_time))
+    return cumulative, children
+
+
+def check_import_budget(module: str, check_time: bool = True) -> list[str]:
+    """
+    :param str module: Key of IMPORT_BUDGETS
+    :param bool check_time: Also check the import time budget
+    :return: Description of every budget violation, empty if there is none
+    :rtype: list[str]
+    """
+    budget, forbidden = IMPORT_BUDGETS[module]
+    name = f"{PACKAGE}.{module}" if module else PACKAGE
+    times, loaded = get_import_times(module)
+    cumulative, _ = get_module_time(times, name)
+
+    violations = [
+        f"{name} imports {dependency}"
+        for dependency in forbidden
+        if dependency in loaded
+    ]
+    if check_time and cumulative > budget:
+        violations.append(
+            f"{name} takes {cumulative:.1f} ms to import "
+            f"(budget {budget} ms)"
+        )
+    return violations
+
+
+def main(modules: list[str]) -> None:
+    for module in modules or IMPORT_BUDGETS:
+        name = f"{PACKAGE}.{module}" if module else PACKAGE
+        times, _ = get_import_times(module)
+        cumulative, children = get_module_time(times, name)
+        print(f"{name:<48} {cumulative:10.1f} ms")
+        for child, time in sorted(children, key=lambda c: -c[1])[:5]:
+            print(f"    {child:<44} {time:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Memory used by N modules and inverters, stored as dict-backed objects (the
+layout before __slots__), slotted objects and record arrays. Every layout is
+built from the same records, so each item owns its values.
+
+Usage: python -m solarengine.benchmarks.bench_memory
+"""
+
+import tracemalloc
+
+import numpy as np
+
+from ..catalog.schema import record_to_inverter, record_to_module
+from ..modeler.arrays import InverterArray, ModuleArray
+from .bench_plant import get_benchmark_plant
+
+
+class DictBackedObject:
+    """
+    Plain class with an attribute dict, as the equipment classes used to be.
+    """
+
+    def __init__(self, obj) -> None:
+        for name in type(obj).__slots__:
+            value = getattr(obj, name)
+            if hasattr(value, "__slots__"):
+                value = DictBackedObject(value)
+            setattr(self, name, value)
+
+
+def measure(build) -> int:
+    """
+    :return: Bytes still allocated after building the object
+    :rtype: int
+    """
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main(n: int = 100000) -> None:
+    plant = get_benchmark_plant(2)
+
+    modules = ModuleArray.from_modules([plant.module]).records
+    modules = np.repeat(modules, n)
+    modules["model"] = [f"M-{i}".encode() for i in range(n)]
+    modules["nominal_power"] += np.arange(n) % 100
+
+    inverters = InverterArray.from_inverters(plant.inverters).records
+    inverters = np.repeat(inverters, n)
+    inverters["model"] = [f"I-{i}".encode() for i in range(n)]
+
+    cases = {
+        "modules, dict-backed": lambda: [
+            DictBackedObject(record_to_module(r)) for r in modules
+        ],
+        "modules, __slots__": lambda: [record_to_module(r) for r in modules],
+        "modules, ModuleArray": lambda: ModuleArray(modules.copy()),
+        "inverters, dict-backed": lambda: [
+            DictBackedObject(record_to_inverter(r)) for r in inverters
+        ],
+        "inverters, __slots__": lambda: [
+            record_to_inverter(r) for r in inverters
+        ],
+        "inverters, InverterArray": lambda: InverterArray(inverters.copy()),
+    }
+
+    print(f"{n} items")
+    for name, build in cases.items():
+        print(f"{name:>26}: {measure(build) / n:8.1f} bytes/item")
+
+
+if __name__ == "__main__":
+    main()
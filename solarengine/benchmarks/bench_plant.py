@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Per-query cost of the PowerPlant derived aggregates as the number of strings
+grows. With the plant cache, only the first query pays for the string layout;
+repeated queries stay flat regardless of the string count.
+
+Usage: python -m solarengine.benchmarks.bench_plant
+"""
+
+import time
+
+from ..modeler.generic import Brand, PhysicalProperties
+from ..modeler.inverter import Inverter
+from ..modeler.module import Module
+from ..modeler.plant import PowerPlant
+
+
+def get_benchmark_plant(string_count: int) -> PowerPlant:
+    module = Module(
+        brand=Brand(name="Trina Solar", model="TSM-410"),
+        nominal_power=410,
+        v_oc=50.0,
+        i_sc=10.25,
+        v_max=42.6,
+        i_max=9.63,
+        ppt=0.37,
+        efficiency=20.0,
+        area=2,
+    )
+    inverter = Inverter(
+        brand=Brand(name="Generic", model=f"CENTRAL-{string_count}"),
+        category="central",
+        v_dc_max=1500,
+        voltage_range_mppt="500-1300 V",
+        p_dc_max_input=string_count * 9000,
+        v_dc_start=550,
+        i_dc_max=string_count * 12,
+        string_count=string_count,
+        p_max=string_count * 6000,
+        i_ac_max=100,
+        p_ac_nom=string_count * 6000,
+        v_ac_nom=380,
+        freq=60,
+        efficiency_mppt=0.99,
+        efficiency_max=0.98,
+        physical_properties=PhysicalProperties(
+            weight=1000, width=2000, height=2000, depth=1000
+        ),
+    )
+    return PowerPlant(
+        module=module,
+        inverters=[inverter],
+        inverter_count=[1],
+        module_count=string_count * 18,
+        din_padrao=60,
+        din_geral=60,
+        coordinates=[-22.02, -42.02],
+        inv_boolean=0,
+    )
+
+
+def query(plant: PowerPlant) -> None:
+    plant.pv_strings
+    plant.get_different_pv_strings()
+    plant.get_number_of_strings()
+    plant.get_inverter_output_power()
+
+
+def time_per_query(plant: PowerPlant, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        plant.pv_strings
+        plant.get_number_of_strings()
+        plant.get_inverter_output_power()
+        plant.get_din_list_plant()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    print(f"{'strings':>8} {'first query (ms)':>18} {'cached query (us)':>18}")
+    for string_count in (2, 20, 200, 2000):
+        plant = get_benchmark_plant(string_count)
+
+        start = time.perf_counter()
+        query(plant)
+        first = time.perf_counter() - start
+
+        cached = time_per_query(plant, repeat=10000)
+        print(f"{string_count:>8} {first * 1e3:>18.3f} {cached * 1e6:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import math
+
+from ..modeler.generic import Brand, PhysicalProperties
+from ..modeler.inverter import Inverter
+from ..modeler.module import Module
+from ..modeler.plant import PowerPlant
+from ..utils import (
+    get_geracao_anual,
+    get_geracao_mensal,
+    get_irradiacao_mensal,
+)
+from .runner import Benchmark
+
+# Plant sizes (W) and their inverter models: nominal power (W), strings per
+# inverter, max. output current (A) and number of units.
+SCALES = {
+    "residential": (5000, [(5000, 2, 20.8, 1)]),
+    "commercial": (75000, [(25000, 6, 36.0, 2), (20000, 4, 30.0, 1)]),
+    "1MW": (1000000, [(100000, 20, 150.0, 8), (60000, 12, 90.0, 4)]),
+    "5MW": (5000000, [(100000, 24, 150.0, 40), (60000, 16, 90.0, 17)]),
+}
+
+
+def get_scaled_plant(scale: str) -> PowerPlant:
+    """
+    :param str scale: Key of SCALES
+    :return: Plant with the given size, from 2 to thousands of strings
+    :rtype: PowerPlant
+    """
+    power, inverter_models = SCALES[scale]
+    module = Module(
+        brand=Brand(name="Trina Solar", model="TSM-410"),
+        nominal_power=410,
+        v_oc=50.0,
+        i_sc=10.25,
+        v_max=42.6,
+        i_max=9.63,
+        ppt=0.37,
+        efficiency=20.0,
+        area=2,
+    )
+    inverters = [
+        Inverter(
+            brand=Brand(name="Generic", model=f"INV-{p_ac_nom / 1000:g}K"),
+            category="central",
+            v_dc_max=1000,
+            voltage_range_mppt="200-850 V",
+            p_dc_max_input=p_ac_nom * 1.5,
+            v_dc_start=150,
+            i_dc_max=string_count * 12,
+            string_count=string_count,
+            p_max=p_ac_nom,
+            i_ac_max=i_ac_max,
+            p_ac_nom=p_ac_nom,
+            v_ac_nom=380,
+            freq=60,
+            efficiency_mppt=0.99,
+            efficiency_max=0.98,
+            physical_properties=PhysicalProperties(
+                weight=60, width=700, height=600, depth=300
+            ),
+        )
+        for p_ac_nom, string_count, i_ac_max, _ in inverter_models
+    ]
+    return PowerPlant(
+        module=module,
+        inverters=inverters,
+        inverter_count=[count for *_, count in inverter_models],
+        module_count=math.ceil(power / module.nominal_power),
+        din_padrao=60,
+        din_geral=60,
+        coordinates=[-22.02, -42.02],
+        inv_boolean=0,
+    )
+
+
+def get_uncached_plant(scale: str):
+    """
+    :return: Setup function returning a plant with an empty cache
+    """
+    plant = get_scaled_plant(scale)
+
+    def setup():
+        plant.clear_cache()
+        return plant
+
+    return setup
+
+
+def get_benchmarks(scales: list[str] | None = None) -> list[Benchmark]:
+    """
+    :param list[str] | None scales: Keys of SCALES, defaults to all
+    :return: Benchmarks of the modeler and utils hot paths at every scale
+    :rtype: list[Benchmark]
+    """
+    if scales is None:
+        scales = list(SCALES)
+
+    benchmarks = []
+    for scale in scales:
+        plant = get_scaled_plant(scale)
+        uncached = get_uncached_plant(scale)
+        irradiacao_mensal = get_irradiacao_mensal()
+        geracao_mensal = get_geracao_mensal(
+            plant.module.nominal_power, plant.module_count, irradiacao_mensal
+        )
+
+        benchmarks += [
+            Benchmark(
+                f"plant_construction[{scale}]",
+                lambda scale=scale: get_scaled_plant(scale),
+            ),
+            Benchmark(
+                f"pv_strings[{scale}]",
+                lambda plant: plant.pv_strings,
+                uncached,
+            ),
+            Benchmark(
+                f"get_different_pv_strings[{scale}]",
+                lambda plant: plant.get_different_pv_strings(),
+                uncached,
+            ),
+            Benchmark(
+                f"distribute_panels_by_inverter[{scale}]",
+                lambda plant: plant.distribute_panels_by_inverter(),
+                uncached,
+            ),
+            Benchmark(
+                f"get_din_list_plant[{scale}]",
+                lambda plant: plant.get_din_list_plant(),
+                uncached,
+            ),
+            Benchmark(
+                f"get_geracao_mensal[{scale}]",
+                lambda plant=plant: get_geracao_mensal(
+                    plant.module.nominal_power,
+                    plant.module_count,
+                    irradiacao_mensal,
+                ),
+            ),
+            Benchmark(
+                f"get_geracao_anual[{scale}]",
+                lambda geracao_mensal=geracao_mensal: get_geracao_anual(
+                    geracao_mensal, 25, 0.01
+                ),
+            ),
+        ]
+
+    return benchmarks
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import json
+import platform
+import statistics
+import time
+
+import numpy as np
+
+
+class Benchmark:
+    """
+    Single benchmark case. "setup" builds the argument of "function" and is
+    not timed, so each call can start from a clean state (e.g. an empty
+    plant cache).
+    """
+
+    def __init__(self, name: str, function, setup=None) -> None:
+        """
+        :param str name: Unique name of the case, e.g. "pv_strings[5MW]"
+        :param function: Timed function, called with the setup result
+        :param setup: Function without arguments, defaults to no argument
+        """
+        self.name = name
+        self.function = function
+        self.setup = setup
+
+    def time_once(self) -> float:
+        """
+        :return: Duration of one call of the function (s)
+        :rtype: float
+        """
+        if self.setup is None:
+            start = time.perf_counter()
+            self.function()
+        else:
+            argument = self.setup()
+            start = time.perf_counter()
+            self.function(argument)
+        return time.perf_counter() - start
+
+    def run(self, repeat: int = 7, min_time: float = 0.05) -> dict:
+        """
+        Times the case "repeat" times. Each repeat runs the function enough
+        times to last at least min_time and records the mean of the calls.
+
+        :param int repeat: Number of repeats
+        :param float min_time: Min. duration of each repeat (s)
+        :return: Min., median and max. time per call (s), and calls timed
+        :rtype: dict
+        """
+        first = self.time_once()
+        loops = max(1, int(min_time / max(first, 1e-9)))
+
+        samples = []
+        for _ in range(repeat):
+            samples.append(sum(self.time_once() for _ in range(loops)) / loops)
+
+        return {
+            "min": min(samples),
+            "median": statistics.median(samples),
+            "max": max(samples),
+            "loops": loops * repeat,
+        }
+
+
+def run_benchmarks(
+    benchmarks: list[Benchmark],
+    repeat: int = 7,
+    min_time: float = 0.05,
+    verbose: bool = True,
+) -> dict:
+    """
+    :param list[Benchmark] benchmarks: Cases to run
+    :param int repeat: Number of repeats of each case
+    :param float min_time: Min. duration of each repeat (s)
+    :param bool verbose: Print each result as it finishes
+    :return: Results, in the format written by "save_results"
+    :rtype: dict
+    """
+    results = {}
+    for benchmark in benchmarks:
+        results[benchmark.name] = benchmark.run(repeat, min_time)
+        if verbose:
+            print(
+                f"{benchmark.name:<48} "
+                f"{results[benchmark.name]['median'] * 1e3:12.4f} ms"
+            )
+
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "cases": results,
+    }
+
+
+def merge_results(runs: list[dict]) -> dict:
+    """
+    Combines runs of the same cases, e.g. to record a baseline on a machine
+    whose speed varies between runs.
+
+    :param list[dict] runs: Results of "run_benchmarks"
+    :return: Results with the median of the medians of each case, and the
+        min. and max. of every run
+    :rtype: dict
+    """
+    cases = {}
+    for name in runs[0]["cases"]:
+        samples = [run["cases"][name] for run in runs]
+        cases[name] = {
+            "min": min(sample["min"] for sample in samples),
+            "median": statistics.median(
+                sample["median"] for sample in samples
+            ),
+            "max": max(sample["max"] for sample in samples),
+            "loops": sum(sample["loops"] for sample in samples),
+        }
+    return {"machine": runs[0]["machine"], "cases": cases}
+
+
+def save_results(path: str, results: dict) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(
+    results: dict, baseline: dict, threshold: float = 1.25
+) -> list[str]:
+    """
+    Compares the median time of each case with the baseline. A case of the
+    baseline may define its own "threshold", overriding the default one.
+
+    :param dict results: Results of "run_benchmarks"
+    :param dict baseline: Results saved from a previous run
+    :param float threshold: Max. accepted ratio between current and
+        baseline medians
+    :return: Description of every regression, empty if there is none
+    :rtype: list[str]
+    """
+    regressions = []
+    for name, reference in baseline["cases"].items():
+        if name not in results["cases"]:
+            continue
+        ratio = results["cases"][name]["median"] / reference["median"]
+        if ratio > reference.get("threshold", threshold):
+            regressions.append(
+                f"{name}: {ratio:.2f}x slower than baseline "
+                f"({results['cases'][name]['median'] * 1e3:.4f} ms vs "
+                f"{reference['median'] * 1e3:.4f} ms)"
+            )
+    return regressions
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+On-disk equipment catalog.
+
+A catalog is a directory of NumPy ".npy" files that are memory-mapped on
+load, so opening it costs the same regardless of the number of entries and
+only the pages touched by a query are read:
+
+- metadata.json: kind of equipment and indexed fields
+- records.npy: structured array (see schema.py), sorted by brand/model
+- keys.npy: sorted "brand<TAB>model" UTF-8 keys, for exact lookups
+- index_<field>.npy: positions of the records sorted by <field>
+- sorted_<field>.npy: values of <field> in the same order, for range queries
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from ..modeler.arrays import InverterArray, ModuleArray
+from ..modeler.inverter import Inverter
+from ..modeler.module import Module
+from .schema import (
+    INVERTER_DTYPE,
+    MODULE_DTYPE,
+    inverters_to_records,
+    modules_to_records,
+    record_to_inverter,
+    record_to_module,
+)
+
+DEFAULT_INDEXES = {
+    "module": ["nominal_power"],
+    "inverter": ["p_ac_nom", "v_dc_max", "string_count"],
+}
+
+
+def get_keys(brands: np.ndarray, models: np.ndarray) -> np.ndarray:
+    """
+    :return: Lookup keys of the given brand and model names
+    :rtype: np.ndarray
+    """
+    return np.char.add(np.char.add(brands, b"\t"), models)
+
+
+def write_catalog(
+    directory: str,
+    equipment: list[Module] | list[Inverter] | np.ndarray,
+    indexes: list[str] | None = None,
+) -> None:
+    """
+    Writes a catalog from Module/Inverter objects or from a structured array
+    with MODULE_DTYPE or INVERTER_DTYPE.
+
+    :param str directory: Catalog directory, created if needed
+    :param equipment: Modules or inverters of the catalog
+    :param list[str] | None indexes: Numeric fields to index for range
+        queries, defaults to DEFAULT_INDEXES
+    :raises Exception: If the equipment type is not recognized or two
+        entries share the same brand and model
+    """
+    if isinstance(equipment, np.ndarray):
+        records = equipment
+    elif all(isinstance(item, Module) for item in equipment):
+        records = modules_to_records(equipment)
+    elif all(isinstance(item, Inverter) for item in equipment):
+        records = inverters_to_records(equipment)
+    else:
+        raise Exception("Catalog must contain only modules or inverters.")
+
+    if records.dtype == MODULE_DTYPE:
+        kind = "module"
+    elif records.dtype == INVERTER_DTYPE:
+        kind = "inverter"
+    else:
+        raise Exception("Catalog records have an unknown dtype.")
+
+    if indexes is None:
+        indexes = DEFAULT_INDEXES[kind]
+
+    keys = get_keys(records["brand"], records["model"])
+    order = np.argsort(keys, kind="stable")
+    records = records[order]
+    keys = keys[order]
+    if len(keys) > 1 and np.any(keys[1:] == keys[:-1]):
+        raise Exception("Catalog has repeated brand and model entries.")
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "records.npy"), records)
+    np.save(os.path.join(directory, "keys.npy"), keys)
+    for field in indexes:
+        index = np.argsort(records[field], kind="stable").astype(np.int64)
+        np.save(os.path.join(directory, f"index_{field}.npy"), index)
+        np.save(
+            os.path.join(directory, f"sorted_{field}.npy"),
+            np.ascontiguousarray(records[field][index]),
+        )
+
+    with open(os.path.join(directory, "metadata.json"), "w") as file:
+        json.dump({"kind": kind, "indexes": list(indexes)}, file)
+
+
+class EquipmentCatalog(ABC):
+    """
+    Memory-mapped catalog of modules or inverters. Use "load_catalog" to
+    open a catalog directory.
+    """
+
+    def __init__(self, directory: str, indexes: list[str]) -> None:
+        """
+        :param str directory: Catalog directory
+        :param list[str] indexes: Indexed numeric fields
+        """
+        self.directory = directory
+        self.records = self.load("records")
+        self.keys = self.load("keys")
+        self.indexes = {
+            field: (self.load(f"index_{field}"), self.load(f"sorted_{field}"))
+            for field in indexes
+        }
+
+    def load(self, name: str) -> np.ndarray:
+        return np.load(
+            os.path.join(self.directory, f"{name}.npy"), mmap_mode="r"
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> Module | Inverter:
+        return self.to_object(self.records[index])
+
+    @abstractmethod
+    def to_object(self, record: np.void) -> Module | Inverter:
+        """
+        :param np.void record: Record of the catalog
+        :return: Module or Inverter class object
+        """
+
+    def lookup(self, brand: str, model: str) -> int | None:
+        """
+        :param str brand: Brand name
+        :param str model: Model name
+        :return: Position of the entry in the catalog, None if not found
+        :rtype: int | None
+        """
+        key = f"{brand}\t{model}".encode("utf-8")
+        index = int(np.searchsorted(self.keys, key))
+        if index < len(self.keys) and self.keys[index] == key:
+            return index
+        return None
+
+    def get(self, brand: str, model: str) -> Module | Inverter:
+        """
+        :param str brand: Brand name
+        :param str model: Model name
+        :return: Module or Inverter class object
+        :raises KeyError: If the entry is not in the catalog
+        """
+        index = self.lookup(brand, model)
+        if index is None:
+            raise KeyError(f"{brand} {model}")
+        return self[index]
+
+    def range_query(
+        self,
+        field: str,
+        low: float | None = None,
+        high: float | None = None,
+    ) -> np.ndarray:
+        """
+        :param str field: Indexed numeric field
+        :param float | None low: Min. value, inclusive
+        :param float | None high: Max. value, inclusive
+        :return: Positions of the entries with low <= field <= high, sorted
+            by field
+        :rtype: np.ndarray
+        :raises Exception: If the field is not indexed
+        """
+        try:
+            index, values = self.indexes[field]
+        except KeyError:
+            raise Exception(f'Field "{field}" is not indexed.')
+        start = 0 if low is None else np.searchsorted(values, low, "left")
+        stop = (
+            len(values)
+            if high is None
+            else np.searchsorted(values, high, "right")
+        )
+        return np.asarray(index[start:stop])
+
+    def query(self, **ranges: tuple[float | None, float | None]) -> np.ndarray:
+        """
+        Example:
+        catalog.query(p_ac_nom=(3000, 6000), string_count=(2, None))
+
+        :return: Positions of the entries within every given range, sorted
+        :rtype: np.ndarray
+        """
+        result = None
+        for field, (low, high) in ranges.items():
+            positions = self.range_query(field, low, high)
+            if result is None:
+                result = np.sort(positions)
+            else:
+                result = np.intersect1d(result, positions, assume_unique=True)
+        if result is None:
+            return np.arange(len(self))
+        return result
+
+
+class ModuleCatalog(EquipmentCatalog):
+    def to_object(self, record: np.void) -> Module:
+        return record_to_module(record)
+
+    def to_array(self) -> ModuleArray:
+        """
+        :return: Memory-mapped view of the whole catalog
+        :rtype: ModuleArray
+        """
+        return ModuleArray(self.records)
+
+
+class InverterCatalog(EquipmentCatalog):
+    def to_object(self, record: np.void) -> Inverter:
+        return record_to_inverter(record)
+
+    def to_array(self) -> InverterArray:
+        """
+        :return: Memory-mapped view of the whole catalog
+        :rtype: InverterArray
+        """
+        return InverterArray(self.records)
+
+
+def load_catalog(directory: str) -> ModuleCatalog | InverterCatalog:
+    """
+    :param str directory: Catalog directory written by "write_catalog"
+    :return: Memory-mapped catalog
+    :rtype: ModuleCatalog | InverterCatalog
+    :raises Exception: If the kind of equipment is unknown
+    """
+    with open(os.path.join(directory, "metadata.json")) as file:
+        metadata = json.load(file)
+
+    if metadata["kind"] == "module":
+        return ModuleCatalog(directory, metadata["indexes"])
+    elif metadata["kind"] == "inverter":
+        return InverterCatalog(directory, metadata["indexes"])
+    else:
+        raise Exception(f'Unknown catalog kind "{metadata["kind"]}".')
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ..modeler.efficiency import EfficiencyCurve
+from ..modeler.generic import Brand, PhysicalProperties
+from ..modeler.inverter import Inverter
+from ..modeler.module import Module
+
+# Efficiency curves are stored with up to CURVE_VOLTAGES rows of
+# CURVE_POINTS loads, like the datasheet tables of 6 loads at 3 DC voltages,
+# padded with NaN. Inverters without a curve have NaN loads.
+CURVE_POINTS = 8
+CURVE_VOLTAGES = 3
+
+MODULE_DTYPE = np.dtype(
+    [
+        ("brand", "S32"),
+        ("model", "S64"),
+        ("nominal_power", "f8"),
+        ("v_oc", "f8"),
+        ("i_sc", "f8"),
+        ("v_max", "f8"),
+        ("i_max", "f8"),
+        ("ppt", "f8"),
+        ("efficiency", "f8"),
+        ("area", "f8"),
+    ]
+)
+
+INVERTER_DTYPE = np.dtype(
+    [
+        ("brand", "S32"),
+        ("model", "S64"),
+        ("category", "S16"),
+        ("v_dc_max", "f8"),
+        ("voltage_range_mppt", "S32"),
+        ("v_mppt_min", "f8"),
+        ("v_mppt_max", "f8"),
+        ("p_dc_max_input", "f8"),
+        ("v_dc_start", "f8"),
+        ("i_dc_max", "f8"),
+        ("string_count", "i4"),
+        ("p_max", "f8"),
+        ("i_ac_max", "f8"),
+        ("p_ac_nom", "f8"),
+        ("v_ac_nom", "f8"),
+        ("freq", "f8"),
+        ("efficiency_mppt", "f8"),
+        ("efficiency_max", "f8"),
+        ("weight", "f8"),
+        ("width", "f8"),
+        ("height", "f8"),
+        ("depth", "f8"),
+        ("curve_load", "f8", (CURVE_POINTS,)),
+        ("curve_efficiency", "f8", (CURVE_VOLTAGES, CURVE_POINTS)),
+        ("curve_voltage", "f8", (CURVE_VOLTAGES,)),
+        ("curve_resolution", "i4"),
+    ]
+)
+
+MODULE_FIELDS = [
+    "nominal_power",
+    "v_oc",
+    "i_sc",
+    "v_max",
+    "i_max",
+    "ppt",
+    "efficiency",
+    "area",
+]
+
+INVERTER_FIELDS = [
+    "category",
+    "v_dc_max",
+    "voltage_range_mppt",
+    "p_dc_max_input",
+    "v_dc_start",
+    "i_dc_max",
+    "string_count",
+    "p_max",
+    "i_ac_max",
+    "p_ac_nom",
+    "v_ac_nom",
+    "freq",
+    "efficiency_mppt",
+    "efficiency_max",
+]
+
+PHYSICAL_PROPERTIES_FIELDS = ["weight", "width", "height", "depth"]
+
+
+def to_record_value(value, dtype: np.dtype | None = None):
+    """
+    Text is stored as UTF-8 bytes, which takes a quarter of the space of
+    NumPy unicode strings. NumPy silently truncates bytes longer than the
+    field, possibly inside a multi-byte character, so they are rejected.
+
+    :param value: Value of an equipment attribute
+    :param np.dtype | None dtype: Dtype of the record field, e.g.
+        MODULE_DTYPE["model"], to check the length of text
+    :return: Value to store in the record
+    :raises Exception: If text does not fit the field
+    """
+    if isinstance(value, str):
+        encoded = value.encode("utf-8")
+        if dtype is not None and len(encoded) > dtype.itemsize:
+            raise Exception(
+                f'"{value}" has {len(encoded)} bytes in UTF-8, more than the '
+                f"{dtype.itemsize} of its record field."
+            )
+        return encoded
+    return value
+
+
+def from_record_value(value):
+    """
+    :param value: Item of a record, as returned by ".item()"
+    :return: Value as used by the equipment classes
+    """
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+def modules_to_records(modules: list[Module]) -> np.ndarray:
+    """
+    :param list[Module] modules: Module class objects
+    :return: Structured array with MODULE_DTYPE
+    :rtype: np.ndarray
+    :raises Exception: If a name does not fit its field
+    """
+    return np.array(
+        [
+            (
+                to_record_value(m.brand.name, MODULE_DTYPE["brand"]),
+                to_record_value(m.brand.model, MODULE_DTYPE["model"]),
+            )
+            + tuple(getattr(m, field) for field in MODULE_FIELDS)
+            for m in modules
+        ],
+        dtype=MODULE_DTYPE,
+    )
+
+
+def write_curve(record: np.void, curve: EfficiencyCurve | None) -> None:
+    """
+    :param np.void record: Record with INVERTER_DTYPE, written in place
+    :param EfficiencyCurve | None curve: Efficiency curve of the inverter
+    :raises Exception: If the curve has more points or voltages than its
+        fields
+    """
+    record["curve_load"] = np.nan
+    record["curve_efficiency"] = np.nan
+    record["curve_voltage"] = np.nan
+    record["curve_resolution"] = 0
+    if curve is None:
+        return
+
+    voltages, points = curve.efficiency.shape
+    if points > CURVE_POINTS or voltages > CURVE_VOLTAGES:
+        raise Exception(
+            f"Efficiency curves are limited to {CURVE_POINTS} loads at "
+            f"{CURVE_VOLTAGES} voltages, got {points} at {voltages}."
+        )
+    record["curve_load"][:points] = curve.load
+    record["curve_efficiency"][:voltages, :points] = curve.efficiency
+    if curve.voltage is not None:
+        record["curve_voltage"][:voltages] = curve.voltage
+    record["curve_resolution"] = curve.table.shape[1] - 1
+
+
+def record_to_curve(record: np.void) -> EfficiencyCurve | None:
+    """
+    :param np.void record: Record with INVERTER_DTYPE
+    :return: Efficiency curve of the inverter, None if it has none
+    :rtype: EfficiencyCurve | None
+    """
+    load = record["curve_load"]
+    points = np.count_nonzero(~np.isnan(load))
+    if not points:
+        return None
+
+    voltage = record["curve_voltage"]
+    voltages = np.count_nonzero(~np.isnan(voltage))
+    return EfficiencyCurve(
+        load[:points],
+        record["curve_efficiency"][: max(voltages, 1), :points],
+        voltage[:voltages] if voltages else None,
+        resolution=int(record["curve_resolution"]),
+    )
+
+
+def inverters_to_records(inverters: list[Inverter]) -> np.ndarray:
+    """
+    :param list[Inverter] inverters: Inverter class objects
+    :return: Structured array with INVERTER_DTYPE
+    :rtype: np.ndarray
+    :raises Exception: If a name or efficiency curve does not fit its field
+    """
+    records = np.zeros(len(inverters), dtype=INVERTER_DTYPE)
+    for record, inv in zip(records, inverters):
+        record["brand"] = to_record_value(
+            inv.brand.name, INVERTER_DTYPE["brand"]
+        )
+        record["model"] = to_record_value(
+            inv.brand.model, INVERTER_DTYPE["model"]
+        )
+        record["v_mppt_min"] = inv.v_mppt_min
+        record["v_mppt_max"] = inv.v_mppt_max
+        for field in INVERTER_FIELDS:
+            record[field] = to_record_value(
+                getattr(inv, field), INVERTER_DTYPE[field]
+            )
+        for field in PHYSICAL_PROPERTIES_FIELDS:
+            record[field] = getattr(inv.physical_properties, field)
+        write_curve(record, inv.efficiency_curve)
+    return records
+
+
+def record_to_brand(record: np.void) -> Brand:
+    """
+    :param np.void record: Record with MODULE_DTYPE or INVERTER_DTYPE
+    :return: Brand class object
+    :rtype: Brand
+    """
+    return Brand(
+        name=from_record_value(record["brand"].item()),
+        model=from_record_value(record["model"].item()),
+    )
+
+
+def record_to_module(record: np.void) -> Module:
+    """
+    :param np.void record: Record with MODULE_DTYPE
+    :return: Module class object
+    :rtype: Module
+    """
+    return Module(
+        brand=record_to_brand(record),
+        **{field: record[field].item() for field in MODULE_FIELDS},
+    )
+
+
+def record_to_inverter(record: np.void) -> Inverter:
+    """
+    :param np.void record: Record with INVERTER_DTYPE
+    :return: Inverter class object
+    :rtype: Inverter
+    """
+    return Inverter(
+        brand=record_to_brand(record),
+        physical_properties=PhysicalProperties(
+            **{
+                field: record[field].item()
+                for field in PHYSICAL_PROPERTIES_FIELDS
+            }
+        ),
+        efficiency_curve=record_to_curve(record),
+        **{
+            field: from_record_value(record[field].item())
+            for field in INVERTER_FIELDS
+        },
+    )
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Export of fleets of plants and their results to column tables (see
+tables.py). A fleet directory holds 3 tables, linked by "plant_index", the
+position of the plant in the fleet:
+
+- plants: module, counts, coordinates, protection settings and info of each
+  plant
+- inverters: one row per inverter model of each plant
+- strings: one row per string of each plant (PVString layout)
+
+Simulation results are written to tables of their own, with one row per
+plant and the time series as columns.
+"""
+
+import os
+
+import numpy as np
+
+from ..catalog.schema import (
+    INVERTER_DTYPE,
+    MODULE_DTYPE,
+    from_record_value,
+    inverters_to_records,
+    modules_to_records,
+    record_to_inverter,
+    record_to_module,
+    to_record_value,
+)
+from ..modeler.plant import PowerPlant, PowerPlantInfo
+from ..simulation.power import PowerOutput
+from .tables import ColumnTable, read_metadata, truncate_table, write_table
+
+# Text of PowerPlantInfo, in UTF-8. None is stored as an empty string:
+INFO_DTYPE = np.dtype(
+    [
+        ("address", "S128"),
+        ("plant_id", "S64"),
+        ("class_type", "S64"),
+        ("subgroup", "S16"),
+        ("structural_type", "S64"),
+        ("power_company", "S64"),
+    ]
+)
+
+
+def get_fleet_tables(directory: str) -> tuple[str, str, str]:
+    return tuple(
+        os.path.join(directory, table)
+        for table in ("plants", "inverters", "strings")
+    )
+
+
+def info_to_records(plants: list[PowerPlant]) -> np.ndarray:
+    """
+    :param list[PowerPlant] plants: PowerPlant class objects
+    :return: Structured array with INFO_DTYPE, empty for plants without info
+    :rtype: np.ndarray
+    :raises Exception: If a text does not fit its field
+    """
+    records = np.zeros(len(plants), dtype=INFO_DTYPE)
+    for record, plant in zip(records, plants):
+        if plant.info is None:
+            continue
+        for field in INFO_DTYPE.names:
+            value = getattr(plant.info, field)
+            if value is not None:
+                record[field] = to_record_value(value, INFO_DTYPE[field])
+    return records
+
+
+def record_to_info(record: np.void, has_info: bool) -> PowerPlantInfo | None:
+    """
+    :param np.void record: Record with INFO_DTYPE
+    :param bool has_info: Whether the plant had info
+    :return: Info of the plant, with empty texts read as None
+    :rtype: PowerPlantInfo | None
+    """
+    if not has_info:
+        return None
+    return PowerPlantInfo(
+        **{
+            field: from_record_value(record[field].item()) or None
+            for field in INFO_DTYPE.names
+        }
+    )
+
+
+def write_plants(
+    directory: str, plants: list[PowerPlant], append: bool = False
+) -> np.ndarray:
+    """
+    :param str directory: Fleet directory, created if needed
+    :param list[PowerPlant] plants: PowerPlant class objects
+    :param bool append: Adds the plants to an existing fleet
+    :return: Plant index of each plant written, empty and without writing
+        anything if there are no plants
+    :rtype: np.ndarray
+    :raises Exception: If a text does not fit its field
+    """
+    plants_path, inverters_path, strings_path = get_fleet_tables(directory)
+
+    metadata = read_metadata(plants_path) if append else None
+    start = 0 if metadata is None else sum(metadata["parts"])
+    plant_index = np.arange(start, start + len(plants))
+    if not plants:
+        return plant_index
+
+    if append:
+        # Rows of an interrupted append index plants from start on, which
+        # would be taken by the plants written now:
+        for path in (inverters_path, strings_path):
+            if read_metadata(path) is not None:
+                truncate_table(
+                    path,
+                    np.searchsorted(
+                        ColumnTable(path).read("plant_index"), start
+                    ),
+                )
+
+    modules = modules_to_records([plant.module for plant in plants])
+    plant_columns = {
+        "plant_index": plant_index,
+        "module_count": np.array([p.module_count for p in plants]),
+        "din_padrao": np.array([p.din_padrao for p in plants]),
+        "din_geral": np.array([p.din_geral for p in plants]),
+        "inv_boolean": np.array([p.inv_boolean for p in plants]),
+        "coordinates": np.array(
+            [
+                [np.nan, np.nan] if p.coordinates is None else p.coordinates
+                for p in plants
+            ],
+            dtype=float,
+        ).reshape(len(plants), 2),
+        "has_info": np.array([p.info is not None for p in plants]),
+    }
+    plant_columns.update(
+        {f"module_{name}": modules[name] for name in MODULE_DTYPE.names}
+    )
+    info = info_to_records(plants)
+    plant_columns.update(
+        {f"info_{name}": info[name] for name in INFO_DTYPE.names}
+    )
+
+    inverter_plants = np.repeat(
+        plant_index, [len(plant.inverters) for plant in plants]
+    )
+    inverters = inverters_to_records(
+        [inv for plant in plants for inv in plant.inverters]
+    )
+    inverter_columns = {
+        "plant_index": inverter_plants,
+        "inverter_count": np.concatenate(
+            [plant.inverter_count for plant in plants]
+        ).astype(int),
+    }
+    inverter_columns.update(
+        {name: inverters[name] for name in INVERTER_DTYPE.names}
+    )
+
+    layouts = [plant.string_layout for plant in plants]
+    string_columns = {
+        "plant_index": np.repeat(
+            plant_index, [len(layout) for layout in layouts]
+        ),
+        "inverter_index": np.concatenate(
+            [layout.inverter_index for layout in layouts]
+        ),
+        "unit_index": np.concatenate(
+            [layout.unit_index for layout in layouts]
+        ),
+        "module_count": np.concatenate(
+            [layout.module_count for layout in layouts]
+        ),
+    }
+
+    # Plants last, so the rows of an interrupted append belong to no plant
+    # and are truncated by the next append:
+    write_table(strings_path, string_columns, append)
+    write_table(inverters_path, inverter_columns, append)
+    write_table(plants_path, plant_columns, append)
+    return plant_index
+
+
+def get_records(table: ColumnTable, dtype: np.dtype, prefix: str = ""):
+    """
+    :return: Structured array with dtype from the columns of the table
+    :rtype: np.ndarray
+    """
+    records = np.empty(len(table), dtype=dtype)
+    for name in dtype.names:
+        records[name] = table.read(f"{prefix}{name}")
+    return records
+
+
+def read_plants(directory: str) -> list[PowerPlant]:
+    """
+    Rebuilds the PowerPlant objects of a fleet. Columns can be read
+    directly, without building objects, with "read_fleet".
+
+    :param str directory: Fleet directory
+    :return: PowerPlant class objects, by plant index
+    :rtype: list[PowerPlant]
+    """
+    plants, inverters, _ = read_fleet(directory)
+
+    modules = get_records(plants, MODULE_DTYPE, "module_")
+    inverter_records = get_records(inverters, INVERTER_DTYPE)
+    info = get_records(plants, INFO_DTYPE, "info_")
+    has_info = plants.read("has_info")
+    inverter_count = inverters.read("inverter_count")
+    bounds = np.searchsorted(
+        inverters.read("plant_index"),
+        np.append(plants.read("plant_index"), len(plants)),
+    )
+
+    # Coordinates of plants without them are NaN:
+    coordinates = [
+        None if np.isnan(pair).any() else pair.tolist()
+        for pair in plants.read("coordinates")
+    ]
+    columns = {
+        name: plants.read(name)
+        for name in ("module_count", "din_padrao", "din_geral", "inv_boolean")
+    }
+    return [
+        PowerPlant(
+            module=record_to_module(modules[i]),
+            inverters=[
+                record_to_inverter(record)
+                for record in inverter_records[bounds[i] : bounds[i + 1]]
+            ],
+            inverter_count=inverter_count[bounds[i] : bounds[i + 1]],
+            coordinates=coordinates[i],
+            info=record_to_info(info[i], has_info[i]),
+            **{name: column[i] for name, column in columns.items()},
+        )
+        for i in range(len(plants))
+    ]
+
+
+def read_fleet(directory: str) -> tuple[ColumnTable, ColumnTable, ColumnTable]:
+    """
+    :param str directory: Fleet directory
+    :return: Plants, inverters and strings tables
+    :rtype: tuple[ColumnTable, ColumnTable, ColumnTable]
+    """
+    return tuple(ColumnTable(path) for path in get_fleet_tables(directory))
+
+
+def write_power_outputs(
+    directory: str,
+    outputs: list[PowerOutput],
+    plant_index,
+    append: bool = False,
+) -> None:
+    """
+    :param str directory: Table directory, created if needed
+    :param list[PowerOutput] outputs: Results of "simulate_power", all with
+        the same number of timesteps
+    :param plant_index: Plant index of each result, e.g. returned by
+        "write_plants"
+    :param bool append: Adds the results to an existing table
+    """
+    write_table(
+        directory,
+        {
+            "plant_index": np.asarray(plant_index, dtype=int),
+            "timestep": np.array([output.timestep for output in outputs]),
+            "dc_power": np.array([output.dc_power for output in outputs]),
+            "ac_power": np.array([output.ac_power for output in outputs]),
+            "clipped_power": np.array(
+                [
+                    (
+                        np.full(len(output.dc_power), np.nan)
+                        if output.clipped_power is None
+                        else output.clipped_power
+                    )
+                    for output in outputs
+                ]
+            ),
+        },
+        append,
+    )
+
+
+def read_power_outputs(directory: str) -> list[PowerOutput]:
+    """
+    :param str directory: Table directory
+    :return: Power outputs, whose arrays are views of the table
+    :rtype: list[PowerOutput]
+    """
+    table = ColumnTable(directory)
+    dc_power, ac_power = table.read("dc_power"), table.read("ac_power")
+    clipped_power = table.read("clipped_power")
+    timestep = table.read("timestep")
+    return [
+        PowerOutput(
+            dc_power[i],
+            ac_power[i],
+            timestep[i],
+            # Results without clipped power were written as NaN:
+            None if np.isnan(clipped_power[i]).all() else clipped_power[i],
+        )
+        for i in range(len(table))
+    ]
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Columnar tables on disk.
+
+A table is a directory holding one ".npy" file per column and part, like an
+uncompressed NPZ archive that can be memory-mapped:
+
+- metadata.json: dtype and row shape of each column, rows of each part and
+  number of the first part
+- part-<n>/<column>.npy: rows of the column written by a call
+
+New parts are numbered after the last part of the table and the metadata is
+replaced last, so an interrupted write leaves the table unchanged. Parts of a
+replaced table are removed after its metadata. Parts are read up to the rows
+given in the metadata, so "truncate_table" only rewrites the metadata.
+Reading a column of a single-part table is a zero-copy memory map;
+"compact" merges the parts of a table that was appended to.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+
+def get_part_directory(directory: str, part: int) -> str:
+    return os.path.join(directory, f"part-{part:05d}")
+
+
+def get_part_numbers(metadata: dict) -> range:
+    """
+    :return: Numbers of the part directories of the table, in order
+    :rtype: range
+    """
+    first = metadata.get("first_part", 0)
+    return range(first, first + len(metadata["parts"]))
+
+
+def read_metadata(directory: str) -> dict | None:
+    """
+    :return: Metadata of the table, None if there is no table
+    :rtype: dict | None
+    """
+    try:
+        with open(os.path.join(directory, "metadata.json")) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def get_column_metadata(columns: dict[str, np.ndarray]) -> dict:
+    return {
+        name: {
+            "dtype": np.lib.format.dtype_to_descr(array.dtype),
+            "shape": list(array.shape[1:]),
+        }
+        for name, array in columns.items()
+    }
+
+
+def remove_parts(directory: str, parts) -> None:
+    for part in parts:
+        shutil.rmtree(get_part_directory(directory, part), ignore_errors=True)
+
+
+def write_table(
+    directory: str, columns: dict[str, np.ndarray], append: bool = False
+) -> None:
+    """
+    :param str directory: Table directory, created if needed
+    :param dict[str, np.ndarray] columns: Arrays with one row per element
+        of the first axis, all with the same number of rows
+    :param bool append: Adds the rows to an existing table instead of
+        replacing it
+    :raises Exception: If the columns have different numbers of rows or do
+        not match the columns of the table appended to, or if the directory
+        holds other files than a table
+    """
+    columns = {name: np.asarray(array) for name, array in columns.items()}
+    rows = {len(array) for array in columns.values()}
+    if len(rows) != 1:
+        raise Exception("Columns must have the same number of rows.")
+
+    column_metadata = get_column_metadata(columns)
+    previous = read_metadata(directory)
+    if previous is None and os.path.isdir(directory) and os.listdir(directory):
+        raise Exception(f"{directory} is not empty and holds no table.")
+
+    replaced = range(0)
+    if previous is None or not append:
+        # A replaced table keeps its parts until the new metadata is written:
+        first = 0 if previous is None else get_part_numbers(previous).stop
+        if previous is not None:
+            replaced = get_part_numbers(previous)
+        metadata = {
+            "columns": column_metadata,
+            "parts": [],
+            "first_part": first,
+        }
+    elif previous["columns"] != column_metadata:
+        raise Exception(
+            f"Columns do not match the columns of the table in {directory}."
+        )
+    else:
+        metadata = previous
+
+    # Removes any leftover of an interrupted write:
+    part_directory = get_part_directory(
+        directory, get_part_numbers(metadata).stop
+    )
+    shutil.rmtree(part_directory, ignore_errors=True)
+    os.makedirs(part_directory)
+    for name, array in columns.items():
+        np.save(os.path.join(part_directory, f"{name}.npy"), array)
+
+    metadata["parts"].append(rows.pop())
+    write_metadata(directory, metadata)
+    remove_parts(directory, replaced)
+
+
+def write_metadata(directory: str, metadata: dict) -> None:
+    path = os.path.join(directory, "metadata.json")
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(metadata, file)
+    os.replace(f"{path}.tmp", path)
+
+
+def truncate_table(directory: str, rows: int) -> None:
+    """
+    Keeps the first rows of a table. Parts past them are removed after the
+    metadata is replaced, so an interruption leaves a readable table.
+
+    :param str directory: Table directory
+    :param int rows: Rows to keep
+    """
+    metadata = read_metadata(directory)
+    if metadata is None or sum(metadata["parts"]) <= rows:
+        return
+
+    # The first part is kept even if empty, so the columns can be read:
+    parts = [min(metadata["parts"][0], rows)]
+    rows -= parts[0]
+    while rows > 0:
+        parts.append(min(metadata["parts"][len(parts)], rows))
+        rows -= parts[-1]
+    removed = get_part_numbers(metadata)[len(parts) :]
+
+    metadata["parts"] = parts
+    write_metadata(directory, metadata)
+    remove_parts(directory, removed)
+
+
+def write_records(
+    directory: str, records: np.ndarray, append: bool = False
+) -> None:
+    """
+    Writes a structured array, e.g. from "simulate_batch", one column per
+    field.
+    """
+    write_table(
+        directory,
+        {name: records[name] for name in records.dtype.names},
+        append,
+    )
+
+
+class ColumnTable:
+    def __init__(self, directory: str) -> None:
+        """
+        :param str directory: Table directory, see "write_table"
+        :raises Exception: If there is no table in the directory
+        """
+        self.directory = directory
+        self.metadata = read_metadata(directory)
+        if self.metadata is None:
+            raise Exception(f"No table found in {directory}.")
+
+    def __len__(self) -> int:
+        return sum(self.metadata["parts"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.read(column)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.metadata["columns"])
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        :return: Structured dtype with one field per column
+        :rtype: np.dtype
+        """
+        return np.dtype(
+            [
+                (
+                    name,
+                    np.lib.format.descr_to_dtype(column["dtype"]),
+                    tuple(column["shape"]),
+                )
+                for name, column in self.metadata["columns"].items()
+            ]
+        )
+
+    def read_part(self, column: str, part: int) -> np.ndarray:
+        """
+        :return: Memory map of the rows of a part
+        :rtype: np.ndarray
+        """
+        number = get_part_numbers(self.metadata)[part]
+        return np.load(
+            os.path.join(
+                get_part_directory(self.directory, number), f"{column}.npy"
+            ),
+            mmap_mode="r",
+        )[: self.metadata["parts"][part]]
+
+    def read(self, column: str) -> np.ndarray:
+        """
+        :param str column: Column name
+        :return: Every row of the column; a memory map if the table has a
+            single part, else a copy
+        :rtype: np.ndarray
+        :raises Exception: If the column does not exist
+        """
+        if column not in self.metadata["columns"]:
+            raise Exception(f'Column "{column}" not found in the table.')
+
+        parts = [
+            self.read_part(column, part)
+            for part in range(len(self.metadata["parts"]))
+        ]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def to_dict(self) -> dict[str, np.ndarray]:
+        return {column: self.read(column) for column in self.columns}
+
+    def to_records(self) -> np.ndarray:
+        """
+        :return: Structured array with one field per column (copy)
+        :rtype: np.ndarray
+        """
+        records = np.empty(len(self), dtype=self.dtype)
+        for column in self.columns:
+            records[column] = self.read(column)
+        return records
+
+    def compact(self) -> None:
+        """
+        Rewrites the table as a single part, so every read is a memory map.
+        The old parts are removed after the new one is in the metadata.
+        """
+        if len(self.metadata["parts"]) > 1:
+            columns = self.to_dict()
+            write_table(self.directory, columns)
+            self.metadata = read_metadata(self.directory)
+
+
+def read_table(directory: str) -> ColumnTable:
+    return ColumnTable(directory)
+
+
+def write_parquet(path: str, table: ColumnTable) -> None:
+    """
+    Writes a table to a single Parquet file, for tools that do not read NumPy
+    files. Columns with more than one value per row are stored as fixed size
+    lists. Requires pyarrow.
+
+    :raises Exception: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Writing Parquet files requires pyarrow.")
+
+    arrays = {}
+    for column in table.columns:
+        values = np.ascontiguousarray(table.read(column))
+        if values.dtype.kind == "S":
+            values = np.char.decode(values, "utf-8")
+        if values.ndim == 1:
+            arrays[column] = pa.array(values)
+        else:
+            width = int(np.prod(values.shape[1:]))
+            arrays[column] = pa.FixedSizeListArray.from_arrays(
+                pa.array(values.reshape(-1)), width
+            )
+    pq.write_table(pa.table(arrays), path)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from .efficiency import EfficiencyCurve
+from .generic import Brand, PhysicalProperties
+from .inverter import Inverter, parse_voltage_range
+from .module import Module
+from ..catalog.schema import (
+    INVERTER_DTYPE,
+    INVERTER_FIELDS,
+    MODULE_DTYPE,
+    MODULE_FIELDS,
+    PHYSICAL_PROPERTIES_FIELDS,
+    from_record_value,
+    inverters_to_records,
+    modules_to_records,
+    record_to_brand,
+    record_to_inverter,
+    record_to_curve,
+    record_to_module,
+    to_record_value,
+    write_curve,
+)
+
+
+def record_field(field: str) -> property:
+    """
+    :param str field: Name of a field of the record array
+    :return: Property that reads and writes the field of the viewed record
+    :rtype: property
+    """
+
+    def getter(self):
+        return from_record_value(self.records[field][self.index].item())
+
+    def setter(self, value):
+        self.records[field][self.index] = to_record_value(
+            value, self.records.dtype[field]
+        )
+
+    return property(getter, setter)
+
+
+class RecordView:
+    """
+    Single item of an equipment array. Attributes are read from and written
+    to the underlying record array, so a view holds no data of its own.
+    """
+
+    __slots__ = ("records", "index")
+
+    def __init__(self, records: np.ndarray, index: int) -> None:
+        """
+        :param np.ndarray records: Structured array of the equipment
+        :param int index: Position of the item in the array
+        """
+        self.records = records
+        self.index = index
+
+    @property
+    def brand(self) -> Brand:
+        return record_to_brand(self.records[self.index])
+
+
+class ModuleView(RecordView):
+    """
+    Item of a ModuleArray, with the same attributes as Module.
+    """
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        return Module.__str__(self)
+
+
+class InverterView(RecordView):
+    """
+    Item of an InverterArray, with the same attributes and AC output methods
+    as Inverter. The efficiency curve is rebuilt from the record on every
+    read.
+    """
+
+    __slots__ = ()
+
+    voltage_range_mppt = record_field("voltage_range_mppt")
+
+    @voltage_range_mppt.setter
+    def voltage_range_mppt(self, voltage_range: str) -> None:
+        """
+        Also updates "v_mppt_min" and "v_mppt_max", like Inverter.
+
+        :raises Exception: If the range cannot be parsed, see
+            "parse_voltage_range"
+        """
+        v_mppt_min, v_mppt_max = parse_voltage_range(voltage_range)
+        self.records["voltage_range_mppt"][self.index] = to_record_value(
+            voltage_range, self.records.dtype["voltage_range_mppt"]
+        )
+        self.v_mppt_min, self.v_mppt_max = v_mppt_min, v_mppt_max
+
+    @property
+    def efficiency_curve(self) -> EfficiencyCurve | None:
+        return record_to_curve(self.records[self.index])
+
+    @efficiency_curve.setter
+    def efficiency_curve(self, curve: EfficiencyCurve | None) -> None:
+        write_curve(self.records[self.index], curve)
+
+    @property
+    def physical_properties(self) -> PhysicalProperties:
+        record = self.records[self.index]
+        return PhysicalProperties(
+            **{
+                field: record[field].item()
+                for field in PHYSICAL_PROPERTIES_FIELDS
+            }
+        )
+
+    def __str__(self) -> str:
+        return Inverter.__str__(self)
+
+
+for field in MODULE_FIELDS:
+    setattr(ModuleView, field, record_field(field))
+
+for field in INVERTER_FIELDS + ["v_mppt_min", "v_mppt_max"]:
+    if field not in vars(InverterView):
+        setattr(InverterView, field, record_field(field))
+
+for method in (
+    "get_efficiency_curve",
+    "get_ac_limit",
+    "get_ac_power",
+    "get_clipped_power",
+):
+    setattr(InverterView, method, getattr(Inverter, method))
+
+
+class EquipmentArray:
+    """
+    Struct-of-arrays container of modules or inverters, backed by a NumPy
+    structured array. Indexing with an int returns a view with the same
+    attribute API as the equipment class; indexing with a field name returns
+    the whole column.
+    """
+
+    dtype = None
+    view_class = RecordView
+
+    def __init__(self, records: np.ndarray) -> None:
+        """
+        :param np.ndarray records: Structured array with the class dtype
+        :raises Exception: If records have a different dtype
+        """
+        if records.dtype != self.dtype:
+            raise Exception(
+                f"{type(self).__name__} records must have dtype {self.dtype}."
+            )
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        for index in range(len(self.records)):
+            yield self.view_class(self.records, index)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.records[key]
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self.records)
+            if not 0 <= key < len(self.records):
+                raise IndexError(key)
+            return self.view_class(self.records, int(key))
+        return type(self)(self.records[key])
+
+    @property
+    def nbytes(self) -> int:
+        return self.records.nbytes
+
+
+class ModuleArray(EquipmentArray):
+    dtype = MODULE_DTYPE
+    view_class = ModuleView
+
+    @classmethod
+    def from_modules(cls, modules: list[Module]) -> "ModuleArray":
+        return cls(modules_to_records(modules))
+
+    def to_modules(self) -> list[Module]:
+        return [record_to_module(record) for record in self.records]
+
+
+class InverterArray(EquipmentArray):
+    dtype = INVERTER_DTYPE
+    view_class = InverterView
+
+    @classmethod
+    def from_inverters(cls, inverters: list[Inverter]) -> "InverterArray":
+        return cls(inverters_to_records(inverters))
+
+    def to_inverters(self) -> list[Inverter]:
+        return [record_to_inverter(record) for record in self.records]
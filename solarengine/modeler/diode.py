@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Single-diode model of a PV module, without shunt resistance:
+
+I = I_L - I_0 * (exp((V + I * R_s) / a) - 1)
+
+Parameters are fitted from the STC datasheet points and power temperature
+coefficient of the Module and translated to other irradiances and cell
+temperatures with the De Soto model. Every function accepts arrays of
+conditions and solves all of them at once.
+"""
+
+import functools
+
+import numpy as np
+
+from .module import Module
+
+G_REF = 1000  # W/m ** 2
+T_REF = 298.15  # K
+BOLTZMANN = 8.617333262e-5  # eV/K
+BANDGAP_RANGE = (0.05, 3.0)  # eV, fitted, see "fit_diode_parameters"
+BANDGAP_TEMPERATURE_COEFFICIENT = -0.0002677  # 1/K
+ALPHA_ISC = 0.0005  # 1/C, relative short circuit current coefficient
+
+NEWTON_ITERATIONS = 50
+NEWTON_TOLERANCE = 1e-10
+
+
+class DiodeParameters:
+    """
+    Single-diode parameters of a module, as arrays broadcast over the
+    operating conditions.
+    """
+
+    def __init__(
+        self,
+        photocurrent: np.ndarray,
+        saturation_current: np.ndarray,
+        modified_ideality: np.ndarray,
+        series_resistance: float,
+    ) -> None:
+        """
+        :param np.ndarray photocurrent: Light generated current, I_L (A)
+        :param np.ndarray saturation_current: Diode saturation current, I_0
+            (A)
+        :param np.ndarray modified_ideality: Ideality factor times cells in
+            series times thermal voltage, a (V)
+        :param float series_resistance: Series resistance, R_s (ohm)
+        """
+        self.photocurrent = photocurrent
+        self.saturation_current = saturation_current
+        self.modified_ideality = modified_ideality
+        self.series_resistance = series_resistance
+
+    @property
+    def v_oc(self) -> np.ndarray:
+        """
+        :return: Open circuit voltage (V)
+        :rtype: np.ndarray
+        """
+        return self.modified_ideality * np.log1p(
+            self.photocurrent / self.saturation_current
+        )
+
+    def get_voltage(self, current: np.ndarray) -> np.ndarray:
+        """
+        :param np.ndarray current: Module current, from 0 to I_sc (A)
+        :return: Module voltage (V)
+        :rtype: np.ndarray
+        """
+        x = (
+            self.photocurrent + self.saturation_current - current
+        ) / self.saturation_current
+        return (
+            self.modified_ideality * np.log(np.maximum(x, 1e-300))
+            - current * self.series_resistance
+        )
+
+    def get_current(self, voltage: np.ndarray) -> np.ndarray:
+        """
+        Solves the implicit current with Newton's method, vectorized over
+        every point.
+
+        :param np.ndarray voltage: Module voltage, from 0 to V_oc (V)
+        :return: Module current (A)
+        :rtype: np.ndarray
+        """
+        a = self.modified_ideality
+        rs = self.series_resistance
+        current = (
+            np.zeros(np.broadcast_shapes(np.shape(voltage), np.shape(a)))
+            + self.photocurrent
+        )
+        for _ in range(NEWTON_ITERATIONS):
+            exponential = self.saturation_current * np.exp(
+                (voltage + current * rs) / a
+            )
+            residual = (
+                self.photocurrent
+                + self.saturation_current
+                - exponential
+                - current
+            )
+            step = residual / (1 + exponential * rs / a)
+            current += step
+            if np.max(np.abs(step), initial=0) < NEWTON_TOLERANCE:
+                break
+        return current
+
+    def get_max_power_point(self) -> tuple[np.ndarray, ...]:
+        """
+        Solves dP/dI = 0 for every set of parameters. With
+        u = ln((I_L + I_0 - I) / I_0), the condition becomes
+
+        a * (u + 1) - a * C * exp(-u) - 2 * R_s * I_0 * (C - exp(u)) = 0,
+
+        where C = (I_L + I_0) / I_0. The left side increases with u, and the
+        root without series resistance, u ~ ln(C) - ln(ln(C) + 1), is used
+        as the starting point.
+
+        :return: Voltage (V), current (A) and power (W) at the max. power
+            point
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        a = self.modified_ideality
+        i0 = self.saturation_current
+        rs = self.series_resistance
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = np.maximum(self.photocurrent, 0) / i0 + 1
+            log_c = np.log(c)
+            u = np.array(log_c - np.log1p(log_c), dtype=float)
+            rs_i0 = 2 * rs * i0 / a
+
+            for _ in range(NEWTON_ITERATIONS):
+                exponential = np.exp(u)
+                c_exponential = c / exponential
+                residual = u + 1 - c_exponential - rs_i0 * (c - exponential)
+                step = residual / (1 + c_exponential + rs_i0 * exponential)
+                u -= step
+                np.clip(u, 0, log_c, out=u)
+                if np.max(np.abs(step), initial=0) < NEWTON_TOLERANCE:
+                    break
+
+        current = i0 * (c - np.exp(u))
+        voltage = a * u - current * rs
+        return voltage, current, voltage * current
+
+    def get_iv_curve(self, points: int = 100) -> tuple[np.ndarray, ...]:
+        """
+        :param int points: Number of points of each curve
+        :return: Voltage (V) and current (A) of each curve, from short to
+            open circuit, with the points along the last axis
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        fraction = np.linspace(0, 1, points)
+        voltage = np.asarray(self.v_oc)[..., None] * fraction
+        expanded = DiodeParameters(
+            np.asarray(self.photocurrent)[..., None],
+            np.asarray(self.saturation_current)[..., None],
+            np.asarray(self.modified_ideality)[..., None],
+            self.series_resistance,
+        )
+        return voltage, expanded.get_current(voltage)
+
+
+def translate_parameters(
+    reference: tuple[float, ...],
+    irradiance: np.ndarray,
+    cell_temperature: np.ndarray,
+    alpha_isc: float,
+    bandgap: np.ndarray,
+) -> DiodeParameters:
+    """
+    Translates STC parameters to other conditions with the De Soto model.
+
+    :param tuple[float, ...] reference: Photocurrent (A), saturation current
+        (A), modified ideality (V) and series resistance (ohm) at STC
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray cell_temperature: Cell temperature (C)
+    :param float alpha_isc: Relative temperature coefficient of the short
+        circuit current (1/C)
+    :param np.ndarray bandgap: Bandgap at STC (eV)
+    :return: Parameters broadcast over the conditions
+    :rtype: DiodeParameters
+    """
+    il_ref, i0_ref, a_ref, rs = reference
+    irradiance = np.clip(np.asarray(irradiance, dtype=float), 0, None)
+    temperature = np.asarray(cell_temperature, dtype=float) + 273.15
+
+    delta = temperature - T_REF
+    ratio = temperature / T_REF
+    exponent = bandgap / BOLTZMANN * (
+        1 / T_REF - 1 / temperature
+    ) - bandgap * BANDGAP_TEMPERATURE_COEFFICIENT * delta / (
+        BOLTZMANN * temperature
+    )
+
+    return DiodeParameters(
+        photocurrent=irradiance / G_REF * il_ref * (1 + alpha_isc * delta),
+        saturation_current=i0_ref * ratio**3 * np.exp(exponent),
+        modified_ideality=a_ref * ratio,
+        series_resistance=rs,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def fit_diode_parameters(
+    v_oc: float,
+    i_sc: float,
+    v_max: float,
+    i_max: float,
+    ppt: float,
+    alpha_isc: float = ALPHA_ISC,
+) -> tuple[float, ...]:
+    """
+    Closed-form fit of the single-diode model to the STC open circuit,
+    short circuit and max. power points, where the max. power point also
+    satisfies dP/dV = 0. If the fit yields a negative series resistance, it
+    is set to zero and the ideality is fitted to the three points only.
+
+    Datasheets do not give the number of cells, so the bandgap is used as
+    the temperature fitting parameter instead: it is chosen so that the max.
+    power falls by "ppt" % from 25 to 26 C, like the linear derating of the
+    rest of the package.
+
+    :param float v_oc: Open circuit voltage (V)
+    :param float i_sc: Short circuit current (A)
+    :param float v_max: Max. power voltage (V)
+    :param float i_max: Max. power current (A)
+    :param float ppt: Decrease in max. power per degree celsius (% / C)
+    :param float alpha_isc: Relative temperature coefficient of the short
+        circuit current (1/C)
+    :return: Photocurrent (A), saturation current (A), modified ideality
+        (V), series resistance (ohm) and bandgap (eV) at STC
+    :rtype: tuple[float, ...]
+    :raises Exception: If the datasheet points are inconsistent
+    """
+    if not (0 < i_max < i_sc and 0 < v_max < v_oc):
+        raise Exception(
+            "Module max. power point must lie between short and open "
+            "circuit."
+        )
+
+    log_ratio = np.log(1 - i_max / i_sc)
+    a = (
+        (i_sc - i_max)
+        * (2 * v_max - v_oc)
+        / (i_max + (i_sc - i_max) * log_ratio)
+    )
+    rs = (v_oc - v_max + a * log_ratio) / i_max
+    if a <= 0 or rs < 0:
+        rs = 0.0
+        a = (v_max - v_oc) / log_ratio
+    i0 = i_sc / np.expm1(v_oc / a)
+    reference = (float(i_sc), float(i0), float(a), float(rs))
+
+    # Power coefficient of every candidate bandgap, solved at once. It
+    # decreases with the bandgap.
+    candidates = np.linspace(*BANDGAP_RANGE, 1001)
+    power = translate_parameters(
+        reference, G_REF, [[25], [26]], alpha_isc, candidates
+    ).get_max_power_point()[2]
+    coefficient = power[1] / power[0] - 1
+    bandgap = np.interp(-ppt / 100, coefficient[::-1], candidates[::-1])
+    return reference + (float(bandgap),)
+
+
+def get_diode_parameters(
+    module: Module,
+    irradiance: np.ndarray = G_REF,
+    cell_temperature: np.ndarray = 25,
+    alpha_isc: float = ALPHA_ISC,
+) -> DiodeParameters:
+    """
+    Single-diode parameters of the module at the given conditions. The STC
+    fit is cached per set of datasheet values.
+
+    :param Module module: Module class object
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray cell_temperature: Cell temperature (C)
+    :param float alpha_isc: Relative temperature coefficient of the short
+        circuit current (1/C)
+    :return: Parameters broadcast over irradiance and temperature
+    :rtype: DiodeParameters
+    """
+    *reference, bandgap = fit_diode_parameters(
+        module.v_oc,
+        module.i_sc,
+        module.v_max,
+        module.i_max,
+        module.ppt,
+        alpha_isc,
+    )
+    return translate_parameters(
+        reference, irradiance, cell_temperature, alpha_isc, bandgap
+    )
+
+
+def get_max_power_point(
+    module: Module,
+    irradiance: np.ndarray,
+    cell_temperature: np.ndarray,
+    module_count: np.ndarray = 1,
+    alpha_isc: float = ALPHA_ISC,
+) -> tuple[np.ndarray, ...]:
+    """
+    Max. power point of modules or of strings of modules in series. Strings
+    of identical modules under the same conditions share the module MPP, so
+    only the distinct conditions are solved and voltage and power are then
+    scaled by module_count.
+
+    Example, hourly MPP of every string of a plant:
+    get_max_power_point(
+        plant.module, g[:, None], t[:, None], plant.string_layout.module_count
+    )
+
+    :param Module module: Module class object
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray cell_temperature: Cell temperature (C)
+    :param np.ndarray module_count: Modules in series, broadcast with the
+        conditions
+    :param float alpha_isc: Relative temperature coefficient of the short
+        circuit current (1/C)
+    :return: Voltage (V), current (A) and power (W) at the max. power point
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    voltage, current, power = get_diode_parameters(
+        module, irradiance, cell_temperature, alpha_isc
+    ).get_max_power_point()
+    module_count = np.asarray(module_count)
+    return (
+        voltage * module_count,
+        current * np.ones_like(module_count),
+        power * module_count,
+    )
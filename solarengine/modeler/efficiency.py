@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Part-load efficiency curves of inverters. A curve is given by datasheet
+points (efficiency at fractions of the nominal AC power, optionally at a few
+DC voltages) and compiled once into a dense table of AC output versus DC
+input on a uniform grid, so evaluating a series is a direct index and one
+linear interpolation per point, without searching.
+
+Powers are normalized by the nominal AC power of the inverter, so the same
+curve can be shared by inverters of different sizes.
+"""
+
+import numpy as np
+
+# Fractions of the nominal AC power and their weights:
+CEC_WEIGHTS = (
+    (0.10, 0.20, 0.30, 0.50, 0.75, 1.00),
+    (0.04, 0.05, 0.12, 0.21, 0.53, 0.05),
+)
+EURO_WEIGHTS = (
+    (0.05, 0.10, 0.20, 0.30, 0.50, 1.00),
+    (0.03, 0.06, 0.13, 0.10, 0.48, 0.20),
+)
+
+TABLE_RESOLUTION = 4096
+
+
+class EfficiencyCurve:
+    """
+    Inverter efficiency versus AC load and, optionally, DC voltage.
+    Efficiency between the points is linearly interpolated in DC power;
+    below the first point it falls linearly to zero output at zero input and
+    above the last point it is constant.
+    """
+
+    def __init__(
+        self,
+        load: np.ndarray,
+        efficiency: np.ndarray,
+        voltage: np.ndarray | None = None,
+        resolution: int = TABLE_RESOLUTION,
+    ) -> None:
+        """
+        :param np.ndarray load: Increasing AC output of the points, as
+            fractions of the nominal AC power
+        :param np.ndarray efficiency: Efficiency of the points, from 0 to 1,
+            (points,) or (voltages, points)
+        :param np.ndarray | None voltage: Increasing DC voltages of the rows
+            of efficiency (V)
+        :param int resolution: Number of intervals of the dense table
+        :raises Exception: If the shapes do not match
+        """
+        self.load = np.asarray(load, dtype=float)
+        self.efficiency = np.atleast_2d(np.asarray(efficiency, dtype=float))
+        self.voltage = (
+            None if voltage is None else np.asarray(voltage, dtype=float)
+        )
+        if self.efficiency.shape[1] != len(self.load) or (
+            len(self.efficiency)
+            != (1 if self.voltage is None else len(self.voltage))
+        ):
+            raise Exception("Efficiency points do not match loads/voltages.")
+
+        self.load_points = np.concatenate([[0.0], self.load])
+        self.dc_points = np.concatenate(
+            [np.zeros((len(self.efficiency), 1)), self.load / self.efficiency],
+            axis=1,
+        )
+
+        # Dense table of the AC output of each row, on a grid that covers
+        # the DC input at nominal AC power of every row:
+        self.step = np.max(self.get_dc_input(1.0)) / resolution
+        grid = np.arange(resolution + 1) * self.step
+        self.table = np.array(
+            [
+                np.where(
+                    grid > dc_points[-1],
+                    grid * efficiency[-1],
+                    np.interp(grid, dc_points, self.load_points),
+                )
+                for dc_points, efficiency in zip(
+                    self.dc_points, self.efficiency
+                )
+            ]
+        )
+
+    @classmethod
+    def flat(cls, efficiency: float) -> "EfficiencyCurve":
+        """
+        :param float efficiency: Efficiency at every load, from 0 to 1
+        :return: Curve with constant efficiency
+        :rtype: EfficiencyCurve
+        """
+        return cls([1.0], [efficiency], resolution=1)
+
+    def get_dc_input(self, load: np.ndarray) -> np.ndarray:
+        """
+        :param np.ndarray load: AC output, as fractions of the nominal AC
+            power
+        :return: DC input of each row, as fractions of the nominal AC
+            power, (voltages,) + load shape
+        :rtype: np.ndarray
+        """
+        load = np.asarray(load, dtype=float)
+        return np.array(
+            [
+                np.where(
+                    load > self.load_points[-1],
+                    load / efficiency[-1],
+                    np.interp(load, self.load_points, dc_points),
+                )
+                for dc_points, efficiency in zip(
+                    self.dc_points, self.efficiency
+                )
+            ]
+        )
+
+    def get_weighted_efficiency(
+        self, weights: tuple = CEC_WEIGHTS
+    ) -> np.ndarray:
+        """
+        :param tuple weights: Loads and weights, e.g. CEC_WEIGHTS or
+            EURO_WEIGHTS
+        :return: Weighted efficiency of each voltage row
+        :rtype: np.ndarray
+        """
+        loads, factors = (np.asarray(w, dtype=float) for w in weights)
+        return loads / self.get_dc_input(loads) @ factors
+
+    def get_row_position(self, voltage: np.ndarray | None) -> tuple:
+        """
+        :param np.ndarray | None voltage: DC voltage (V)
+        :return: Lower row and weight of the next row of each voltage
+        :rtype: tuple
+        """
+        if self.voltage is None or voltage is None:
+            return 0, 0.0
+        position = np.interp(
+            voltage, self.voltage, np.arange(len(self.voltage))
+        )
+        row = np.minimum(position.astype(int), max(len(self.voltage) - 2, 0))
+        return row, position - row
+
+    def interpolate_rows(self, values: np.ndarray, voltage) -> np.ndarray:
+        """
+        :param np.ndarray values: Values of each row, (voltages, ...)
+        :param voltage: DC voltage (V)
+        :return: Values linearly interpolated between the rows
+        :rtype: np.ndarray
+        """
+        row, weight = self.get_row_position(voltage)
+        next_row = np.minimum(row + 1, len(values) - 1)
+        return values[row] * (1 - weight) + values[next_row] * weight
+
+    def get_ac_fraction(
+        self,
+        dc_fraction: np.ndarray,
+        voltage: np.ndarray | None = None,
+        limit: float = 1.0,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        :param np.ndarray dc_fraction: DC input, as fractions of the nominal
+            AC power
+        :param np.ndarray | None voltage: DC voltage (V), interpolating
+            between the rows of the curve
+        :param float limit: Max. AC output, as a fraction of the nominal AC
+            power
+        :param np.ndarray | None out: Output buffer
+        :return: AC output, as fractions of the nominal AC power, zero for
+            negative input and NaN for NaN input
+        :rtype: np.ndarray
+        """
+        position = np.maximum(dc_fraction, 0.0) / self.step
+        # "fmin" maps NaN to the last interval before the cast, and NaN
+        # weights keep the output NaN:
+        index = np.fmin(position, self.table.shape[1] - 2).astype(int)
+        weight = position - index
+
+        def lookup(row):
+            lower = self.table[row, index]
+            return lower + weight * (self.table[row, index + 1] - lower)
+
+        row, row_weight = self.get_row_position(voltage)
+        if np.any(row_weight):
+            ac_fraction = lookup(row) * (1 - row_weight) + row_weight * lookup(
+                np.minimum(row + 1, len(self.table) - 1)
+            )
+        else:
+            ac_fraction = lookup(row)
+
+        # Beyond the table, the output is above nominal power and clipped:
+        return np.minimum(ac_fraction, limit, out=out)
+
+    def get_dc_limit(
+        self, voltage: np.ndarray | None = None, limit: float = 1.0
+    ) -> np.ndarray:
+        """
+        :param np.ndarray | None voltage: DC voltage (V)
+        :param float limit: Max. AC output, as a fraction of the nominal AC
+            power
+        :return: DC input at which the output reaches limit, as fractions
+            of the nominal AC power
+        :rtype: np.ndarray
+        """
+        return self.interpolate_rows(self.get_dc_input(limit), voltage)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ..utils import PERFORMANCE_RATIO, get_irradiacao_mensal
+from .plant import PowerPlant, PowerPlantInfo
+from .temperature import get_temperature_derating
+
+
+class Fleet:
+    """
+    Group of power plants, e.g. the plants of a feeder, stored column-wise.
+    Aggregates are computed for every plant in a single vectorized pass and
+    can be grouped by any PowerPlantInfo field.
+    """
+
+    def __init__(self, plants: list[PowerPlant]) -> None:
+        """
+        :param list[PowerPlant] plants: PowerPlant class objects. Later
+            changes to the plants are not reflected in the fleet.
+        """
+        self.plants = list(plants)
+
+        self.module_power = np.array(
+            [plant.module.nominal_power for plant in plants], dtype=float
+        )
+        self.module_count = np.array(
+            [plant.module_count for plant in plants], dtype=float
+        )
+        self.module_area = np.array(
+            [plant.module.area for plant in plants], dtype=float
+        )
+        self.module_ppt = np.array(
+            [plant.module.ppt for plant in plants], dtype=float
+        )
+
+        # One element per inverter model of every plant:
+        self.inverter_plant = np.repeat(
+            np.arange(len(plants)), [len(plant.inverters) for plant in plants]
+        )
+        self.inverter_p_ac_nom = np.array(
+            [inv.p_ac_nom for plant in plants for inv in plant.inverters],
+            dtype=float,
+        )
+        self.inverter_count = np.array(
+            [count for plant in plants for count in plant.inverter_count],
+            dtype=float,
+        )
+
+        self.groups = {}
+
+    def __len__(self) -> int:
+        return len(self.plants)
+
+    def sum_inverters(self, values: np.ndarray) -> np.ndarray:
+        """
+        :param np.ndarray values: One value per inverter model
+        :return: Sum of the values of each plant
+        :rtype: np.ndarray
+        """
+        return np.bincount(
+            self.inverter_plant, weights=values, minlength=len(self)
+        )
+
+    def get_ideal_module_output_power(self) -> np.ndarray:
+        """
+        :return: Ideal power from the modules of each plant (W)
+        :rtype: np.ndarray
+        """
+        return self.module_count * self.module_power
+
+    def get_real_module_output_power(
+        self, T_ref: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Vectorized "PowerPlant.get_real_module_output_power" of every plant.
+
+        :param np.ndarray T_ref: Cell temperature of each plant (C), (N,),
+            or a series per plant, (N, T)
+        :param np.ndarray | None out: Output buffer, may be T_ref
+        :return: Real power from the modules of each plant (W)
+        :rtype: np.ndarray
+        """
+        shape = (len(self),) + (1,) * (np.ndim(T_ref) - 1)
+        out = get_temperature_derating(
+            T_ref, self.module_ppt.reshape(shape), out=out
+        )
+        return np.multiply(
+            out, self.get_ideal_module_output_power().reshape(shape), out=out
+        )
+
+    def get_inverter_output_power(self) -> np.ndarray:
+        """
+        :return: Total power from the inverters of each plant (W)
+        :rtype: np.ndarray
+        """
+        return self.sum_inverters(self.inverter_p_ac_nom * self.inverter_count)
+
+    def get_active_power(self) -> np.ndarray:
+        """
+        :return: Active power of each plant, see
+            "PowerPlant.get_active_power" (W)
+        :rtype: np.ndarray
+        """
+        return np.minimum(
+            self.get_ideal_module_output_power(),
+            self.get_inverter_output_power(),
+        )
+
+    def get_total_module_area(self) -> np.ndarray:
+        """
+        :return: Total module area of each plant (sq. m)
+        :rtype: np.ndarray
+        """
+        return self.module_count * self.module_area
+
+    def get_inverter_count(self) -> np.ndarray:
+        """
+        :return: Number of inverters (all models) of each plant
+        :rtype: np.ndarray
+        """
+        return self.sum_inverters(self.inverter_count).astype(int)
+
+    def get_geracao_mensal(self, irradiacao_mensal=None) -> np.ndarray:
+        """
+        Vectorized "get_geracao_mensal" of every plant.
+
+        :param irradiacao_mensal: Monthly irradiation, (12,) for all plants
+            or (N, 12), defaults to "get_irradiacao_mensal()"
+        :return: Monthly generation in the first year (kWh), (N, 12)
+        :rtype: np.ndarray
+        """
+        if irradiacao_mensal is None:
+            irradiacao_mensal = get_irradiacao_mensal()
+        return (
+            np.asarray(irradiacao_mensal, dtype=float)
+            * self.get_ideal_module_output_power()[:, None]
+            * 30
+            * PERFORMANCE_RATIO
+            * 1e-3
+        )
+
+    def get_geracao_anual(
+        self, anos: int = 25, taxa: float = 0.01, irradiacao_mensal=None
+    ) -> np.ndarray:
+        """
+        Vectorized "get_geracao_anual" of every plant.
+
+        :return: Generation of each year (kWh), (N, anos)
+        :rtype: np.ndarray
+        """
+        geracao = np.sum(self.get_geracao_mensal(irradiacao_mensal), axis=1)
+        return geracao[:, None] * (1 - taxa) ** np.arange(anos)
+
+    def get_groups(self, field: str) -> tuple[list, np.ndarray]:
+        """
+        :param str field: PowerPlantInfo field, e.g. "power_company"
+        :return: Distinct values of the field, in order of appearance, and
+            the position of the value of each plant among them. Plants
+            without info have the value None.
+        :rtype: tuple[list, np.ndarray]
+        :raises Exception: If field is not a PowerPlantInfo field
+        """
+        if field not in PowerPlantInfo.__annotations__:
+            raise Exception(f'"{field}" is not a PowerPlantInfo field.')
+
+        if field not in self.groups:
+            positions = {}
+            codes = np.array(
+                [
+                    positions.setdefault(
+                        getattr(plant.info, field, None), len(positions)
+                    )
+                    for plant in self.plants
+                ],
+                dtype=np.intp,
+            )
+            self.groups[field] = (list(positions), codes)
+        return self.groups[field]
+
+    def aggregate(self, values: np.ndarray, by: str | None = None):
+        """
+        Sums per-plant values, e.g. "get_active_power()" or the time series
+        of "get_geracao_mensal()", over the fleet or over groups.
+
+        :param np.ndarray values: One value or time series per plant
+        :param str | None by: PowerPlantInfo field to group by
+        :return: Sum over the fleet, or dict with the sum of each group
+        """
+        values = np.asarray(values, dtype=float)
+        if by is None:
+            return np.sum(values, axis=0)
+
+        keys, codes = self.get_groups(by)
+        totals = np.zeros((len(keys),) + values.shape[1:])
+        np.add.at(totals, codes, values)
+        return dict(zip(keys, totals))
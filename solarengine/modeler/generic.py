@@ -4,6 +4,8 @@
 
 
 class Brand:
+    __slots__ = ("name", "model")
+
     def __init__(self, name: str, model: list) -> None:
         """
         :param str name: Brand name
@@ -14,6 +16,8 @@ class Brand:
 
 
 class PhysicalProperties:
+    __slots__ = ("weight", "width", "height", "depth")
+
     def __init__(
         self,
         weight: float,
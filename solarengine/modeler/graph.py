@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Incremental computation of the results of a plant design. Results are nodes
+of a dependency graph over the design inputs; changing an input only marks
+the nodes that depend on it, and a marked node is recomputed only if one of
+its dependencies actually changed value. A change that does not alter an
+intermediate result (e.g. swapping an inverter for one with the same power
+and string count) therefore stops there.
+
+Inputs are compared by content but held by reference, so changing an input
+object in place (e.g. "inverter.p_ac_nom = 6000") is not detected: pass a
+modified copy to "set" or "swap_inverter" instead.
+"""
+
+import time
+
+import numpy as np
+
+from ..utils import (
+    get_geracao_anual,
+    get_geracao_mensal,
+    get_irradiacao_mensal,
+)
+from .arrays import RecordView
+from .layout import StringLayout, get_string_layout
+from .plant import PowerPlant
+from .protection import (
+    get_cable_length,
+    get_plant_breakers,
+    size_plant_protection,
+)
+
+
+def get_attributes(value) -> dict | None:
+    """
+    :return: Attributes of an object, from "__slots__" and "__dict__", None
+        if it has neither
+    :rtype: dict | None
+    """
+    names = [
+        name
+        for cls in type(value).__mro__
+        for name in getattr(cls, "__slots__", ())
+        if name not in ("__dict__", "__weakref__")
+    ]
+    if not names and not hasattr(value, "__dict__"):
+        return None
+    attributes = {name: getattr(value, name, None) for name in names}
+    attributes.update(getattr(value, "__dict__", {}))
+    return attributes
+
+
+def is_equal(a, b) -> bool:
+    """
+    :return: True if two node values are equal, comparing arrays, string
+        layouts, dicts, equipment views and objects without "__eq__" (e.g.
+        Module and Inverter) by content
+    :rtype: bool
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, np.ndarray):
+        return (
+            a.shape == b.shape
+            and a.dtype == b.dtype
+            and bool(
+                np.all((a == b) | ((a != a) & (b != b)))
+                if a.dtype.names is None
+                else a.tobytes() == b.tobytes()
+            )
+        )
+    if isinstance(a, StringLayout):
+        return a.inverter_models == b.inverter_models and all(
+            is_equal(getattr(a, name), getattr(b, name))
+            for name in ("inverter_index", "unit_index", "module_count")
+        )
+    if isinstance(a, (dict, list, tuple)):
+        if isinstance(a, dict):
+            if a.keys() != b.keys():
+                return False
+            a, b = list(a.values()), list(b.values())
+        return len(a) == len(b) and all(map(is_equal, a, b))
+    if isinstance(a, RecordView):
+        return is_equal(
+            a.records[a.index : a.index + 1], b.records[b.index : b.index + 1]
+        )
+    if type(a).__eq__ is object.__eq__:
+        attributes = get_attributes(a)
+        if attributes is not None:
+            return is_equal(attributes, get_attributes(b))
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class ComputationGraph:
+    """
+    Inputs and lazily computed nodes. Every input change starts a new
+    revision; each node records the revision in which its value last
+    changed and the last one in which it was verified.
+    """
+
+    def __init__(self) -> None:
+        self.functions = {}
+        self.dependencies = {}
+        self.values = {}
+        self.changed_at = {}
+        self.verified_at = {}
+        self.revision = 0
+
+        self.timings = {}  # s, duration of the last computation of each node
+        self.computed = []  # nodes computed since the last input change
+
+    def add_input(self, name: str, value) -> None:
+        self.values[name] = value
+        self.changed_at[name] = self.verified_at[name] = self.revision
+
+    def add_node(self, name: str, function, dependencies: list[str]) -> None:
+        """
+        :param str name: Node name
+        :param function: Computes the node from its dependencies, passed as
+            positional arguments in the given order
+        :param list[str] dependencies: Names of inputs or other nodes
+        """
+        self.functions[name] = function
+        self.dependencies[name] = list(dependencies)
+
+    def set(self, **inputs) -> None:
+        """
+        Changes inputs. Inputs set to an equal value are ignored.
+
+        :raises Exception: If a name is not an input
+        """
+        for name in inputs:
+            if name not in self.values or name in self.functions:
+                raise Exception(f'"{name}" is not an input of the graph.')
+
+        changed = {
+            name: value
+            for name, value in inputs.items()
+            if not is_equal(self.values[name], value)
+        }
+        if not changed:
+            return
+
+        self.revision += 1
+        self.computed = []
+        for name, value in changed.items():
+            self.values[name] = value
+            self.changed_at[name] = self.verified_at[name] = self.revision
+
+    def get(self, name: str):
+        """
+        :param str name: Input or node name
+        :return: Up to date value
+        """
+        if name not in self.functions or self.verified_at.get(name) == (
+            self.revision
+        ):
+            return self.values[name]
+
+        dependencies = self.dependencies[name]
+        arguments = [self.get(dependency) for dependency in dependencies]
+        if name in self.values and all(
+            self.changed_at[dependency] <= self.verified_at[name]
+            for dependency in dependencies
+        ):
+            self.verified_at[name] = self.revision
+            return self.values[name]
+
+        start = time.perf_counter()
+        value = self.functions[name](*arguments)
+        self.timings[name] = time.perf_counter() - start
+        self.computed.append(name)
+
+        if name not in self.values or not is_equal(self.values[name], value):
+            self.values[name] = value
+            self.changed_at[name] = self.revision
+        self.verified_at[name] = self.revision
+        return self.values[name]
+
+
+def get_dc_limits(module, inverters, layout: StringLayout) -> dict:
+    """
+    :return: Open circuit and max. power voltage range of the strings of
+        each inverter model (V), and whether they respect the inverter
+        "v_dc_max", MPPT range and "i_dc_max", at STC
+    :rtype: dict
+    """
+    shortest, longest = layout.string_length_range
+    v_oc = module.v_oc * longest
+    v_max_range = (module.v_max * shortest, module.v_max * longest)
+    feasible = (
+        (v_oc <= [inv.v_dc_max for inv in inverters])
+        & (v_max_range[0] >= [inv.v_mppt_min for inv in inverters])
+        & (v_max_range[1] <= [inv.v_mppt_max for inv in inverters])
+        & (
+            module.i_sc * np.array([inv.string_count for inv in inverters])
+            <= [inv.i_dc_max for inv in inverters]
+        )
+    )
+    return {"v_oc": v_oc, "v_max_range": v_max_range, "feasible": feasible}
+
+
+def get_ac_limits(module_power: float, inverters, inverter_count) -> dict:
+    """
+    :return: Inverter power (W), active power (W), the min. of the module
+        and inverter power, and the fraction of the module power clipped
+    :rtype: dict
+    """
+    inverter_power = float(
+        np.dot([inv.p_ac_nom for inv in inverters], inverter_count)
+    )
+    active_power = min(module_power, inverter_power)
+    return {
+        "inverter_power": inverter_power,
+        "active_power": active_power,
+        "clipping": 1 - active_power / module_power if module_power else 0.0,
+    }
+
+
+class PlantGraph(ComputationGraph):
+    """
+    Computation graph of a plant design:
+
+    string_layout -> dc_limits, protection
+    module_power, inverter power -> ac_limits (AC clipping)
+    geracao_mensal -> geracao_anual
+    """
+
+    INPUTS = (
+        "module",
+        "inverters",
+        "inverter_count",
+        "module_count",
+        "inv_boolean",
+        "orientacao",
+        "anos",
+        "taxa",
+    )
+
+    def __init__(
+        self,
+        plant: PowerPlant,
+        orientacao: str = "N",
+        anos: int = 25,
+        taxa: float = 0.01,
+    ) -> None:
+        """
+        :param PowerPlant plant: Initial design
+        :param str orientacao: Orientation of the modules
+        :param int anos: Number of years of the annual generation
+        :param float taxa: Yearly degradation rate
+        """
+        super().__init__()
+
+        self.add_input("module", plant.module)
+        self.add_input("inverters", tuple(plant.inverters))
+        self.add_input("inverter_count", tuple(plant.inverter_count.tolist()))
+        self.add_input("module_count", plant.module_count)
+        self.add_input("inv_boolean", plant.inv_boolean)
+        self.add_input("orientacao", orientacao)
+        self.add_input("anos", anos)
+        self.add_input("taxa", taxa)
+
+        self.add_node(
+            "inverter_models",
+            lambda inverters: (
+                tuple(inv.p_ac_nom for inv in inverters),
+                tuple(inv.string_count for inv in inverters),
+            ),
+            ["inverters"],
+        )
+        self.add_node(
+            "string_layout",
+            lambda module_count, models, inverter_count: get_string_layout(
+                module_count, models[0], inverter_count, models[1]
+            ),
+            ["module_count", "inverter_models", "inverter_count"],
+        )
+        self.add_node(
+            "dc_limits",
+            get_dc_limits,
+            ["module", "inverters", "string_layout"],
+        )
+        self.add_node(
+            "module_power",
+            lambda module, module_count: module.nominal_power * module_count,
+            ["module", "module_count"],
+        )
+        self.add_node(
+            "ac_limits",
+            get_ac_limits,
+            ["module_power", "inverters", "inverter_count"],
+        )
+        self.add_node(
+            "irradiacao_mensal", get_irradiacao_mensal, ["orientacao"]
+        )
+        self.add_node(
+            "geracao_mensal",
+            lambda module, module_count, irradiacao: get_geracao_mensal(
+                module.nominal_power, module_count, irradiacao
+            ),
+            ["module", "module_count", "irradiacao_mensal"],
+        )
+        self.add_node(
+            "geracao_anual",
+            get_geracao_anual,
+            ["geracao_mensal", "anos", "taxa"],
+        )
+        self.add_node(
+            "breakers",
+            lambda inverters, inverter_count, inv_boolean: (
+                get_plant_breakers(
+                    [inv.i_ac_max for inv in inverters],
+                    inverter_count,
+                    inv_boolean,
+                )
+            ),
+            ["inverters", "inverter_count", "inv_boolean"],
+        )
+        self.add_node(
+            "protection",
+            lambda module, inverters, layout, module_count: (
+                size_plant_protection(
+                    module, inverters, layout, get_cable_length(module_count)
+                )
+            ),
+            ["module", "inverters", "string_layout", "module_count"],
+        )
+
+    def set(self, **inputs) -> None:
+        """
+        Changes design inputs, e.g. set(module_count=30) or
+        set(orientacao="NE"). Lists are converted to tuples.
+        """
+        super().set(
+            **{
+                name: tuple(value) if isinstance(value, list) else value
+                for name, value in inputs.items()
+            }
+        )
+
+    def swap_inverter(self, index: int, inverter) -> None:
+        """
+        :param int index: Position of the inverter model to replace
+        :param Inverter inverter: New inverter model
+        """
+        inverters = list(self.values["inverters"])
+        inverters[index] = inverter
+        self.set(inverters=inverters)
+
+    def update(self) -> dict:
+        """
+        Brings every node up to date.
+
+        :return: Value of every node
+        :rtype: dict
+        """
+        return {name: self.get(name) for name in self.functions}
@@ -2,10 +2,54 @@
 # Copyright © Felipe Bogaerts de Mattos
 # Contact: me@felipebm.com
 
+import re
+
+import numpy as np
+
+from .efficiency import EfficiencyCurve
 from .generic import Brand, PhysicalProperties
 
 
+def parse_voltage_range(voltage_range: str) -> tuple[float, float]:
+    """
+    Example:
+    "240-800 V" returns (240.0, 800.0).
+
+    :param str voltage_range: Voltage range as written in the datasheet
+    :return: Min. and max. voltage of the range (V)
+    :rtype: tuple[float, float]
+    :raises Exception: If the range does not contain exactly two numbers
+    """
+    values = re.findall(r"\d+(?:[.,]\d+)?", voltage_range)
+    if len(values) != 2:
+        raise Exception(f'Could not parse voltage range "{voltage_range}".')
+    v_min, v_max = sorted(float(value.replace(",", ".")) for value in values)
+    return v_min, v_max
+
+
 class Inverter:
+    __slots__ = (
+        "brand",
+        "category",
+        "v_dc_max",
+        "voltage_range_mppt",
+        "v_mppt_min",
+        "v_mppt_max",
+        "p_dc_max_input",
+        "v_dc_start",
+        "i_dc_max",
+        "string_count",
+        "p_max",
+        "i_ac_max",
+        "p_ac_nom",
+        "v_ac_nom",
+        "freq",
+        "efficiency_mppt",
+        "efficiency_max",
+        "physical_properties",
+        "efficiency_curve",
+    )
+
     def __init__(
         self,
         brand: Brand,
@@ -24,6 +68,7 @@ class Inverter:
         efficiency_mppt: float,
         efficiency_max: float,
         physical_properties: PhysicalProperties,
+        efficiency_curve: EfficiencyCurve | None = None,
     ) -> None:
         """
         :param str brand: Inverter manufacturer brand
@@ -40,16 +85,23 @@ class Inverter:
         :param float p_ac_nom: Nominal output power (W)
         :param float v_ac_nom: Nominal output voltage (V)
         :param float freq: Inverter frequency (Hz)
-        :param float efficiency_mppt: MPPT efficiency, number from 0 to 1
+        :param float efficiency_mppt: MPPT efficiency, number from 0 to 1;
+            informative only, the AC output assumes the DC input is at the
+            max. power point
         :param float efficiency_max: Max. efficiency, number from 0 to 1
         :param float weight: Total weight (kg)
         :param str dimensions: dimensions in 'WIDTHxHEIGHTxDEPTH' (mm)
+        :param EfficiencyCurve | None efficiency_curve: Part-load efficiency,
+            defaults to a flat "efficiency_max"
         """
         self.brand = brand
 
         self.category = category
         self.v_dc_max = float(v_dc_max)
         self.voltage_range_mppt = voltage_range_mppt
+        self.v_mppt_min, self.v_mppt_max = parse_voltage_range(
+            voltage_range_mppt
+        )
         self.p_dc_max_input = float(p_dc_max_input)
         self.v_dc_start = v_dc_start
         self.i_dc_max = i_dc_max
@@ -63,6 +115,72 @@ class Inverter:
         self.efficiency_max = efficiency_max
 
         self.physical_properties = physical_properties
+        self.efficiency_curve = efficiency_curve
+
+    def get_efficiency_curve(self) -> EfficiencyCurve:
+        """
+        :return: Efficiency curve, or a flat curve at "efficiency_max"
+        :rtype: EfficiencyCurve
+        """
+        if self.efficiency_curve is None:
+            return EfficiencyCurve.flat(self.efficiency_max)
+        return self.efficiency_curve
+
+    def get_ac_limit(self) -> float:
+        """
+        :return: Max. AC output, as a fraction of "p_ac_nom"
+        :rtype: float
+        """
+        return min(self.p_ac_nom, self.p_max) / self.p_ac_nom
+
+    def get_ac_power(
+        self,
+        dc_power: np.ndarray,
+        dc_voltage: np.ndarray | None = None,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        AC output of one unit, clipped at "p_ac_nom" (or "p_max", if lower).
+        The inverter does not start while the DC voltage is below
+        "v_dc_start".
+
+        :param np.ndarray dc_power: DC power available at the input (W)
+        :param np.ndarray | None dc_voltage: DC input voltage (V)
+        :param np.ndarray | None out: Output buffer
+        :return: AC power (W)
+        :rtype: np.ndarray
+        """
+        out = self.get_efficiency_curve().get_ac_fraction(
+            np.divide(dc_power, self.p_ac_nom),
+            dc_voltage,
+            self.get_ac_limit(),
+            out=out,
+        )
+        out *= self.p_ac_nom
+        if dc_voltage is not None and self.v_dc_start:
+            out *= np.greater_equal(dc_voltage, self.v_dc_start)
+        return out
+
+    def get_clipped_power(
+        self, dc_power: np.ndarray, dc_voltage: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        While clipping, the inverter moves its DC input away from the max.
+        power point until the output equals the limit, so the DC power
+        above the input at the limit is not harvested.
+
+        :param np.ndarray dc_power: DC power available at the input (W)
+        :param np.ndarray | None dc_voltage: DC input voltage (V)
+        :return: DC power lost to clipping (W)
+        :rtype: np.ndarray
+        """
+        dc_limit = self.p_ac_nom * self.get_efficiency_curve().get_dc_limit(
+            dc_voltage, self.get_ac_limit()
+        )
+        return np.maximum(np.subtract(dc_power, dc_limit), 0)
 
     def __str__(self) -> str:
-        return f"{self.model} - {self.brand} - {self.p_ac_nom / 1000}kW"
+        return (
+            f"{self.brand.model} - {self.brand.name} - "
+            f"{self.p_ac_nom / 1000}kW"
+        )
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+
+class StringLayout:
+    """
+    Distribution of the modules of a plant among its strings, as arrays with
+    one element per string. Strings are ordered by inverter model, then by
+    inverter unit.
+    """
+
+    def __init__(
+        self,
+        inverter_index: np.ndarray,
+        unit_index: np.ndarray,
+        module_count: np.ndarray,
+        inverter_models: int,
+    ) -> None:
+        """
+        :param np.ndarray inverter_index: Inverter model of each string
+        :param np.ndarray unit_index: Inverter unit of each string, counting
+            the units of every model
+        :param np.ndarray module_count: Number of modules in each string
+        :param int inverter_models: Number of inverter models in the plant
+        """
+        self.inverter_index = inverter_index
+        self.unit_index = unit_index
+        self.module_count = module_count
+        self.inverter_models = int(inverter_models)
+
+    def __len__(self) -> int:
+        return len(self.module_count)
+
+    @property
+    def modules_per_inverter(self) -> np.ndarray:
+        """
+        :return: Number of modules of each inverter model (all units)
+        :rtype: np.ndarray
+        """
+        return np.bincount(
+            self.inverter_index,
+            weights=self.module_count,
+            minlength=self.inverter_models,
+        ).astype(int)
+
+    @property
+    def modules_per_unit(self) -> np.ndarray:
+        """
+        :return: Number of modules of each inverter unit
+        :rtype: np.ndarray
+        """
+        return np.bincount(self.unit_index, weights=self.module_count).astype(
+            int
+        )
+
+    @property
+    def string_length_range(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Number of modules of the shortest and of the longest string
+            of each inverter model (0 for models without strings)
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        shortest = np.full(self.inverter_models, np.iinfo(int).max)
+        longest = np.zeros(self.inverter_models, dtype=int)
+        np.minimum.at(shortest, self.inverter_index, self.module_count)
+        np.maximum.at(longest, self.inverter_index, self.module_count)
+        return np.minimum(shortest, longest), longest
+
+
+def distribute_by_weight(total: int, weights: np.ndarray) -> np.ndarray:
+    """
+    Splits total in integer parts proportional to weights, using the largest
+    remainder method, so the parts always add up to total.
+
+    :param int total: Amount to distribute
+    :param np.ndarray weights: Non-negative weights of each part
+    :return: Integer parts
+    :rtype: np.ndarray
+    :raises Exception: If all weights are zero
+    """
+    weights = np.asarray(weights, dtype=float)
+    if np.sum(weights) <= 0:
+        raise Exception("Cannot distribute modules without inverter power.")
+
+    quotas = total * weights / np.sum(weights)
+    parts = np.floor(quotas).astype(int)
+    remainder = int(total - np.sum(parts))
+    largest = np.argsort(-(quotas - parts), kind="stable")[:remainder]
+    parts[largest] += 1
+    return parts
+
+
+def split_evenly(totals: np.ndarray, parts: np.ndarray) -> np.ndarray:
+    """
+    Splits each total in a number of parts that differ by at most one,
+    smaller parts first.
+
+    Example:
+    split_evenly([10, 25], [3, 2]) returns [3, 3, 4, 12, 13].
+
+    :param np.ndarray totals: Amounts to split
+    :param np.ndarray parts: Number of parts of each amount
+    :return: Parts of every amount, concatenated
+    :rtype: np.ndarray
+    """
+    totals = np.asarray(totals, dtype=int)
+    parts = np.asarray(parts, dtype=int)
+
+    owner = np.repeat(np.arange(len(parts)), parts)
+    position = np.arange(len(owner)) - np.repeat(
+        np.cumsum(parts) - parts, parts
+    )
+
+    base, remainder = np.divmod(totals[owner], parts[owner])
+    return base + (position >= parts[owner] - remainder)
+
+
+def get_string_layout(
+    module_count: int,
+    p_ac_nom: np.ndarray,
+    inverter_count: np.ndarray,
+    string_count: np.ndarray,
+) -> StringLayout:
+    """
+    Distributes the modules among inverter models in proportion to their
+    total nominal power, then evenly among the units of each model and
+    finally evenly among the strings of each unit. Every step is closed-form,
+    so the cost is linear in the number of strings.
+
+    :param int module_count: Number of modules in the plant
+    :param np.ndarray p_ac_nom: Nominal power of each inverter model (W)
+    :param np.ndarray inverter_count: Number of units of each model
+    :param np.ndarray string_count: Number of strings of each model
+    :return: String layout of the plant
+    :rtype: StringLayout
+    """
+    p_ac_nom = np.asarray(p_ac_nom, dtype=float)
+    inverter_count = np.asarray(inverter_count, dtype=int)
+    string_count = np.asarray(string_count, dtype=int)
+
+    modules_per_inverter = distribute_by_weight(
+        module_count, p_ac_nom * inverter_count
+    )
+    modules_per_unit = split_evenly(modules_per_inverter, inverter_count)
+
+    unit_inverter = np.repeat(np.arange(len(inverter_count)), inverter_count)
+    unit_string_count = string_count[unit_inverter]
+
+    return StringLayout(
+        inverter_index=np.repeat(unit_inverter, unit_string_count),
+        unit_index=np.repeat(np.arange(len(unit_inverter)), unit_string_count),
+        module_count=split_evenly(modules_per_unit, unit_string_count),
+        inverter_models=len(inverter_count),
+    )
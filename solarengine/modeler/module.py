@@ -6,6 +6,18 @@ from .generic import Brand
 
 
 class Module:
+    __slots__ = (
+        "brand",
+        "nominal_power",
+        "v_oc",
+        "i_sc",
+        "v_max",
+        "i_max",
+        "ppt",
+        "efficiency",
+        "area",
+    )
+
     def __init__(
         self,
         brand: Brand,
@@ -43,4 +55,6 @@ class Module:
         self.area = float(area)
 
     def __str__(self) -> str:
-        return f"{self.model} - {self.brand} - {self.nominal_power}Wp"
+        return (
+            f"{self.brand.model} - {self.brand.name} - {self.nominal_power}Wp"
+        )
@@ -2,13 +2,45 @@
 # Copyright © Felipe Bogaerts de Mattos
 # Contact: me@felipebm.com
 
+from functools import wraps
+
 import numpy as np
 
 from .module import Module
 from .inverter import Inverter
+from .layout import StringLayout, get_string_layout
+from .protection import (
+    get_cable_length,
+    get_plant_breakers,
+    select_spds,
+    size_plant_protection,
+)
 from .strings import PVString
+from .temperature import get_temperature_derating
 from ..config import get_safety_factor
-from ..utils import get_available_din, calculo_disjuntor
+
+
+def cached(method):
+    """
+    Memoizes the result of a PowerPlant method until one of the plant inputs
+    (module, inverters, inverter_count, module_count or inv_boolean) is
+    reassigned.
+    Array results are returned read-only, since they are shared between
+    callers.
+    """
+
+    @wraps(method)
+    def wrapper(self):
+        try:
+            return self._cache[method.__name__]
+        except KeyError:
+            value = method(self)
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[method.__name__] = value
+            return value
+
+    return wrapper
 
 
 class PowerPlantInfo:
@@ -23,6 +55,30 @@ class PowerPlantInfo:
     structural_type: str
     power_company: str
 
+    def __init__(
+        self,
+        address: str | None = None,
+        plant_id: str | None = None,
+        class_type: str | None = None,
+        subgroup: str | None = None,
+        structural_type: str | None = None,
+        power_company: str | None = None,
+    ) -> None:
+        """
+        :param str | None address: Address of the plant
+        :param str | None plant_id: Identifier of the plant
+        :param str | None class_type: Consumer class, e.g. "Residencial"
+        :param str | None subgroup: Tariff subgroup, e.g. "B1"
+        :param str | None structural_type: Type of mounting structure
+        :param str | None power_company: Utility the plant is connected to
+        """
+        self.address = address
+        self.plant_id = plant_id
+        self.class_type = class_type
+        self.subgroup = subgroup
+        self.structural_type = structural_type
+        self.power_company = power_company
+
 
 class PowerPlant:
     def __init__(
@@ -49,6 +105,8 @@ class PowerPlant:
         :param int inv_boolean: 0 for central inverter, 1 for micro
         :param PowerPlantInfo | None info: Info class object, contains metadata
         """
+        self._cache = {}
+
         self.module = module
         self.inverters = inverters
         self.inverter_count = np.array(inverter_count)
@@ -61,6 +119,63 @@ class PowerPlant:
 
         self.validate_inputs()
 
+    @property
+    def module(self) -> Module:
+        return self._module
+
+    @module.setter
+    def module(self, module: Module) -> None:
+        self._module = module
+        self.clear_cache()
+
+    @property
+    def inverters(self) -> list[Inverter]:
+        return self._inverters
+
+    @inverters.setter
+    def inverters(self, inverters: list[Inverter]) -> None:
+        self._inverters = list(inverters)
+        self.clear_cache()
+
+    @property
+    def inverter_count(self) -> np.ndarray:
+        return self._inverter_count
+
+    @inverter_count.setter
+    def inverter_count(self, inverter_count: list[int]) -> None:
+        # Read-only, so that in-place edits cannot bypass the cache:
+        self._inverter_count = np.array(inverter_count)
+        self._inverter_count.flags.writeable = False
+        self.clear_cache()
+
+    @property
+    def module_count(self) -> int:
+        return self._module_count
+
+    @module_count.setter
+    def module_count(self, module_count: int) -> None:
+        self._module_count = int(module_count)
+        self.clear_cache()
+
+    @property
+    def inv_boolean(self) -> int:
+        return self._inv_boolean
+
+    @inv_boolean.setter
+    def inv_boolean(self, inv_boolean: int) -> None:
+        self._inv_boolean = int(inv_boolean)
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """
+        Discards every derived value (string layout, inverter power, string
+        count, DIN list). Called automatically whenever module, inverters,
+        inverter_count, module_count or inv_boolean is reassigned; must be
+        called manually after mutating an Inverter or Module object in
+        place, or the inverters list itself.
+        """
+        self._cache.clear()
+
     def validate_inputs(self) -> None:
         """
         Validates input data.
@@ -78,37 +193,39 @@ class PowerPlant:
             )
 
     @property
+    @cached
+    def string_layout(self) -> StringLayout:
+        """
+        :return: Distribution of modules among every string of every
+            inverter unit in the plant
+        :rtype: StringLayout
+        """
+        return get_string_layout(
+            self.module_count,
+            [inv.p_ac_nom for inv in self.inverters],
+            self.inverter_count,
+            [inv.string_count for inv in self.inverters],
+        )
+
+    @property
+    @cached
     def pv_strings(self) -> list[PVString]:
         """
-        :return: List of solar array strings in the power plant
+        The list is computed once and shared until the plant inputs change,
+        so it must not be mutated by the caller.
+
+        :return: List of solar array strings in the power plant, one per
+            string of each inverter unit
         :rtype: list[PVString]
         """
-        pv_strings = []
-
-        numero_paineis_por_inversor = self.distribute_panels_by_inverter()
-
-        for i, inv in enumerate(self.inverters):  # iterating through inverters
-            pv_strings_inv_current = []
-            for _ in range(
-                inv.string_count
-            ):  # iterating through strings in the inverter
-                module_count_inv = (
-                    0  # number of modules allocated to current inverter
-                )
-                # Iterating through strings already allocated to current
-                # inverter:
-                for string in pv_strings_inv_current:
-                    module_count_inv += string.module_count
-                module_count_string_current = int(
-                    (numero_paineis_por_inversor[i] - module_count_inv)
-                    / (inv.string_count - len(pv_strings_inv_current))
-                )
-                pv_strings_inv_current.append(
-                    PVString(self.module, module_count_string_current, inv)
-                )
-            pv_strings += pv_strings_inv_current
-
-        return pv_strings
+        layout = self.string_layout
+
+        return [
+            PVString(self.module, module_count, self.inverters[i])
+            for i, module_count in zip(
+                layout.inverter_index.tolist(), layout.module_count.tolist()
+            )
+        ]
 
     def get_different_pv_strings(self) -> list[int]:
         """
@@ -123,9 +240,7 @@ class PowerPlant:
         pv_strings_diferentes = [0]
         j = 0
         for i in range(len(self.pv_strings)):
-            if self.compare_pv_string(self, i, j):
-                pass
-            else:
+            if not self.compare_pv_string(i, j):
                 pv_strings_diferentes.append(i)
                 j = i
 
@@ -143,10 +258,12 @@ class PowerPlant:
         :return: True if both strings share same Inv. model and module count
         :rtype: bool
         """
-        module_count_str_1 = self.pv_strings[index_pv_string_1].module_count
-        module_count_str_2 = self.pv_strings[index_pv_string_2].module_count
-        modelo_inv_str_1 = self.pv_strings[index_pv_string_1].inversor.modelo
-        modelo_inv_str_2 = self.pv_strings[index_pv_string_2].inversor.modelo
+        pv_strings = self.pv_strings
+
+        module_count_str_1 = pv_strings[index_pv_string_1].module_count
+        module_count_str_2 = pv_strings[index_pv_string_2].module_count
+        modelo_inv_str_1 = pv_strings[index_pv_string_1].inverter.brand.model
+        modelo_inv_str_2 = pv_strings[index_pv_string_2].inverter.brand.model
 
         if (
             module_count_str_1 == module_count_str_2
@@ -164,8 +281,9 @@ class PowerPlant:
         return np.sum(self.inverter_count)
 
     def get_cable_length_per_pole(self) -> float:
-        return 50 + 2 * self.module_count
+        return get_cable_length(self.module_count)
 
+    @cached
     def get_number_of_strings(self) -> int:
         numero_strings = 0
         for i, inv in enumerate(self.inverters):
@@ -192,15 +310,20 @@ class PowerPlant:
         """
         return self.module_count * self.module.nominal_power
 
-    def get_real_module_output_power(self, T_ref) -> float:
+    def get_real_module_output_power(
+        self, T_ref: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         """
+        :param np.ndarray T_ref: Cell temperature of the modules (C), e.g.
+            a whole series from "modeler.temperature.get_cell_temperature"
+        :param np.ndarray | None out: Output buffer, may be T_ref
         :return: Real power from modules in the power plant (W)
-        :rtype: float
+        :rtype: np.ndarray
         """
-        return self.get_ideal_module_output_power() * (
-            1 - (T_ref * self.module.ppt / 100)
-        )
+        out = get_temperature_derating(T_ref, self.module.ppt, out=out)
+        return np.multiply(out, self.get_ideal_module_output_power(), out=out)
 
+    @cached
     def get_inverter_output_power(self) -> float:
         """
         :return: Total power from inverters in the plant (W)
@@ -240,47 +363,31 @@ class PowerPlant:
         else:
             return False
 
+    @cached
     def distribute_panels_by_inverter(self) -> list[int]:
         """
+        Modules are distributed in proportion to the total nominal power of
+        each inverter model, and always add up to module_count.
+
         :return: List with number of PV modules attributed to each inverter,
             respectively
         :rtype: np.array[int]
         """
-        module_list_per_inv = np.array([])  # inicializando a lista
-        for i, inv in enumerate(self.inverters):
-            number_of_modules = (
-                self.module_count
-                * (inv.p_ac_nom / self.get_inverter_output_power())
-                * self.inverter_count[i]
-            )
-            module_list_per_inv = np.append(
-                module_list_per_inv, round(number_of_modules)
-            )
-        return module_list_per_inv
+        return self.string_layout.modules_per_inverter
 
     def get_voltage_spd_poles(self):
         """
-        Retorna a tensão e o número de polos do(s) DPS(s) da usina.
-        Função itera sobre todos inverters, e retorna o valor máximo da tensão
-        do DPS e do número de polos.
+        Retorna a tensão e o número de polos do(s) DPS(s) da usina: o valor
+        máximo da tensão do DPS e do número de polos entre os inversores.
         """
-        spd_voltage_array = np.array([])
-        number_of_poles_array = np.array([])
-
-        for inv in self.inverters:
-            if 100 <= float(inv.v_ac_nom) <= 150:
-                spd_voltage_array = np.append(spd_voltage_array, 220)
-                number_of_poles_array = np.append(number_of_poles_array, 1)
-            elif 200 <= float(inv.v_ac_nom) <= 240:
-                spd_voltage_array = np.append(spd_voltage_array, 220)
-                number_of_poles_array = np.append(number_of_poles_array, 2)
-            elif 360 <= float(inv.v_ac_nom) <= 400:
-                spd_voltage_array = np.append(spd_voltage_array, 275)
-                number_of_poles_array = np.append(number_of_poles_array, 3)
-        spd_voltage = np.max(spd_voltage_array)
-        pole_count = np.max(number_of_poles_array)
-
-        return spd_voltage, pole_count
+        spd_voltage, pole_count, _ = select_spds(
+            [inv.v_ac_nom for inv in self.inverters], np.nan
+        )
+        if np.all(np.isnan(spd_voltage)):
+            raise Exception(
+                "Tensao nominal dos inversores fora das faixas de DPS."
+            )
+        return np.nanmax(spd_voltage), np.nanmax(pole_count)
 
     def get_max_output_current_from_inverters(
         self, inv_index: int = None
@@ -293,36 +400,46 @@ class PowerPlant:
             corrente_max = self.inverters[inv_index].i_ac_max
         return corrente_max
 
-    def get_din_list_plant(self) -> list[int]:
-        # If there's more than 1 central inverter, there will be more than 1
-        # DIN
-        din_list = np.array([])
-
-        # If there's more than 1 central inverter:
-        if len(self.inverter_count) > 1 and self.inv_boolean == 0:
-            for i in range(len(self.inverter_count)):
-                din_list = np.append(
-                    din_list,
-                    calculo_disjuntor(
-                        self.get_max_output_current_from_inverters(
-                            inv_index=i
-                        ),
-                        get_available_din(),
-                        get_safety_factor(),
-                    ),
-                )
-        else:  # if it's a micro inv or multiple central invs
-            din_list = np.append(
-                din_list,
-                calculo_disjuntor(
-                    self.get_max_output_current_from_inverters(),
-                    get_available_din(),
-                    get_safety_factor(),
-                ),
-            )
+    @cached
+    def get_din_list_plant(self) -> np.ndarray:
+        """
+        :return: Breaker of each central inverter model or, for micro
+            inverters and a single model, of the summed output current (A)
+        :rtype: np.ndarray
+        :raises Exception: If no available breaker fits a current
+        """
+        current = [inv.i_ac_max for inv in self.inverters]
+        din_list = get_plant_breakers(
+            current, self.inverter_count, self.inv_boolean
+        )
 
+        if np.isnan(din_list).any():
+            if len(din_list) == 1:
+                current = [self.get_max_output_current_from_inverters()]
+            raise Exception(
+                f"Disjuntores não são compatíveis com a corrente do projeto "
+                f"de {np.max(current) * get_safety_factor():.2f} A."
+            )
         return din_list
 
+    @cached
+    def get_protection(self) -> np.ndarray:
+        """
+        Protection and cables of each inverter model, see
+        "size_plant_protection". Both DC and AC circuits have the length of
+        "get_cable_length_per_pole".
+
+        :return: Structured array with PROTECTION_DTYPE, one record per
+            inverter model
+        :rtype: np.ndarray
+        """
+        return size_plant_protection(
+            self.module,
+            self.inverters,
+            self.string_layout,
+            self.get_cable_length_per_pole(),
+        )
+
     def get_total_module_area(self) -> float:
         """
         :return: Total module area in the power plant (sq. m)
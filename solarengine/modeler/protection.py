@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Sizing of the protection and cabling of inverter circuits: AC breakers,
+DC and AC cable cross-sections with their voltage drop, and AC and DC surge
+protection devices (SPD). Every function works on arrays of circuits, e.g.
+one per inverter model of many plants, and selects from sorted catalogs with
+"np.searchsorted". Values that no catalog entry can satisfy result in NaN.
+"""
+
+import bisect
+
+import numpy as np
+
+from ..config import get_safety_factor
+from ..utils import get_available_din
+
+COPPER_RESISTIVITY = 0.0179  # ohm * mm ** 2 / m
+
+# Copper cables, PVC insulation, 2 loaded conductors, installation method B1
+# (NBR 5410): cross-section (mm ** 2) and ampacity (A).
+CABLE_SECTIONS = np.array(
+    [1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240, 300]
+)
+CABLE_AMPACITIES = np.array(
+    [
+        17.5,
+        24,
+        32,
+        41,
+        57,
+        76,
+        101,
+        125,
+        151,
+        192,
+        232,
+        269,
+        309,
+        353,
+        415,
+        477,
+    ]
+)
+
+# AC nominal voltage ranges (V), with the SPD max. continuous voltage (V),
+# number of poles and voltage drop factor of each (2 for 1 or 2 phases and
+# sqrt(3) for 3 phases):
+AC_VOLTAGE_RANGES = np.array([[100, 150], [200, 240], [360, 400]])
+AC_SPD_VOLTAGES = np.array([220, 220, 275])
+AC_SPD_POLES = np.array([1, 2, 3])
+AC_DROP_FACTORS = np.array([2, 2, np.sqrt(3)])
+
+DC_SPD_VOLTAGES = np.array([600, 1000, 1100, 1500])
+
+# Design current of DC string cables, relative to the short circuit current
+# (NBR 16690):
+DC_CURRENT_FACTOR = 1.25
+
+PROTECTION_DTYPE = np.dtype(
+    [
+        ("breaker", float),  # A
+        ("ac_section", float),  # mm ** 2
+        ("ac_voltage_drop", float),  # fraction of v_ac_nom
+        ("dc_section", float),  # mm ** 2
+        ("dc_voltage_drop", float),  # fraction of the string voltage
+        ("ac_spd_voltage", float),  # V
+        ("ac_spd_poles", float),
+        ("dc_spd_voltage", float),  # V
+    ]
+)
+
+
+def select_smallest(values, catalog: np.ndarray) -> np.ndarray:
+    """
+    :param values: Min. values required
+    :param np.ndarray catalog: Available values, sorted
+    :return: Index of the smallest catalog value not below each value, or
+        len(catalog) if there is none
+    :rtype: np.ndarray
+    """
+    return np.searchsorted(catalog, values, side="left")
+
+
+def take_or_nan(catalog: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """
+    :return: Catalog values at index, NaN where the index is out of range
+    :rtype: np.ndarray
+    """
+    catalog = np.asarray(catalog, dtype=float)
+    fits = index < len(catalog)
+    return np.where(fits, catalog[np.where(fits, index, 0)], np.nan)
+
+
+def select_breakers(
+    current,
+    breakers: np.ndarray | None = None,
+    safety_factor: float | None = None,
+) -> np.ndarray:
+    """
+    Vectorized equivalent of "calculo_disjuntor". Currents that do not fit
+    any available breaker result in NaN.
+
+    :param current: Max. currents (A)
+    :param np.ndarray | None breakers: Available breakers (A), sorted;
+        defaults to "get_available_din()"
+    :param float | None safety_factor: Safety factor applied to the
+        current, defaults to "get_safety_factor()"
+    :return: Smallest breaker that fits each current (A)
+    :rtype: np.ndarray
+    """
+    if breakers is None:
+        breakers = np.sort(get_available_din())
+    if safety_factor is None:
+        safety_factor = get_safety_factor()
+
+    current = np.asarray(current, dtype=float)
+    return take_or_nan(
+        breakers, select_smallest(current * safety_factor, breakers)
+    )
+
+
+def select_breaker(
+    current: float,
+    breakers: list[float] | None = None,
+    safety_factor: float | None = None,
+) -> float:
+    """
+    Scalar "select_breakers" for plants with a single circuit. A bisection
+    of the breaker list avoids the overhead of NumPy calls on one element.
+
+    :param float current: Max. current (A)
+    :param list[float] | None breakers: Available breakers (A), sorted;
+        defaults to "get_available_din()"
+    :param float | None safety_factor: Safety factor applied to the
+        current, defaults to "get_safety_factor()"
+    :return: Smallest breaker that fits the current, NaN if none does (A)
+    :rtype: float
+    """
+    if breakers is None:
+        breakers = sorted(get_available_din().tolist())
+    if safety_factor is None:
+        safety_factor = get_safety_factor()
+
+    index = bisect.bisect_left(breakers, current * safety_factor)
+    return float(breakers[index]) if index < len(breakers) else np.nan
+
+
+def get_plant_breakers(
+    i_ac_max: list[float], inverter_count, inv_boolean: int
+) -> np.ndarray:
+    """
+    Breakers of a plant: one per model of several central inverter models,
+    else one for the summed output current of micro inverters or of a
+    single model.
+
+    :param list[float] i_ac_max: Max. output current of each inverter
+        model (A)
+    :param inverter_count: Units of each inverter model
+    :param int inv_boolean: 0 for central inverters, 1 for micro inverters
+    :return: Breaker of each circuit, NaN where none fits (A)
+    :rtype: np.ndarray
+    """
+    if len(inverter_count) > 1 and inv_boolean == 0:
+        return select_breakers(np.array(i_ac_max, dtype=float))
+    current = sum(
+        current * count for current, count in zip(i_ac_max, inverter_count)
+    )
+    return np.array([select_breaker(current)])
+
+
+def get_cable_length(module_count) -> float:
+    """
+    :param module_count: Number of modules of the plant
+    :return: Length of the DC and AC circuits of the plant, one way (m)
+    :rtype: float
+    """
+    return 50 + 2 * module_count
+
+
+def get_voltage_drop(
+    current, length, section, voltage, factor=2.0
+) -> np.ndarray:
+    """
+    :param current: Current of the circuit (A)
+    :param length: Length of the circuit, one way (m)
+    :param section: Cross-section of the conductors (mm ** 2)
+    :param voltage: Nominal voltage of the circuit (V)
+    :param factor: 2 for DC and 1 or 2 phases, sqrt(3) for 3 phases
+    :return: Voltage drop, as a fraction of the voltage
+    :rtype: np.ndarray
+    """
+    return (
+        factor
+        * COPPER_RESISTIVITY
+        * np.asarray(length, dtype=float)
+        * current
+        / (np.asarray(section, dtype=float) * voltage)
+    )
+
+
+def select_cables(
+    current,
+    length,
+    voltage,
+    max_voltage_drop: float,
+    design_current=None,
+    factor=2.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Smallest cross-section whose ampacity is at least the design current
+    and whose voltage drop at the operating current is within the limit.
+
+    :param current: Operating current of the circuit (A)
+    :param length: Length of the circuit, one way (m)
+    :param voltage: Nominal voltage of the circuit (V)
+    :param float max_voltage_drop: Max. voltage drop, as a fraction
+    :param design_current: Min. ampacity (A), defaults to current
+    :param factor: See "get_voltage_drop"
+    :return: Cross-section (mm ** 2) and its voltage drop (fraction)
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    if design_current is None:
+        design_current = current
+
+    min_section = get_voltage_drop(
+        current, length, max_voltage_drop, voltage, factor
+    )
+    index = np.maximum(
+        select_smallest(design_current, CABLE_AMPACITIES),
+        select_smallest(min_section, CABLE_SECTIONS),
+    )
+    section = take_or_nan(CABLE_SECTIONS, index)
+    return section, get_voltage_drop(current, length, section, voltage, factor)
+
+
+def get_ac_range(v_ac_nom) -> np.ndarray:
+    """
+    :param v_ac_nom: Nominal output voltage of the inverters (V)
+    :return: Index of the range of AC_VOLTAGE_RANGES of each voltage, or
+        len(AC_VOLTAGE_RANGES) if there is none
+    :rtype: np.ndarray
+    """
+    v_ac_nom = np.asarray(v_ac_nom, dtype=float)[..., None]
+    inside = (AC_VOLTAGE_RANGES[:, 0] <= v_ac_nom) & (
+        v_ac_nom <= AC_VOLTAGE_RANGES[:, 1]
+    )
+    return np.where(
+        np.any(inside, axis=-1),
+        np.argmax(inside, axis=-1),
+        len(AC_VOLTAGE_RANGES),
+    )
+
+
+def select_spds(v_ac_nom, v_oc_string) -> tuple[np.ndarray, ...]:
+    """
+    :param v_ac_nom: Nominal output voltage of the inverters (V)
+    :param v_oc_string: Max. open circuit voltage of the strings (V)
+    :return: AC SPD voltage (V) and poles, DC SPD voltage (V)
+    :rtype: tuple[np.ndarray, ...]
+    """
+    ac_range = get_ac_range(v_ac_nom)
+    return (
+        take_or_nan(AC_SPD_VOLTAGES, ac_range),
+        take_or_nan(AC_SPD_POLES, ac_range),
+        take_or_nan(
+            DC_SPD_VOLTAGES,
+            select_smallest(
+                np.asarray(v_oc_string, dtype=float), DC_SPD_VOLTAGES
+            ),
+        ),
+    )
+
+
+def size_protection(
+    i_ac_max,
+    v_ac_nom,
+    i_sc_string,
+    i_max_string,
+    v_max_string,
+    v_oc_string,
+    dc_length,
+    ac_length,
+    safety_factor: float | None = None,
+    max_dc_voltage_drop: float = 0.02,
+    max_ac_voltage_drop: float = 0.03,
+) -> np.ndarray:
+    """
+    Sizes the protection and cables of any number of inverter circuits.
+    Inputs broadcast against each other.
+
+    The AC cable must carry the breaker current, so breaker and cable are
+    coordinated. DC string cables are sized for 1.25 times the short circuit
+    current and their voltage drop is computed at the max. power point.
+
+    :param i_ac_max: Max. output current of the inverter (A)
+    :param v_ac_nom: Nominal output voltage of the inverter (V)
+    :param i_sc_string: Short circuit current of the strings (A)
+    :param i_max_string: Max. power current of the strings (A)
+    :param v_max_string: Max. power voltage of the strings (V)
+    :param v_oc_string: Open circuit voltage of the strings (V)
+    :param dc_length: Length of the DC circuits, one way (m)
+    :param ac_length: Length of the AC circuits, one way (m)
+    :param float | None safety_factor: Breaker safety factor, defaults to
+        "get_safety_factor()"
+    :param float max_dc_voltage_drop: Max. DC voltage drop, as a fraction
+    :param float max_ac_voltage_drop: Max. AC voltage drop, as a fraction
+    :return: Structured array with PROTECTION_DTYPE
+    :rtype: np.ndarray
+    """
+    arrays = np.broadcast_arrays(
+        *[
+            np.asarray(value, dtype=float)
+            for value in (
+                i_ac_max,
+                v_ac_nom,
+                i_sc_string,
+                i_max_string,
+                v_max_string,
+                v_oc_string,
+                dc_length,
+                ac_length,
+            )
+        ]
+    )
+    (
+        i_ac_max,
+        v_ac_nom,
+        i_sc_string,
+        i_max_string,
+        v_max_string,
+        v_oc_string,
+        dc_length,
+        ac_length,
+    ) = arrays
+
+    result = np.empty(i_ac_max.shape, dtype=PROTECTION_DTYPE)
+    result["breaker"] = select_breakers(i_ac_max, safety_factor=safety_factor)
+
+    ac_range = get_ac_range(v_ac_nom)
+    result["ac_section"], result["ac_voltage_drop"] = select_cables(
+        i_ac_max,
+        ac_length,
+        v_ac_nom,
+        max_ac_voltage_drop,
+        design_current=result["breaker"],
+        factor=take_or_nan(AC_DROP_FACTORS, ac_range),
+    )
+    result["dc_section"], result["dc_voltage_drop"] = select_cables(
+        i_max_string,
+        dc_length,
+        v_max_string,
+        max_dc_voltage_drop,
+        design_current=DC_CURRENT_FACTOR * i_sc_string,
+    )
+    (
+        result["ac_spd_voltage"],
+        result["ac_spd_poles"],
+        result["dc_spd_voltage"],
+    ) = select_spds(v_ac_nom, v_oc_string)
+
+    return result
+
+
+def size_plant_protection(module, inverters, layout, length) -> np.ndarray:
+    """
+    Protection and cables of each inverter model of a plant. The DC voltage
+    drop is computed for the shortest string of each model and the DC SPD
+    for the longest. Models without strings (e.g. no units) have no DC
+    circuit, so their DC fields are NaN.
+
+    :param Module module: Module of the plant
+    :param list[Inverter] inverters: Inverter models of the plant
+    :param StringLayout layout: String layout of the plant
+    :param length: Length of the DC and AC circuits, one way (m)
+    :return: Structured array with PROTECTION_DTYPE, one record per
+        inverter model
+    :rtype: np.ndarray
+    """
+    shortest, longest = layout.string_length_range
+    strings = longest > 0
+    return size_protection(
+        i_ac_max=[inv.i_ac_max for inv in inverters],
+        v_ac_nom=[inv.v_ac_nom for inv in inverters],
+        i_sc_string=module.i_sc,
+        i_max_string=module.i_max,
+        v_max_string=np.where(strings, module.v_max * shortest, np.nan),
+        v_oc_string=np.where(strings, module.v_oc * longest, np.nan),
+        dc_length=length,
+        ac_length=length,
+    )
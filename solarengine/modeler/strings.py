@@ -2,8 +2,12 @@
 # Copyright © Felipe Bogaerts de Mattos
 # Contact: me@felipebm.com
 
+import numpy as np
+
+from .diode import get_max_power_point
 from .inverter import Inverter
 from .module import Module
+from .temperature import get_temperature_derating
 
 
 class PVString:
@@ -12,6 +16,8 @@ class PVString:
     A microinverter is modeled as a central inverter with only one string.
     """
 
+    __slots__ = ("module", "module_count", "inverter")
+
     def __init__(
         self,
         module: Module,
@@ -43,8 +49,7 @@ class PVString:
 
         :return: Maximum voltage in Volts
         """
-        self.v_max = self.module.v_max * self.module_count
-        return self.v_max
+        return self.module.v_max * self.module_count
 
     @property
     def i_sc(self) -> float:
@@ -60,19 +65,38 @@ class PVString:
         """
         return float(self.module.i_max)
 
+    def get_max_power_point(
+        self, irradiance: np.ndarray, cell_temperature: np.ndarray
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Single-diode max. power point of the string, see
+        "modeler.diode.get_max_power_point".
+
+        :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+        :param np.ndarray cell_temperature: Cell temperature (C)
+        :return: Voltage (V), current (A) and power (W)
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        return get_max_power_point(
+            self.module, irradiance, cell_temperature, self.module_count
+        )
+
     @property
     def power_output_ideal(self) -> float:
         """
         :return: Ideal power in Watts
         """
-        return self.module_count * self.module.potencia
+        return self.module_count * self.module.nominal_power
 
-    @property
-    def power_output_real(self, T_ref: float) -> float:
+    def power_output_real(
+        self, T_ref: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         """
-        :param float T_ref: Average operational temperature of the module
+        :param np.ndarray T_ref: Cell temperature of the modules (C), e.g.
+            from "modeler.temperature.get_cell_temperature"
+        :param np.ndarray | None out: Output buffer, may be T_ref
         :return: Real power in Watts
+        :rtype: np.ndarray
         """
-        return self.power_output_ideal() * (
-            1 - (T_ref * self.module.ppt / 100)
-        )
+        out = get_temperature_derating(T_ref, self.module.ppt, out=out)
+        return np.multiply(out, self.power_output_ideal, out=out)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Cell temperature models and the "ppt" power derating. Every function takes
+an optional "out" array, so long series are computed in preallocated
+buffers without intermediate arrays. Unless stated otherwise, "out" must not
+be one of the inputs.
+"""
+
+import numpy as np
+
+DEFAULT_WIND_SPEED = 1.0  # m/s
+
+# Faiman heat loss coefficients (W/m ** 2/C and W/m ** 3/C/s):
+FAIMAN_U0 = 25.0
+FAIMAN_U1 = 6.84
+
+# Sandia coefficients of an open rack glass/cell/glass module:
+SANDIA_A = -3.47
+SANDIA_B = -0.0594
+SANDIA_DELTA_T = 3.0  # C
+
+
+def get_buffer(out: np.ndarray | None, *arrays) -> np.ndarray:
+    """
+    :return: out, or a new float array with the broadcast shape of arrays
+    :rtype: np.ndarray
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(*(np.shape(a) for a in arrays)))
+    return out
+
+
+def get_noct_cell_temperature(
+    irradiance: np.ndarray,
+    ambient_temperature: np.ndarray,
+    noct: float = 45.0,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    T_c = T_a + G * (NOCT - 20) / 800
+
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray ambient_temperature: Ambient temperature (C)
+    :param float noct: Nominal operating cell temperature (C)
+    :param np.ndarray | None out: Output buffer, may be irradiance
+    :return: Cell temperature (C)
+    :rtype: np.ndarray
+    """
+    out = get_buffer(out, irradiance, ambient_temperature)
+    np.multiply(irradiance, (noct - 20) / 800, out=out)
+    return np.add(out, ambient_temperature, out=out)
+
+
+def get_faiman_cell_temperature(
+    irradiance: np.ndarray,
+    ambient_temperature: np.ndarray,
+    wind_speed: np.ndarray | None = None,
+    u0: float = FAIMAN_U0,
+    u1: float = FAIMAN_U1,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    T_c = T_a + G / (u0 + u1 * WS)
+
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray ambient_temperature: Ambient temperature (C)
+    :param np.ndarray | None wind_speed: Wind speed (m/s), defaults to
+        DEFAULT_WIND_SPEED
+    :param float u0: Constant heat loss coefficient (W/m ** 2/C)
+    :param float u1: Wind heat loss coefficient (W/m ** 3/C/s)
+    :param np.ndarray | None out: Output buffer
+    :return: Cell temperature (C)
+    :rtype: np.ndarray
+    """
+    if wind_speed is None:
+        wind_speed = DEFAULT_WIND_SPEED
+    out = get_buffer(out, irradiance, ambient_temperature, wind_speed)
+    np.multiply(wind_speed, u1, out=out)
+    np.add(out, u0, out=out)
+    np.divide(irradiance, out, out=out)
+    return np.add(out, ambient_temperature, out=out)
+
+
+def get_sandia_cell_temperature(
+    irradiance: np.ndarray,
+    ambient_temperature: np.ndarray,
+    wind_speed: np.ndarray | None = None,
+    a: float = SANDIA_A,
+    b: float = SANDIA_B,
+    delta_t: float = SANDIA_DELTA_T,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    T_c = T_a + G * exp(a + b * WS) + G / 1000 * delta_t
+
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray ambient_temperature: Ambient temperature (C)
+    :param np.ndarray | None wind_speed: Wind speed (m/s), defaults to
+        DEFAULT_WIND_SPEED
+    :param float a: Upper limit of the module temperature coefficient
+    :param float b: Wind speed coefficient (s/m)
+    :param float delta_t: Difference between cell and back of module
+        temperatures at 1000 W/m ** 2 (C)
+    :param np.ndarray | None out: Output buffer
+    :return: Cell temperature (C)
+    :rtype: np.ndarray
+    """
+    if wind_speed is None:
+        wind_speed = DEFAULT_WIND_SPEED
+    out = get_buffer(out, irradiance, ambient_temperature, wind_speed)
+    np.multiply(wind_speed, b, out=out)
+    np.add(out, a, out=out)
+    np.exp(out, out=out)
+    np.add(out, delta_t / 1000, out=out)
+    np.multiply(out, irradiance, out=out)
+    return np.add(out, ambient_temperature, out=out)
+
+
+TEMPERATURE_MODELS = {
+    "noct": get_noct_cell_temperature,
+    "faiman": get_faiman_cell_temperature,
+    "sandia": get_sandia_cell_temperature,
+}
+
+
+def get_cell_temperature(
+    irradiance: np.ndarray,
+    ambient_temperature: np.ndarray,
+    wind_speed: np.ndarray | None = None,
+    model: str = "noct",
+    out: np.ndarray | None = None,
+    **parameters,
+) -> np.ndarray:
+    """
+    Example:
+    get_cell_temperature(g, t, ws, model="faiman", out=buffer, u0=29)
+
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray ambient_temperature: Ambient temperature (C)
+    :param np.ndarray | None wind_speed: Wind speed (m/s), not used by the
+        NOCT model
+    :param str model: Key of TEMPERATURE_MODELS
+    :param np.ndarray | None out: Output buffer
+    :param parameters: Coefficients of the model, e.g. noct=45
+    :return: Cell temperature (C)
+    :rtype: np.ndarray
+    :raises Exception: If the model does not exist
+    """
+    if model not in TEMPERATURE_MODELS:
+        raise Exception(
+            f'Cell temperature model "{model}" does not exist. Options: '
+            f"{', '.join(TEMPERATURE_MODELS)}."
+        )
+    if model != "noct":
+        parameters["wind_speed"] = wind_speed
+    return TEMPERATURE_MODELS[model](
+        irradiance, ambient_temperature, out=out, **parameters
+    )
+
+
+def get_temperature_derating(
+    cell_temperature: np.ndarray,
+    ppt: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    1 - ppt / 100 * (T_c - 25)
+
+    :param np.ndarray cell_temperature: Cell temperature (C)
+    :param np.ndarray ppt: Decrease in efficiency per degree celsius (% / C)
+    :param np.ndarray | None out: Output buffer, may be cell_temperature
+    :return: Power relative to STC
+    :rtype: np.ndarray
+    """
+    out = get_buffer(out, cell_temperature, ppt)
+    np.subtract(cell_temperature, 25, out=out)
+    np.multiply(out, np.divide(ppt, -100), out=out)
+    return np.add(out, 1, out=out)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ..config import get_safety_factor
+from ..modeler.protection import select_breakers
+from ..utils import (
+    PERFORMANCE_RATIO,
+    get_available_din,
+    get_irradiacao_mensal,
+)
+from .financial import get_degradation_curve
+
+
+def get_batch_dtype(inverter_slots: int, years: int) -> np.dtype:
+    """
+    :param int inverter_slots: Max. number of inverter models per candidate
+    :param int years: Number of years of the annual generation projection
+    :return: Structured dtype of the batch results
+    :rtype: np.dtype
+    """
+    return np.dtype(
+        [
+            ("module_power", float),  # W
+            ("inverter_power", float),  # W
+            ("active_power", float),  # W
+            ("total_area", float),  # m ** 2
+            ("monthly_generation", float, (12,)),  # kWh
+            ("annual_generation", float, (years,)),  # kWh
+            ("din", float, (inverter_slots,)),  # A, one per inverter model
+            ("din_total", float),  # A, for the summed inverter current
+        ]
+    )
+
+
+def simulate_batch(
+    module_power: np.ndarray,
+    module_count: np.ndarray,
+    module_area: np.ndarray,
+    inverter_p_ac_nom: np.ndarray,
+    inverter_i_ac_max: np.ndarray,
+    inverter_count: np.ndarray,
+    orientation_factor: np.ndarray = 1.0,
+    irradiacao_mensal: np.ndarray | None = None,
+    years: int = 25,
+    degradation: float = 0.01,
+    chunk_size: int = 65536,
+) -> np.ndarray:
+    """
+    Computes the sizing and generation figures of N plant configurations at
+    once. Results are identical to building N PowerPlant objects and calling
+    "get_active_power", "get_total_module_area", "get_geracao_mensal" and
+    "get_geracao_anual" on each one.
+
+    Inverter arrays have shape (N, K), one column per inverter model of the
+    candidate; unused columns must have an inverter_count of 0. Arrays of
+    shape (N,) are treated as a single inverter model.
+
+    :param np.ndarray module_power: Nominal power of the module (Wp), (N,)
+    :param np.ndarray module_count: Number of modules, (N,)
+    :param np.ndarray module_area: Area of one module (m ** 2), (N,)
+    :param np.ndarray inverter_p_ac_nom: Nominal output power (W), (N, K)
+    :param np.ndarray inverter_i_ac_max: Max. output current (A), (N, K)
+    :param np.ndarray inverter_count: Number of inverters, (N, K)
+    :param np.ndarray orientation_factor: Fraction of the reference
+        irradiation received, see ORIENTATION_FACTORS, (N,)
+    :param np.ndarray | None irradiacao_mensal: Reference monthly
+        irradiation, defaults to "get_irradiacao_mensal()"
+    :param int years: Years in the annual generation projection
+    :param float degradation: Yearly generation degradation rate
+    :param int chunk_size: Candidates computed per pass, bounds memory use
+    :return: Structured array with one record per candidate
+    :rtype: np.ndarray
+    """
+    module_power = np.atleast_1d(np.asarray(module_power, dtype=float))
+    n = len(module_power)
+
+    def as_columns(array):
+        array = np.asarray(array, dtype=float)
+        return array.reshape(n, -1)
+
+    module_count = np.broadcast_to(np.asarray(module_count, float), (n,))
+    module_area = np.broadcast_to(np.asarray(module_area, float), (n,))
+    orientation_factor = np.broadcast_to(
+        np.asarray(orientation_factor, float), (n,)
+    )
+    inverter_p_ac_nom = as_columns(inverter_p_ac_nom)
+    inverter_i_ac_max = as_columns(inverter_i_ac_max)
+    inverter_count = as_columns(inverter_count)
+
+    if irradiacao_mensal is None:
+        irradiacao_mensal = get_irradiacao_mensal()
+    irradiacao_mensal = np.asarray(irradiacao_mensal, dtype=float)
+    if irradiacao_mensal.shape != (12,):
+        raise Exception("Irradiacao mensal deve ter comprimento 12.")
+
+    breakers = np.sort(get_available_din())
+    safety_factor = get_safety_factor()
+    degradation_curve = get_degradation_curve(years, degradation)
+
+    results = np.empty(
+        n, dtype=get_batch_dtype(inverter_count.shape[1], years)
+    )
+
+    for start in range(0, n, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        result = results[chunk]
+
+        result["module_power"] = module_power[chunk] * module_count[chunk]
+        result["inverter_power"] = np.sum(
+            inverter_p_ac_nom[chunk] * inverter_count[chunk], axis=1
+        )
+        result["active_power"] = np.minimum(
+            result["module_power"], result["inverter_power"]
+        )
+        result["total_area"] = module_count[chunk] * module_area[chunk]
+
+        result["monthly_generation"] = (
+            (result["module_power"] * orientation_factor[chunk])[:, None]
+            * irradiacao_mensal
+            * 30
+            * PERFORMANCE_RATIO
+            * 1e-3
+        )
+        result["annual_generation"] = (
+            np.sum(result["monthly_generation"], axis=1)[:, None]
+            * degradation_curve
+        )
+
+        din = select_breakers(
+            inverter_i_ac_max[chunk], breakers, safety_factor
+        )
+        result["din"] = np.where(inverter_count[chunk] > 0, din, np.nan)
+        result["din_total"] = select_breakers(
+            np.sum(inverter_i_ac_max[chunk] * inverter_count[chunk], axis=1),
+            breakers,
+            safety_factor,
+        )
+
+    return results
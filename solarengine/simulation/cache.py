@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from ..catalog.schema import (
+    INVERTER_FIELDS,
+    MODULE_FIELDS,
+    PHYSICAL_PROPERTIES_FIELDS,
+)
+from ..modeler.plant import PowerPlant
+from ..utils import (
+    get_geracao_anual,
+    get_geracao_mensal,
+    get_irradiacao_mensal,
+)
+
+
+def get_curve_description(curve) -> list | None:
+    """
+    :param EfficiencyCurve | None curve: Efficiency curve of an inverter
+    :return: Points and table resolution of the curve, None for the default
+        flat curve
+    :rtype: list | None
+    """
+    if curve is None:
+        return None
+    return [
+        curve.load.tolist(),
+        curve.efficiency.tolist(),
+        None if curve.voltage is None else curve.voltage.tolist(),
+        curve.table.shape[1] - 1,
+    ]
+
+
+def get_fingerprint(description) -> str:
+    """
+    :param description: JSON serializable inputs of a result
+    :return: Hexadecimal SHA-256 digest of the inputs
+    :rtype: str
+    """
+    encoded = json.dumps(description, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_plant_fingerprint(plant: PowerPlant, **parameters) -> str:
+    """
+    Content hash of every input of the plant that affects a simulation:
+    module, inverters (with their efficiency curves), inverter and module
+    counts, inverter type and coordinates. Plants with equal inputs share
+    the fingerprint, even if they are different objects.
+
+    :param PowerPlant plant: PowerPlant class object
+    :param parameters: Other simulation inputs, e.g. orientacao="N"
+    :return: Hexadecimal SHA-256 digest
+    :rtype: str
+    """
+    module = plant.module
+    description = {
+        "module": [module.brand.name, module.brand.model]
+        + [getattr(module, field) for field in MODULE_FIELDS],
+        "inverters": [
+            [inv.brand.name, inv.brand.model]
+            + [getattr(inv, field) for field in INVERTER_FIELDS]
+            + [
+                getattr(inv.physical_properties, field)
+                for field in PHYSICAL_PROPERTIES_FIELDS
+            ]
+            + [get_curve_description(inv.efficiency_curve)]
+            for inv in plant.inverters
+        ],
+        "inverter_count": plant.inverter_count.tolist(),
+        "module_count": plant.module_count,
+        "inv_boolean": plant.inv_boolean,
+        "coordinates": plant.coordinates,
+        "parameters": parameters,
+    }
+    return get_fingerprint(description)
+
+
+def get_size(value) -> int:
+    """
+    :return: Approximate size of a cached value (bytes)
+    :rtype: int
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(get_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Least recently used cache of simulation results, bounded by the total
+    size of the values held in memory. If a directory is given, values are
+    also written there and read back after being evicted from memory or by
+    other processes. The files of the directory are bounded by
+    max_disk_bytes, removing the least recently used first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024**2,
+        directory: str | None = None,
+        max_disk_bytes: int = 1024**3,
+    ) -> None:
+        """
+        :param int max_bytes: Max. total size of the values in memory
+        :param str | None directory: Directory of the on-disk tier
+        :param int max_disk_bytes: Max. total size of the files of the
+            on-disk tier
+        """
+        self.max_bytes = int(max_bytes)
+        self.directory = directory
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.entries = OrderedDict()
+        self.size = 0
+
+        # Upper estimate of the size of the directory, None until scanned:
+        self.disk_size = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries or (
+            self.directory is not None and os.path.exists(self.get_path(key))
+        )
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    @property
+    def stats(self) -> dict:
+        """
+        :return: Hit and miss counters, entries and bytes in memory
+        :rtype: dict
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+    def get(self, key: str, default=None):
+        """
+        :param str key: Cache key, e.g. a plant fingerprint
+        :param default: Value returned on a miss
+        :return: Cached value
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+        if self.directory is not None:
+            path = self.get_path(key)
+            try:
+                with open(path, "rb") as file:
+                    value = pickle.load(file)
+                os.utime(path)  # recently used
+            except FileNotFoundError:
+                pass
+            else:
+                self.disk_hits += 1
+                return self.store(key, value)
+
+        self.misses += 1
+        return default
+
+    def put(self, key: str, value):
+        """
+        :param str key: Cache key, e.g. a plant fingerprint
+        :param value: Result to cache
+        :return: Value as cached, see "store"
+        """
+        if self.directory is not None:
+            self.write(key, value)
+        return self.store(key, value)
+
+    def write(self, key: str, value) -> None:
+        """
+        Writes the value to the on-disk tier. Each write goes through its own
+        temporary file, so concurrent writers (e.g. the workers of
+        "search_designs") never see partial files.
+        """
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            try:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+            size = file.tell()
+        os.replace(file.name, self.get_path(key))
+
+        if self.disk_size is None:
+            self.prune_disk()
+        else:
+            self.disk_size += size
+            if self.disk_size > self.max_disk_bytes:
+                self.prune_disk()
+
+    def prune_disk(self) -> None:
+        """
+        Removes the least recently used files of the on-disk tier until it
+        fits max_disk_bytes. Files written by other processes are counted
+        too.
+        """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # removed by another process
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        self.disk_size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if self.disk_size <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.disk_size -= size
+
+    def store(self, key: str, value):
+        """
+        Adds the value to the memory tier, evicting the least recently used
+        entries until it fits. Values larger than max_bytes are not kept in
+        memory. Arrays are stored as read-only copies, since they are shared
+        between callers, so the array of the caller is left untouched.
+
+        :return: Value as cached
+        """
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+
+        size = get_size(value)
+        if size > self.max_bytes:
+            return value
+
+        while self.size + size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+        self.entries[key] = (value, size)
+        self.size += size
+        return value
+
+    def get_or_compute(self, key: str, compute):
+        """
+        :param str key: Cache key, e.g. a plant fingerprint
+        :param compute: Function without arguments that computes the value
+        :return: Cached or computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self) -> None:
+        """
+        Empties the memory tier and resets the counters. The on-disk tier is
+        kept.
+        """
+        self.entries.clear()
+        self.size = 0
+        self.hits = self.disk_hits = self.misses = 0
+
+
+default_cache = ResultCache()
+
+
+def get_cached_geracao_mensal(
+    plant: PowerPlant,
+    orientacao: str = "N",
+    cache: ResultCache | None = None,
+) -> np.ndarray:
+    """
+    Cached "get_geracao_mensal" of the plant, for the given orientation.
+
+    :param PowerPlant plant: PowerPlant class object
+    :param str orientacao: Orientation of the modules, see
+        "get_irradiacao_mensal"
+    :param ResultCache | None cache: Cache used, defaults to default_cache
+    :return: Monthly generation in the first year (kWh)
+    :rtype: np.ndarray
+    """
+    if cache is None:
+        cache = default_cache
+
+    key = get_plant_fingerprint(
+        plant, result="geracao_mensal", orientacao=orientacao
+    )
+    return cache.get_or_compute(
+        key,
+        lambda: get_geracao_mensal(
+            plant.module.nominal_power,
+            plant.module_count,
+            get_irradiacao_mensal(orientacao),
+        ),
+    )
+
+
+def get_cached_geracao_anual(
+    plant: PowerPlant,
+    anos: int = 25,
+    taxa: float = 0.01,
+    orientacao: str = "N",
+    cache: ResultCache | None = None,
+) -> np.ndarray:
+    """
+    Cached "get_geracao_anual" of the plant, for the given orientation.
+
+    :param PowerPlant plant: PowerPlant class object
+    :param int anos: Number of years
+    :param float taxa: Yearly degradation rate
+    :param str orientacao: Orientation of the modules
+    :param ResultCache | None cache: Cache used, defaults to default_cache
+    :return: Generation of each year (kWh)
+    :rtype: np.ndarray
+    """
+    if cache is None:
+        cache = default_cache
+
+    key = get_plant_fingerprint(
+        plant,
+        result="geracao_anual",
+        anos=anos,
+        taxa=taxa,
+        orientacao=orientacao,
+    )
+    return cache.get_or_compute(
+        key,
+        lambda: get_geracao_anual(
+            get_cached_geracao_mensal(plant, orientacao, cache), anos, taxa
+        ),
+    )
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Yearly energy and financial projection of plants. Every input broadcasts
+against the others and results get a trailing axis of years, so a single
+call projects, e.g., N plants under S scenarios by passing arrays of shapes
+(N,) and (S, 1).
+"""
+
+import numpy as np
+
+
+def get_degradation_curve(years: int, degradation) -> np.ndarray:
+    """
+    :param int years: Number of years
+    :param degradation: Yearly degradation rate, scalar or array
+    :return: Fraction of the first year generation in each year, with
+        shape degradation.shape + (years,)
+    :rtype: np.ndarray
+    """
+    degradation = np.asarray(degradation, dtype=float)
+    return (1 - degradation[..., None]) ** np.arange(years)
+
+
+def get_escalation_curve(years: int, escalation) -> np.ndarray:
+    """
+    :param int years: Number of years
+    :param escalation: Yearly escalation rate, scalar or array
+    :return: Multiplier of the first year value in each year, with shape
+        escalation.shape + (years,)
+    :rtype: np.ndarray
+    """
+    escalation = np.asarray(escalation, dtype=float)
+    return (1 + escalation[..., None]) ** np.arange(years)
+
+
+def project_energy(first_year_energy, years: int, degradation) -> np.ndarray:
+    """
+    Closed-form equivalent of "get_geracao_anual" for any number of plants
+    and degradation rates.
+
+    :param first_year_energy: Generation in the first year (kWh)
+    :param int years: Number of years
+    :param degradation: Yearly degradation rate
+    :return: Generation of each year (kWh)
+    :rtype: np.ndarray
+    """
+    first_year_energy = np.asarray(first_year_energy, dtype=float)
+    return first_year_energy[..., None] * get_degradation_curve(
+        years, degradation
+    )
+
+
+def project_tariff(tariff, years: int, escalation) -> np.ndarray:
+    """
+    :param tariff: Energy tariff in the first year (currency/kWh)
+    :param int years: Number of years
+    :param escalation: Yearly tariff escalation rate
+    :return: Tariff of each year (currency/kWh)
+    :rtype: np.ndarray
+    """
+    tariff = np.asarray(tariff, dtype=float)
+    return tariff[..., None] * get_escalation_curve(years, escalation)
+
+
+def get_cash_flows(investment, savings, om_cost=0.0) -> np.ndarray:
+    """
+    :param investment: Initial investment (currency)
+    :param savings: Savings of each year (currency), (..., years)
+    :param om_cost: Operation and maintenance cost per year (currency)
+    :return: Cash flows with the investment in year 0, (..., years + 1)
+    :rtype: np.ndarray
+    """
+    savings = np.asarray(savings, dtype=float)
+    investment = np.asarray(investment, dtype=float)
+    om_cost = np.asarray(om_cost, dtype=float)
+
+    yearly = savings - om_cost[..., None]
+    shape = np.broadcast_shapes(investment.shape, yearly.shape[:-1])
+    cash_flows = np.empty(shape + (yearly.shape[-1] + 1,))
+    cash_flows[..., 0] = -investment
+    cash_flows[..., 1:] = yearly
+    return cash_flows
+
+
+def get_npv(cash_flows: np.ndarray, discount_rate) -> np.ndarray:
+    """
+    :param np.ndarray cash_flows: Cash flows from year 0, (..., years + 1)
+    :param discount_rate: Yearly discount rate
+    :return: Net present value (currency)
+    :rtype: np.ndarray
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    factors = (1 + discount_rate[..., None]) ** -np.arange(
+        cash_flows.shape[-1]
+    )
+    return np.sum(cash_flows * factors, axis=-1)
+
+
+def evaluate_cash_flows(
+    cash_flows: np.ndarray, factor: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates the NPV as a polynomial of the discount factor 1 / (1 + rate)
+    with Horner's method, which avoids a power per year.
+
+    :param np.ndarray cash_flows: Cash flows from year 0, with years in
+        the first axis, (years + 1, ...)
+    :param np.ndarray factor: Discount factor of each series
+    :return: NPV and its derivative with respect to the factor
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    value = np.zeros(np.shape(factor))
+    derivative = np.zeros(np.shape(factor))
+    for year in range(len(cash_flows) - 1, -1, -1):
+        derivative = derivative * factor + value
+        value = value * factor + cash_flows[year]
+    return value, derivative
+
+
+def get_irr(
+    cash_flows: np.ndarray,
+    bounds: tuple[float, float] = (-0.99, 10.0),
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+) -> np.ndarray:
+    """
+    Internal rate of return of all cash flow series at once. Uses Newton's
+    method on the discount factor, falling back to bisection whenever a
+    step leaves the bracket, so it always converges. Series whose NPV has
+    the same sign at both bounds have no rate in the interval and result
+    in NaN.
+
+    :param np.ndarray cash_flows: Cash flows from year 0, (..., years + 1)
+    :param tuple[float, float] bounds: Lowest and highest rate searched
+    :param float tolerance: Max. step of the discount factor at the end
+    :param int max_iterations: Max. number of iterations
+    :return: Internal rate of return
+    :rtype: np.ndarray
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    shape = cash_flows.shape[:-1]
+    # Contiguous years make each step of Horner's method a sequential read:
+    cash_flows = np.ascontiguousarray(np.moveaxis(cash_flows, -1, 0))
+
+    # The highest rate is the lowest discount factor:
+    low = np.full(shape, 1 / (1 + bounds[1]))
+    high = np.full(shape, 1 / (1 + bounds[0]))
+    low_value, _ = evaluate_cash_flows(cash_flows, low)
+    high_value, _ = evaluate_cash_flows(cash_flows, high)
+    valid = np.sign(low_value) * np.sign(high_value) <= 0
+    low_sign = np.sign(low_value)
+
+    factor = np.clip(np.ones(shape), low, high)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iterations):
+            value, derivative = evaluate_cash_flows(cash_flows, factor)
+            same_sign = np.sign(value) == low_sign
+            low = np.where(same_sign, factor, low)
+            high = np.where(same_sign, high, factor)
+
+            step = value / derivative
+            newton = factor - step
+            inside = (newton >= low) & (newton <= high)
+            new_factor = np.where(inside, newton, (low + high) / 2)
+
+            converged = np.abs(new_factor - factor) < tolerance
+            factor = new_factor
+            if np.all(converged | ~valid):
+                break
+
+    return np.where(valid, 1 / factor - 1, np.nan)
+
+
+def get_payback(cash_flows: np.ndarray) -> np.ndarray:
+    """
+    Years until the cumulative cash flow becomes non-negative, interpolated
+    linearly within the year. Series that never pay back result in NaN.
+
+    :param np.ndarray cash_flows: Cash flows from year 0, (..., years + 1)
+    :return: Payback period (years)
+    :rtype: np.ndarray
+    """
+    cumulative = np.cumsum(np.asarray(cash_flows, dtype=float), axis=-1)
+    paid = cumulative >= 0
+    year = np.argmax(paid, axis=-1)
+
+    after = np.take_along_axis(cumulative, year[..., None], -1)[..., 0]
+    previous = np.maximum(year - 1, 0)[..., None]
+    before = np.take_along_axis(cumulative, previous, -1)[..., 0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback = np.where(
+            year > 0, year - 1 + -before / (after - before), 0.0
+        )
+    return np.where(np.any(paid, axis=-1), payback, np.nan)
+
+
+class FinancialProjection:
+    """
+    Yearly energy, tariff, savings and cash flows of one or many plants and
+    scenarios, with NPV, IRR and payback. Inputs broadcast against each
+    other; yearly arrays have a trailing axis of years.
+    """
+
+    def __init__(
+        self,
+        first_year_energy,
+        investment,
+        tariff,
+        years: int = 25,
+        degradation=0.01,
+        escalation=0.0,
+        discount_rate=0.0,
+        om_cost=0.0,
+    ) -> None:
+        """
+        :param first_year_energy: Generation in the first year (kWh)
+        :param investment: Initial investment (currency)
+        :param tariff: Energy tariff in the first year (currency/kWh)
+        :param int years: Number of years
+        :param degradation: Yearly degradation rate
+        :param escalation: Yearly tariff escalation rate
+        :param discount_rate: Yearly discount rate of the NPV
+        :param om_cost: Operation and maintenance cost per year (currency)
+        """
+        self.years = years
+        self.discount_rate = np.asarray(discount_rate, dtype=float)
+
+        self.energy = project_energy(first_year_energy, years, degradation)
+        self.tariff = project_tariff(tariff, years, escalation)
+        self.savings = self.energy * self.tariff
+        self.cash_flows = get_cash_flows(investment, self.savings, om_cost)
+
+    @property
+    def npv(self) -> np.ndarray:
+        return get_npv(self.cash_flows, self.discount_rate)
+
+    @property
+    def irr(self) -> np.ndarray:
+        return get_irr(self.cash_flows)
+
+    @property
+    def payback(self) -> np.ndarray:
+        return get_payback(self.cash_flows)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Monte Carlo analysis of the annual generation of a plant. Samples are drawn
+in fixed-size blocks, each with its own random stream spawned from a single
+seed, and reduced to a histogram as they are generated. Results therefore
+do not depend on the number of processes, and memory use is bounded by the
+block size.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from ..modeler.plant import PowerPlant
+from ..utils import PERFORMANCE_RATIO
+from .cache import get_cached_geracao_mensal
+
+
+class UncertaintyModel:
+    """
+    Standard deviations of the inputs of the generation model. Every input
+    is sampled from a normal distribution.
+    """
+
+    def __init__(
+        self,
+        irradiance_std: float = 0.05,
+        temperature_std: float = 1.5,
+        performance_ratio_std: float = 0.03,
+        degradation: float = 0.01,
+        degradation_std: float = 0.0025,
+    ) -> None:
+        """
+        :param float irradiance_std: Interannual variability of the yearly
+            irradiation, relative to the mean
+        :param float temperature_std: Deviation of the yearly mean cell
+            temperature from the reference (C)
+        :param float performance_ratio_std: Absolute deviation of the
+            performance ratio
+        :param float degradation: Mean yearly degradation rate
+        :param float degradation_std: Deviation of the degradation rate
+        """
+        self.irradiance_std = irradiance_std
+        self.temperature_std = temperature_std
+        self.performance_ratio_std = performance_ratio_std
+        self.degradation = degradation
+        self.degradation_std = degradation_std
+
+    def sample_factors(
+        self,
+        plant: PowerPlant,
+        rng: np.random.Generator,
+        size: int,
+        year: int = 1,
+    ) -> np.ndarray:
+        """
+        :param PowerPlant plant: PowerPlant class object
+        :param np.random.Generator rng: Random number generator
+        :param int size: Number of samples
+        :param int year: Year of operation, starting at 1
+        :return: Generation of each sample relative to the reference
+        :rtype: np.ndarray
+        """
+        factors = rng.normal(1.0, self.irradiance_std, size)
+
+        factors *= (
+            rng.normal(PERFORMANCE_RATIO, self.performance_ratio_std, size)
+            / PERFORMANCE_RATIO
+        )
+
+        temperature = rng.normal(25.0, self.temperature_std, size)
+        factors *= (
+            plant.get_real_module_output_power(temperature, out=temperature)
+            / plant.get_ideal_module_output_power()
+        )
+
+        degradation = np.maximum(
+            rng.normal(self.degradation, self.degradation_std, size), 0.0
+        )
+        factors *= (1 - degradation) ** (year - 1)
+
+        return np.maximum(factors, 0.0)
+
+
+class StreamingHistogram:
+    """
+    Fixed-bin histogram that is updated with blocks of values and merged
+    with other histograms, for percentiles of streams that do not fit in
+    memory. Values outside [low, high) are counted in the first or last bin.
+    """
+
+    def __init__(self, low: float, high: float, bins: int = 20000) -> None:
+        """
+        :param float low: Lower edge of the first bin
+        :param float high: Upper edge of the last bin
+        :param int bins: Number of bins, sets the resolution of percentiles
+        """
+        self.low = float(low)
+        self.high = float(high)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __len__(self) -> int:
+        return int(np.sum(self.counts))
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.low, self.high, len(self.counts) + 1)
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self)
+
+    @property
+    def std(self) -> float:
+        return np.sqrt(max(self.total_squares / len(self) - self.mean**2, 0))
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        :param np.ndarray values: Block of samples
+        """
+        values = np.asarray(values, dtype=float)
+        width = (self.high - self.low) / len(self.counts)
+        index = np.clip(
+            ((values - self.low) / width).astype(np.int64),
+            0,
+            len(self.counts) - 1,
+        )
+        self.counts += np.bincount(index, minlength=len(self.counts))
+
+        self.total += np.sum(values)
+        self.total_squares += np.sum(values**2)
+        self.min = min(self.min, np.min(values, initial=np.inf))
+        self.max = max(self.max, np.max(values, initial=-np.inf))
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        """
+        :param StreamingHistogram other: Histogram with the same bins
+        :raises Exception: If the bins differ
+        """
+        if (self.low, self.high, len(self.counts)) != (
+            other.low,
+            other.high,
+            len(other.counts),
+        ):
+            raise Exception("Cannot merge histograms with different bins.")
+
+        self.counts += other.counts
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """
+        Interpolates linearly within the bin, so the error is at most one bin
+        width.
+
+        :param q: Percentile(s), from 0 to 100
+        :return: Value below which q % of the samples fall
+        """
+        cumulative = np.cumsum(self.counts)
+        target = np.asarray(q, dtype=float) / 100 * cumulative[-1]
+        index = np.minimum(
+            np.searchsorted(cumulative, target, side="left"),
+            len(self.counts) - 1,
+        )
+
+        below = np.where(index > 0, cumulative[index - 1], 0)
+        fraction = (target - below) / np.maximum(self.counts[index], 1)
+        width = (self.high - self.low) / len(self.counts)
+        value = self.low + (index + np.clip(fraction, 0, 1)) * width
+        return np.clip(value, self.min, self.max)
+
+    def exceedance(self, p):
+        """
+        :param p: Probability of exceedance (%), e.g. 90 for P90
+        :return: Value exceeded by p % of the samples
+        """
+        return self.percentile(100 - np.asarray(p, dtype=float))
+
+
+def simulate_block(
+    plant: PowerPlant,
+    reference: float,
+    uncertainty: UncertaintyModel,
+    seed: np.random.SeedSequence,
+    size: int,
+    year: int,
+    bins: int,
+) -> StreamingHistogram:
+    """
+    Worker task: samples one block and reduces it to a histogram of the
+    annual generation, from 0 to twice the reference (kWh).
+    """
+    rng = np.random.default_rng(seed)
+    histogram = StreamingHistogram(0.0, 2 * reference, bins)
+    histogram.update(
+        reference * uncertainty.sample_factors(plant, rng, size, year)
+    )
+    return histogram
+
+
+def simulate_generation_distribution(
+    plant: PowerPlant,
+    samples: int = 10**6,
+    year: int = 1,
+    orientacao: str = "N",
+    uncertainty: UncertaintyModel | None = None,
+    seed: int = 0,
+    block_size: int = 2**16,
+    processes: int | None = 1,
+    bins: int = 20000,
+) -> StreamingHistogram:
+    """
+    Distribution of the annual generation of the plant, built from
+    "get_geracao_mensal" and the temperature derating of
+    "get_real_module_output_power". P50 and P90 are given by
+    "exceedance(50)" and "exceedance(90)" of the result.
+
+    :param PowerPlant plant: PowerPlant class object
+    :param int samples: Number of samples
+    :param int year: Year of operation, starting at 1
+    :param str orientacao: Orientation of the modules
+    :param UncertaintyModel | None uncertainty: Defaults to UncertaintyModel()
+    :param int seed: Seed of the random streams
+    :param int block_size: Samples per block, bounds memory use
+    :param int | None processes: Worker processes; 1 runs in this process
+        and None uses every CPU
+    :param int bins: Number of histogram bins
+    :return: Histogram of the annual generation (kWh)
+    :rtype: StreamingHistogram
+    """
+    if uncertainty is None:
+        uncertainty = UncertaintyModel()
+
+    reference = float(np.sum(get_cached_geracao_mensal(plant, orientacao)))
+
+    sizes = [block_size] * (samples // block_size)
+    if samples % block_size:
+        sizes.append(samples % block_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    arguments = [
+        (plant, reference, uncertainty, block_seed, size, year, bins)
+        for block_seed, size in zip(seeds, sizes)
+    ]
+
+    histogram = StreamingHistogram(0.0, 2 * reference, bins)
+    if processes == 1:
+        for argument in arguments:
+            histogram.merge(simulate_block(*argument))
+    else:
+        # Blocks are submitted as others complete, so at most max_pending
+        # histograms are held at once. They are merged in block order, so
+        # the float totals do not depend on the order of completion:
+        max_pending = 2 * (processes or os.cpu_count() or 1)
+        completed = {}
+        merged = 0
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending = {}
+            for index, argument in enumerate(arguments):
+                while len(pending) + len(completed) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        completed[pending.pop(future)] = future.result()
+                    while merged in completed:
+                        histogram.merge(completed.pop(merged))
+                        merged += 1
+                pending[executor.submit(simulate_block, *argument)] = index
+            for future, index in sorted(
+                pending.items(), key=lambda item: item[1]
+            ):
+                completed[index] = future.result()
+            for index in sorted(completed):
+                histogram.merge(completed[index])
+
+    return histogram
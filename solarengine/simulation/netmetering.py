@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Net metering (sistema de compensação de energia) of many customers at once.
+Hourly load and generation give the energy consumed from and injected into
+the grid each month. Injected energy compensates the consumption of the same
+month, and the surplus becomes credits that expire after CREDIT_LIFETIME
+months and are used oldest first. Customers always pay at least the min.
+availability of their connection.
+
+The FIFO ledger is kept as cumulative sums: since credits are used and
+expire in the order they were created, the cumulative deposits and the
+cumulative withdrawals (used or expired) of each customer describe every
+credit bucket. Each month is then a few operations on arrays with one
+element per customer.
+"""
+
+import numpy as np
+
+CREDIT_LIFETIME = 60  # months
+
+# Min. billed energy of each connection (kWh/month):
+MIN_AVAILABILITY = {"monofásico": 30, "bifásico": 50, "trifásico": 100}
+
+DAYS_PER_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def get_min_availability(classes: list) -> np.ndarray:
+    """
+    Example:
+    get_min_availability(["Residencial Monofásico", "Trifásico"]) returns
+    [30, 100].
+
+    :param list classes: Connection of each customer, as in
+        "get_carga_instalada", or the min. availability itself (kWh)
+    :return: Min. billed energy of each customer (kWh/month)
+    :rtype: np.ndarray
+    :raises Exception: If a class has no known connection
+    """
+    availability = []
+    for classe in classes:
+        if not isinstance(classe, str):
+            availability.append(float(classe))
+            continue
+        for connection, energy in MIN_AVAILABILITY.items():
+            if connection in classe.lower():
+                availability.append(energy)
+                break
+        else:
+            raise Exception(f'Ligação da classe "{classe}" não reconhecida.')
+    return np.array(availability, dtype=float)
+
+
+def get_month_starts(hours: int) -> np.ndarray:
+    """
+    :param int hours: Length of an hourly series starting on January 1st,
+        in years of 365 days
+    :return: Position of the first hour of each month in the series
+    :rtype: np.ndarray
+    """
+    years = -(-hours // 8760)
+    starts = np.concatenate(
+        [[0], np.cumsum(np.tile(DAYS_PER_MONTH * 24, years))[:-1]]
+    )
+    return starts[starts < hours]
+
+
+def get_monthly_energy(load: np.ndarray, generation: np.ndarray) -> dict:
+    """
+    :param np.ndarray load: Hourly consumption of each customer (kWh),
+        (customers, hours)
+    :param np.ndarray generation: Hourly generation of each customer (kWh),
+        with the shape of load
+    :return: Monthly consumption, generation, self-consumption, energy
+        injected into and imported from the grid (kWh), (customers, months)
+    :rtype: dict
+    """
+    load = np.atleast_2d(np.asarray(load, dtype=float))
+    generation = np.atleast_2d(np.asarray(generation, dtype=float))
+    starts = get_month_starts(load.shape[1])
+
+    self_consumption = np.minimum(load, generation)
+    monthly = {
+        "consumption": np.add.reduceat(load, starts, axis=1),
+        "generation": np.add.reduceat(generation, starts, axis=1),
+        "self_consumption": np.add.reduceat(self_consumption, starts, axis=1),
+    }
+    monthly["injected"] = monthly["generation"] - monthly["self_consumption"]
+    monthly["imported"] = monthly["consumption"] - monthly["self_consumption"]
+    return monthly
+
+
+class CreditLedger:
+    """
+    Monthly net metering results, with one row per customer and one column
+    per month. Energy in kWh.
+    """
+
+    def __init__(
+        self,
+        imported: np.ndarray,
+        injected: np.ndarray,
+        compensated: np.ndarray,
+        credits_created: np.ndarray,
+        credits_used: np.ndarray,
+        credits_expired: np.ndarray,
+        credit_balance: np.ndarray,
+        billed_energy: np.ndarray,
+        bill: np.ndarray,
+    ) -> None:
+        """
+        :param np.ndarray imported: Energy consumed from the grid
+        :param np.ndarray injected: Energy injected into the grid
+        :param np.ndarray compensated: Injected energy used in the same
+            month
+        :param np.ndarray credits_created: Injected energy turned into
+            credits
+        :param np.ndarray credits_used: Credits of previous months used
+        :param np.ndarray credits_expired: Credits that expired
+        :param np.ndarray credit_balance: Credits at the end of the month
+        :param np.ndarray billed_energy: Energy charged, at least the min.
+            availability
+        :param np.ndarray bill: Energy charge, in the unit of the tariff
+        """
+        self.imported = imported
+        self.injected = injected
+        self.compensated = compensated
+        self.credits_created = credits_created
+        self.credits_used = credits_used
+        self.credits_expired = credits_expired
+        self.credit_balance = credit_balance
+        self.billed_energy = billed_energy
+        self.bill = bill
+
+    def __len__(self) -> int:
+        return len(self.bill)
+
+
+def run_credit_ledger(
+    imported: np.ndarray,
+    injected: np.ndarray,
+    min_availability: np.ndarray,
+    tariff=1.0,
+    initial_credits=0.0,
+    lifetime: int = CREDIT_LIFETIME,
+) -> CreditLedger:
+    """
+    Monthly compensation of every customer. Only the consumption above the
+    min. availability is compensated, first with the energy injected in the
+    same month and then with credits, oldest first. Credits created in a
+    month can be used in the following "lifetime" months.
+
+    :param np.ndarray imported: Energy consumed from the grid (kWh),
+        (customers, months)
+    :param np.ndarray injected: Energy injected into the grid (kWh),
+        (customers, months)
+    :param np.ndarray min_availability: Min. billed energy of each customer
+        (kWh/month), see "get_min_availability"
+    :param tariff: Energy tariff, scalar, (customers,) or (customers,
+        months), e.g. R$/kWh
+    :param initial_credits: Credits of each customer before the first month
+        (kWh), expiring as if created in the month before it
+    :param int lifetime: Months after which credits expire
+    :return: Monthly ledger of every customer
+    :rtype: CreditLedger
+    """
+    imported = np.atleast_2d(np.asarray(imported, dtype=float))
+    injected = np.atleast_2d(np.asarray(injected, dtype=float))
+    customers, months = imported.shape
+    min_availability = np.broadcast_to(
+        np.asarray(min_availability, dtype=float), (customers,)
+    )
+
+    compensable = np.maximum(imported - min_availability[:, None], 0)
+    compensated = np.minimum(injected, compensable)
+    credits_created = injected - compensated
+    remaining = compensable - compensated
+
+    # Cumulative credits created before each month, counting the initial
+    # credits as created in month -1. The ledger arrays are month-major, so
+    # each month is a contiguous row.
+    deposits = np.zeros((months + 2, customers))
+    deposits[1] = initial_credits
+    np.cumsum(credits_created.T, axis=0, out=deposits[2:])
+    deposits[2:] += deposits[1]
+    remaining = np.ascontiguousarray(remaining.T)
+
+    withdrawn = np.zeros(customers)  # used or expired
+    credits_used = np.zeros((months, customers))
+    credits_expired = np.zeros((months, customers))
+    credit_balance = np.empty((months, customers))
+
+    for month in range(months):
+        # Credits created up to month - lifetime - 1 expire:
+        first_valid = month - lifetime + 1
+        if first_valid > 0:
+            np.subtract(
+                deposits[first_valid], withdrawn, out=credits_expired[month]
+            )
+            np.maximum(credits_expired[month], 0, out=credits_expired[month])
+            withdrawn += credits_expired[month]
+
+        np.subtract(deposits[month + 1], withdrawn, out=credits_used[month])
+        np.minimum(
+            remaining[month], credits_used[month], out=credits_used[month]
+        )
+        withdrawn += credits_used[month]
+        np.subtract(deposits[month + 2], withdrawn, out=credit_balance[month])
+
+    credits_used = credits_used.T
+    credits_expired = credits_expired.T
+    credit_balance = credit_balance.T
+
+    tariff = np.asarray(tariff, dtype=float)
+    if tariff.ndim == 1:
+        tariff = tariff[:, None]
+    billed_energy = np.maximum(
+        imported - compensated - credits_used, min_availability[:, None]
+    )
+    return CreditLedger(
+        imported=imported,
+        injected=injected,
+        compensated=compensated,
+        credits_created=credits_created,
+        credits_used=credits_used,
+        credits_expired=credits_expired,
+        credit_balance=credit_balance,
+        billed_energy=billed_energy,
+        bill=billed_energy * tariff,
+    )
+
+
+def simulate_net_metering(
+    load: np.ndarray,
+    generation: np.ndarray,
+    classes: list,
+    tariff=1.0,
+    initial_credits=0.0,
+    lifetime: int = CREDIT_LIFETIME,
+) -> CreditLedger:
+    """
+    Hourly load versus generation of every customer, followed by the
+    monthly credit ledger.
+
+    Example, with the hourly AC output of each plant:
+    ledger = simulate_net_metering(
+        load,
+        [output.ac_power * 1e-3 for output in outputs],
+        [plant.info.class_type for plant in plants],
+        tariff=0.9,
+    )
+    yearly_bill = ledger.bill.reshape(len(ledger), -1, 12).sum(axis=2)
+
+    :param np.ndarray load: Hourly consumption (kWh), (customers, hours),
+        starting on January 1st
+    :param np.ndarray generation: Hourly generation (kWh), (customers,
+        hours)
+    :param list classes: Connection of each customer, see
+        "get_min_availability"
+    :param tariff: Energy tariff, scalar, (customers,) or (customers,
+        months)
+    :param initial_credits: Credits of each customer before the first month
+        (kWh)
+    :param int lifetime: Months after which credits expire
+    :return: Monthly ledger of every customer
+    :rtype: CreditLedger
+    """
+    monthly = get_monthly_energy(load, generation)
+    return run_credit_ledger(
+        monthly["imported"],
+        monthly["injected"],
+        get_min_availability(classes),
+        tariff=tariff,
+        initial_credits=initial_credits,
+        lifetime=lifetime,
+    )
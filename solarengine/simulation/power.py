@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+from typing import Iterator
+
+import numpy as np
+
+from ..modeler.diode import DiodeParameters, get_diode_parameters
+from ..modeler.plant import PowerPlant
+from ..modeler.temperature import (
+    get_cell_temperature,
+    get_temperature_derating,
+)
+from ..weather.readers import WeatherChunk
+
+
+class PowerOutput:
+    """
+    Power time series of a power plant, one value per simulation timestep.
+    """
+
+    def __init__(
+        self,
+        dc_power: np.ndarray,
+        ac_power: np.ndarray,
+        timestep: float,
+        clipped_power: np.ndarray | None = None,
+    ) -> None:
+        """
+        :param np.ndarray dc_power: DC power delivered to the inverters (W)
+        :param np.ndarray ac_power: AC power delivered to the grid (W)
+        :param float timestep: Duration of each timestep (h)
+        :param np.ndarray | None clipped_power: DC power not harvested
+            because the inverters were at their AC limit (W)
+        """
+        self.dc_power = dc_power
+        self.ac_power = ac_power
+        self.timestep = float(timestep)
+        self.clipped_power = clipped_power
+
+    @property
+    def dc_energy(self) -> float:
+        """
+        :return: Total DC energy (kWh)
+        :rtype: float
+        """
+        return float(np.sum(self.dc_power)) * self.timestep * 1e-3
+
+    @property
+    def ac_energy(self) -> float:
+        """
+        :return: Total AC energy (kWh)
+        :rtype: float
+        """
+        return float(np.sum(self.ac_power)) * self.timestep * 1e-3
+
+    @property
+    def clipping_loss(self) -> float:
+        """
+        :return: DC energy lost to inverter clipping (kWh)
+        :rtype: float
+        """
+        if self.clipped_power is None:
+            return 0.0
+        return float(np.sum(self.clipped_power)) * self.timestep * 1e-3
+
+
+def get_string_groups(plant: PowerPlant) -> tuple[np.ndarray, ...]:
+    """
+    Collapses the plant strings into groups of identical strings, so the
+    simulation cost depends on the number of distinct strings only.
+
+    :return: Inverter index, modules per string and number of strings of
+        each group
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    layout = plant.string_layout
+    pairs = np.stack([layout.inverter_index, layout.module_count], axis=1)
+    groups, multiplicity = np.unique(pairs, axis=0, return_counts=True)
+    return groups[:, 0], groups[:, 1], multiplicity
+
+
+def get_mpp_fraction(
+    parameters: DiodeParameters,
+    mpp_power: np.ndarray,
+    voltage: np.ndarray,
+    off_mpp: np.ndarray,
+) -> np.ndarray:
+    """
+    :param DiodeParameters parameters: Module parameters of each timestep
+    :param np.ndarray mpp_power: Module power at the MPP of each timestep
+        (W)
+    :param np.ndarray voltage: Module operating voltage (V), (groups,
+        timesteps)
+    :param np.ndarray off_mpp: True where the operating voltage is not the
+        MPP voltage, with the shape of voltage
+    :return: Power at the operating voltage, as a fraction of the MPP
+        power, 1 at the MPP and 0 above the open circuit voltage
+    :rtype: np.ndarray
+    """
+    shape = np.shape(voltage)
+    fraction = np.ones(shape)
+    photocurrent, saturation_current, modified_ideality, power, v_oc = (
+        np.broadcast_to(value, shape[-1:])
+        for value in (
+            parameters.photocurrent,
+            parameters.saturation_current,
+            parameters.modified_ideality,
+            mpp_power,
+            parameters.v_oc,
+        )
+    )
+
+    # The I-V curve is only solved where needed:
+    rows, columns = np.nonzero(off_mpp)
+    below_v_oc = (voltage[rows, columns] < v_oc[columns]) & (
+        power[columns] > 0
+    )
+    fraction[rows, columns] = 0.0
+    rows, columns = rows[below_v_oc], columns[below_v_oc]
+    current = DiodeParameters(
+        photocurrent[columns],
+        saturation_current[columns],
+        modified_ideality[columns],
+        parameters.series_resistance,
+    ).get_current(voltage[rows, columns])
+    fraction[rows, columns] = (
+        voltage[rows, columns] * np.maximum(current, 0) / power[columns]
+    )
+    return fraction
+
+
+def simulate_power(
+    plant: PowerPlant,
+    irradiance: np.ndarray,
+    ambient_temperature: np.ndarray,
+    timestep: float = 1.0,
+    noct: float = 45.0,
+    wind_speed: np.ndarray | None = None,
+    temperature_model: str = "noct",
+    **temperature_parameters,
+) -> PowerOutput:
+    """
+    Simulates the DC and AC power of the plant for every timestep of the
+    irradiance and temperature series (typically 8760 hourly values).
+
+    Module power is derated by "ppt" according to the cell temperature, and
+    the module MPP voltage is given by the single-diode model (see
+    "modeler.diode"). Strings whose MPP voltage falls outside of the MPPT
+    range of their inverter operate at the nearest limit of the range, and
+    their power is reduced by the ratio between the power of the diode I-V
+    curve at that voltage and at the MPP. Strings whose MPP voltage is below
+    "v_dc_start" do not deliver power. Inverter models without units are
+    ignored. The AC output of each inverter follows its efficiency curve
+    (flat at "efficiency_max" by default) and is clipped at "p_ac_nom".
+
+    :param PowerPlant plant: PowerPlant class object
+    :param np.ndarray irradiance: Plane of array irradiance (W/m ** 2)
+    :param np.ndarray ambient_temperature: Ambient temperature (C)
+    :param float timestep: Duration of each timestep (h)
+    :param float noct: Nominal operating cell temperature of the NOCT
+        model (C)
+    :param np.ndarray | None wind_speed: Wind speed (m/s)
+    :param str temperature_model: Cell temperature model, see
+        "modeler.temperature.get_cell_temperature"
+    :param temperature_parameters: Coefficients of the other models
+    :return: DC and AC power series
+    :rtype: PowerOutput
+    """
+    irradiance = np.clip(np.asarray(irradiance, dtype=float), 0, None)
+    ambient_temperature = np.asarray(ambient_temperature, dtype=float)
+    module = plant.module
+
+    if temperature_model == "noct":
+        temperature_parameters["noct"] = noct
+    derating = get_cell_temperature(
+        irradiance,
+        ambient_temperature,
+        wind_speed,
+        temperature_model,
+        **temperature_parameters,
+    )
+    parameters = get_diode_parameters(module, irradiance, derating)
+    module_voltage, _, mpp_power = parameters.get_max_power_point()
+    get_temperature_derating(derating, module.ppt, out=derating)
+    module_power = np.multiply(
+        irradiance, module.nominal_power / 1000, out=irradiance
+    )
+    module_power *= derating
+
+    group_inverter, group_module_count, group_strings = get_string_groups(
+        plant
+    )
+    v_mppt_min = np.array([inv.v_mppt_min for inv in plant.inverters])
+    v_mppt_max = np.array(
+        [min(inv.v_mppt_max, inv.v_dc_max) for inv in plant.inverters]
+    )
+    v_dc_start = np.array([inv.v_dc_start or 0 for inv in plant.inverters])
+
+    string_voltage = group_module_count[:, None] * module_voltage
+    operating_voltage = np.clip(
+        string_voltage,
+        v_mppt_min[group_inverter, None],
+        v_mppt_max[group_inverter, None],
+    )
+    started = string_voltage >= v_dc_start[group_inverter, None]
+    mpp_fraction = get_mpp_fraction(
+        parameters,
+        mpp_power,
+        operating_voltage / group_module_count[:, None],
+        started & (operating_voltage != string_voltage),
+    )
+    group_power = (
+        (group_strings * group_module_count)[:, None]
+        * module_power
+        * mpp_fraction
+        * started
+    )
+
+    # Sums the groups of each inverter: (inverters, groups) @ (groups, time)
+    membership = (
+        np.arange(len(plant.inverters))[:, None] == group_inverter
+    ).astype(float)
+    dc_power = membership @ group_power
+
+    # Input voltage of each inverter model, at its mean string length:
+    strings = np.array([inv.string_count for inv in plant.inverters])
+    strings = strings * plant.inverter_count
+    string_length = np.divide(
+        plant.string_layout.modules_per_inverter,
+        strings,
+        out=np.zeros(len(strings)),
+        where=strings > 0,
+    )
+    ac_power = np.zeros_like(dc_power)
+    clipped_power = np.zeros_like(dc_power)
+    for i, (inverter, count) in enumerate(
+        zip(plant.inverters, plant.inverter_count)
+    ):
+        if count == 0:
+            continue
+        unit_power = dc_power[i] / count
+        voltage = np.clip(
+            string_length[i] * module_voltage, v_mppt_min[i], v_mppt_max[i]
+        )
+        inverter.get_ac_power(unit_power, voltage, out=ac_power[i])
+        clipped_power[i] = inverter.get_clipped_power(unit_power, voltage)
+    ac_power *= plant.inverter_count[:, None]
+    clipped_power *= plant.inverter_count[:, None]
+
+    return PowerOutput(
+        dc_power=dc_power.sum(axis=0),
+        ac_power=ac_power.sum(axis=0),
+        timestep=timestep,
+        clipped_power=clipped_power.sum(axis=0),
+    )
+
+
+def simulate_power_stream(
+    plant: PowerPlant,
+    chunks: Iterator[WeatherChunk],
+    timestep: float = 1.0,
+    noct: float = 45.0,
+    temperature_model: str = "noct",
+    **temperature_parameters,
+) -> Iterator[PowerOutput]:
+    """
+    Runs "simulate_power" over a stream of weather chunks (see
+    weather.readers), so series of any length are simulated in bounded
+    memory. The wind speed of the chunks is used by the cell temperature
+    models that depend on it.
+
+    Example:
+    energy = sum(
+        output.ac_energy
+        for output in simulate_power_stream(plant, read_epw(path))
+    )
+
+    :param PowerPlant plant: PowerPlant class object
+    :param chunks: Weather chunks
+    :param float timestep: Duration of each timestep (h)
+    :param float noct: Nominal operating cell temperature of the NOCT
+        model (C)
+    :param str temperature_model: Cell temperature model, see
+        "modeler.temperature.get_cell_temperature"
+    :param temperature_parameters: Coefficients of the other models
+    :return: Generator with the power output of each chunk
+    """
+    for chunk in chunks:
+        yield simulate_power(
+            plant,
+            chunk.irradiance,
+            chunk.ambient_temperature,
+            timestep=timestep,
+            noct=noct,
+            wind_speed=chunk.wind_speed,
+            temperature_model=temperature_model,
+            **temperature_parameters,
+        )
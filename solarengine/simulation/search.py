@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import itertools
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from ..modeler.inverter import Inverter
+from ..modeler.module import Module
+from ..modeler.plant import PowerPlant
+from ..utils import get_geracao_mensal, get_irradiacao_mensal
+from .power import simulate_power
+
+# Inputs shared by every task of a worker process, set once by "init_worker"
+# so the catalog is not pickled with each chunk:
+WORKER_ARGUMENTS = ()
+
+
+class Candidate:
+    """
+    Feasible plant design found by the design-space search.
+    """
+
+    def __init__(
+        self,
+        inverters: list[int],
+        inverter_count: list[int],
+        module_count: int,
+        annual_generation: float,
+        cost: float,
+    ) -> None:
+        """
+        :param list[int] inverters: Indexes of the inverters in the catalog
+        :param list[int] inverter_count: Number of each inverter
+        :param int module_count: Number of modules in the plant
+        :param float annual_generation: First year generation (kWh)
+        :param float cost: Equipment cost, in the unit of the given prices
+        """
+        self.inverters = inverters
+        self.inverter_count = inverter_count
+        self.module_count = module_count
+        self.annual_generation = annual_generation
+        self.cost = cost
+
+    def to_power_plant(
+        self, module: Module, catalog: list[Inverter], **kwargs
+    ) -> PowerPlant:
+        """
+        :param Module module: Module used in the search
+        :param list[Inverter] catalog: Inverter catalog used in the search
+        :param kwargs: Remaining PowerPlant parameters
+        :return: PowerPlant of the candidate
+        :rtype: PowerPlant
+        """
+        kwargs.setdefault("din_padrao", 0)
+        kwargs.setdefault("din_geral", 0)
+        kwargs.setdefault("coordinates", None)
+        kwargs.setdefault("inv_boolean", 0)
+        return PowerPlant(
+            module=module,
+            inverters=[catalog[i] for i in self.inverters],
+            inverter_count=self.inverter_count,
+            module_count=self.module_count,
+            **kwargs,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Candidate(inverters={self.inverters}, "
+            f"inverter_count={self.inverter_count}, "
+            f"module_count={self.module_count})"
+        )
+
+
+def is_string_feasible(pv_string) -> bool:
+    """
+    :param PVString pv_string: PVString class object
+    :return: True if the string respects the "v_dc_max" and MPPT range
+        limits of its inverter, and the "string_count" strings of the
+        inverter in parallel respect its "i_dc_max", at STC
+    :rtype: bool
+    """
+    inverter = pv_string.inverter
+    return (
+        pv_string.v_oc <= inverter.v_dc_max
+        and inverter.v_mppt_min <= pv_string.v_max <= inverter.v_mppt_max
+        and pv_string.i_sc * inverter.string_count <= inverter.i_dc_max
+    )
+
+
+def get_string_length_range(
+    module: Module, inverter: Inverter
+) -> tuple[int, int]:
+    """
+    :return: Min. and max. number of modules per string accepted by the
+        inverter at STC. Min. is larger than max. if no length fits.
+    :rtype: tuple[int, int]
+    """
+    if module.i_sc * inverter.string_count > inverter.i_dc_max:
+        return 1, 0
+    v_max = min(
+        inverter.v_dc_max / module.v_oc, inverter.v_mppt_max / module.v_max
+    )
+    return math.ceil(inverter.v_mppt_min / module.v_max), math.floor(v_max)
+
+
+def get_branches(
+    module: Module,
+    catalog: list[Inverter],
+    module_counts: np.ndarray,
+    max_models: int,
+    max_inverter_count: int,
+    dc_ac_ratio: tuple[float, float],
+):
+    """
+    Enumerates (inverter models, inverter counts) pairs, pruning branches
+    that no module count can make feasible before any plant is built:
+    inverters that accept no string length, and inverter mixes whose DC/AC
+    ratio range does not intersect the module count range.
+    """
+    usable = []
+    for i, inverter in enumerate(catalog):
+        lower, upper = get_string_length_range(module, inverter)
+        if lower <= upper:
+            usable.append(i)
+
+    min_dc = module_counts[0] * module.nominal_power
+    max_dc = module_counts[-1] * module.nominal_power
+
+    for model_count in range(1, max_models + 1):
+        for models in itertools.combinations(usable, model_count):
+            for counts in itertools.product(
+                range(1, max_inverter_count + 1), repeat=model_count
+            ):
+                ac_power = sum(
+                    catalog[i].p_ac_nom * count
+                    for i, count in zip(models, counts)
+                )
+                if (
+                    max_dc < dc_ac_ratio[0] * ac_power
+                    or min_dc > dc_ac_ratio[1] * ac_power
+                ):
+                    continue
+                yield list(models), list(counts)
+
+
+def get_chunks(iterable, chunk_size: int):
+    """
+    Splits an iterable in lists of chunk_size items, lazily.
+    """
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+def evaluate_branches(
+    module: Module,
+    catalog: list[Inverter],
+    branches: list[tuple[list[int], list[int]]],
+    module_counts: np.ndarray,
+    dc_ac_ratio: tuple[float, float],
+    module_price: float,
+    inverter_prices: list[float],
+    weather: tuple[np.ndarray, np.ndarray] | None,
+) -> list[Candidate]:
+    """
+    Worker task: builds the plants of a chunk of branches for every module
+    count and keeps the ones whose strings are feasible.
+    """
+    irradiacao_mensal = get_irradiacao_mensal()
+    candidates = []
+
+    for models, counts in branches:
+        inverters = [catalog[i] for i in models]
+        ac_power = sum(inv.p_ac_nom * c for inv, c in zip(inverters, counts))
+        inverter_cost = sum(
+            inverter_prices[i] * c for i, c in zip(models, counts)
+        )
+
+        plant = None
+        for module_count in module_counts:
+            dc_power = module_count * module.nominal_power
+            if not (
+                dc_ac_ratio[0] * ac_power
+                <= dc_power
+                <= dc_ac_ratio[1] * ac_power
+            ):
+                continue
+
+            if plant is None:
+                plant = PowerPlant(
+                    module=module,
+                    inverters=inverters,
+                    inverter_count=counts,
+                    module_count=module_count,
+                    din_padrao=0,
+                    din_geral=0,
+                    coordinates=None,
+                    inv_boolean=0,
+                )
+            else:
+                plant.module_count = module_count
+
+            if not all(is_string_feasible(s) for s in plant.pv_strings):
+                continue
+
+            if weather is None:
+                annual_generation = float(
+                    np.sum(
+                        get_geracao_mensal(
+                            module.nominal_power,
+                            module_count,
+                            irradiacao_mensal,
+                        )
+                    )
+                )
+            else:
+                annual_generation = simulate_power(plant, *weather).ac_energy
+
+            candidates.append(
+                Candidate(
+                    inverters=models,
+                    inverter_count=counts,
+                    module_count=int(module_count),
+                    annual_generation=annual_generation,
+                    cost=module_price * module_count + inverter_cost,
+                )
+            )
+
+    return candidates
+
+
+def init_worker(*arguments) -> None:
+    """
+    Initializer of the worker processes.
+
+    :param arguments: Arguments of "evaluate_branches", without the branches
+    """
+    global WORKER_ARGUMENTS
+    WORKER_ARGUMENTS = arguments
+
+
+def evaluate_chunk(branches: list) -> list[Candidate]:
+    """
+    Worker task: "evaluate_branches" with the inputs of "init_worker".
+    """
+    module, catalog, *arguments = WORKER_ARGUMENTS
+    return evaluate_branches(module, catalog, branches, *arguments)
+
+
+def search_designs(
+    module: Module,
+    catalog: list[Inverter],
+    target_power: float,
+    tolerance: float = 0.1,
+    max_models: int = 1,
+    max_inverter_count: int = 4,
+    dc_ac_ratio: tuple[float, float] = (0.8, 1.5),
+    rank_by: str = "yield",
+    module_price: float = 0.0,
+    inverter_prices: list[float] | None = None,
+    weather: tuple[np.ndarray, np.ndarray] | None = None,
+    processes: int | None = None,
+    chunk_size: int = 16,
+    top: int | None = None,
+) -> list[Candidate]:
+    """
+    Searches the combinations of inverters from the catalog, inverter counts
+    and module counts that reach target_power, and returns the feasible ones
+    ranked by yield (descending) or cost (ascending).
+
+    Branches are split in chunks of "chunk_size" and evaluated by a process
+    pool, with at most two chunks per worker in flight, so the branches are
+    enumerated as the workers consume them. The module, catalog and search
+    options are sent once to each worker. With processes=1 the search runs
+    in the calling process.
+
+    :param Module module: Module used in every candidate
+    :param list[Inverter] catalog: Inverters available
+    :param float target_power: Target DC power of the plant (W)
+    :param float tolerance: Accepted deviation from target_power, 0 to 1
+    :param int max_models: Max. number of different inverter models
+    :param int max_inverter_count: Max. number of units of each model
+    :param tuple[float, float] dc_ac_ratio: Accepted DC/AC power ratio range
+    :param str rank_by: Either "yield" or "cost"
+    :param float module_price: Price of one module
+    :param list[float] | None inverter_prices: Price of each inverter of the
+        catalog, defaults to 0
+    :param weather: Irradiance and ambient temperature series; if given,
+        yield comes from "simulate_power" instead of "get_geracao_mensal"
+    :param int | None processes: Worker processes, defaults to CPU count
+    :param int chunk_size: Branches per work item
+    :param int | None top: Number of candidates to return, defaults to all
+    :return: Ranked list of feasible candidates
+    :rtype: list[Candidate]
+    """
+    if rank_by not in ["yield", "cost"]:
+        raise Exception('"rank_by" must be either "yield" or "cost".')
+    if inverter_prices is None:
+        inverter_prices = [0.0] * len(catalog)
+
+    module_counts = np.arange(
+        math.ceil(target_power * (1 - tolerance) / module.nominal_power),
+        math.floor(target_power * (1 + tolerance) / module.nominal_power) + 1,
+    )
+    if len(module_counts) == 0:
+        return []
+
+    branches = get_branches(
+        module,
+        catalog,
+        module_counts,
+        max_models,
+        max_inverter_count,
+        dc_ac_ratio,
+    )
+    chunks = get_chunks(branches, chunk_size)
+    arguments = (
+        module_counts,
+        dc_ac_ratio,
+        module_price,
+        inverter_prices,
+        weather,
+    )
+
+    candidates = []
+    if processes == 1:
+        for chunk in chunks:
+            candidates += evaluate_branches(module, catalog, chunk, *arguments)
+    else:
+        max_pending = 2 * (processes or os.cpu_count() or 1)
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=init_worker,
+            initargs=(module, catalog, *arguments),
+        ) as executor:
+            pending = {}
+            for index, chunk in enumerate(chunks):
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+                pending[executor.submit(evaluate_chunk, chunk)] = index
+            for future, index in pending.items():
+                results[index] = future.result()
+
+        # In chunk order, so ties rank as in the serial search:
+        for index in sorted(results):
+            candidates += results[index]
+
+    if rank_by == "yield":
+        candidates.sort(key=lambda c: (-c.annual_generation, c.cost))
+    else:
+        candidates.sort(key=lambda c: (c.cost, -c.annual_generation))
+
+    return candidates[:top]
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+String sizing at the temperature extremes of a site. The string voltage is
+highest on a cold morning, when the cells are at the min. ambient
+temperature and the modules are in open circuit before the inverter starts,
+and the MPP voltage is lowest on a hot afternoon at full irradiance. Module
+voltages are derated linearly with temperature, like "simulate_power": the
+MPP voltage with the power coefficient "ppt" and the open circuit voltage
+with BETA_VOC, since datasheet records do not include it.
+"""
+
+import numpy as np
+
+from ..modeler.arrays import EquipmentArray
+from ..modeler.temperature import (
+    get_noct_cell_temperature,
+    get_temperature_derating,
+)
+
+T_MIN = 0.0  # C, record low ambient temperature
+T_MAX = 40.0  # C, record high ambient temperature
+HOT_IRRADIANCE = 1000.0  # W/m ** 2
+
+# Decrease in open circuit voltage per degree celsius (% / C), typical of
+# crystalline silicon modules (about 0.25 to 0.35):
+BETA_VOC = 0.28
+
+MODULE_SIZING_FIELDS = ["v_oc", "i_sc", "v_max", "ppt"]
+INVERTER_SIZING_FIELDS = [
+    "v_dc_max",
+    "v_mppt_min",
+    "v_mppt_max",
+    "v_dc_start",
+    "i_dc_max",
+]
+
+
+def get_columns(equipment, fields: list[str]) -> dict:
+    """
+    :param equipment: Equipment objects, an EquipmentArray or a structured
+        array (e.g. the records of a catalog)
+    :param list[str] fields: Fields to read
+    :return: Float array of each field, with None read as 0
+    :rtype: dict
+    """
+    if isinstance(equipment, EquipmentArray):
+        equipment = equipment.records
+    if isinstance(equipment, np.ndarray):
+        return {field: equipment[field].astype(float) for field in fields}
+    return {
+        field: np.array(
+            [getattr(item, field) or 0 for item in equipment], dtype=float
+        )
+        for field in fields
+    }
+
+
+class StringSizing:
+    """
+    Allowed number of modules per string of every module and inverter
+    pair. Rows are modules and columns are inverters.
+    """
+
+    def __init__(
+        self,
+        min_modules: np.ndarray,
+        max_modules: np.ndarray,
+        v_oc_cold: np.ndarray,
+        v_max_hot: np.ndarray,
+    ) -> None:
+        """
+        :param np.ndarray min_modules: Min. modules per string
+        :param np.ndarray max_modules: Max. modules per string, smaller than
+            min_modules if no length fits
+        :param np.ndarray v_oc_cold: Open circuit voltage of each module at
+            the min. temperature (V)
+        :param np.ndarray v_max_hot: Max. power voltage of each module at
+            the max. cell temperature (V)
+        """
+        self.min_modules = min_modules
+        self.max_modules = max_modules
+        self.v_oc_cold = v_oc_cold
+        self.v_max_hot = v_max_hot
+
+    @property
+    def compatible(self) -> np.ndarray:
+        """
+        :return: True where at least one string length fits
+        :rtype: np.ndarray
+        """
+        return self.min_modules <= self.max_modules
+
+    def accepts(
+        self, module_count: np.ndarray, module: int, inverter: int
+    ) -> np.ndarray:
+        """
+        :param np.ndarray module_count: Modules per string
+        :param int module: Index of the module
+        :param int inverter: Index of the inverter
+        :return: True where the string length is allowed
+        :rtype: np.ndarray
+        """
+        return (module_count >= self.min_modules[module, inverter]) & (
+            module_count <= self.max_modules[module, inverter]
+        )
+
+
+def size_strings(
+    modules,
+    inverters,
+    t_min: float = T_MIN,
+    t_max: float = T_MAX,
+    noct: float = 45.0,
+    beta_voc: float | np.ndarray = BETA_VOC,
+    chunk_size: int = 4096,
+) -> StringSizing:
+    """
+    Min. and max. modules per string of the cross product of modules and
+    inverters, as one array operation per chunk of modules:
+
+    - Max.: open circuit voltage at t_min below "v_dc_max", and max. power
+      voltage at t_min below "v_mppt_max".
+    - Min.: max. power voltage at the hot cell temperature above
+      "v_mppt_min", and open circuit voltage at the hot cell temperature
+      above "v_dc_start", so the inverter starts.
+    - Modules with "i_sc" above "i_dc_max" accept no length.
+
+    :param modules: Modules, a ModuleArray or MODULE_DTYPE records
+    :param inverters: Inverters, an InverterArray or INVERTER_DTYPE records
+    :param float t_min: Min. ambient temperature of the site (C)
+    :param float t_max: Max. ambient temperature of the site (C)
+    :param float noct: Nominal operating cell temperature (C)
+    :param float | np.ndarray beta_voc: Decrease in open circuit voltage
+        per degree celsius (% / C), one for all or one per module
+    :param int chunk_size: Modules processed at once, bounding the memory
+        of the intermediate arrays
+    :return: String length limits, with shape (modules, inverters)
+    :rtype: StringSizing
+    """
+    module = get_columns(modules, MODULE_SIZING_FIELDS)
+    inverter = get_columns(inverters, INVERTER_SIZING_FIELDS)
+
+    t_hot = get_noct_cell_temperature(HOT_IRRADIANCE, t_max, noct)
+    v_oc_cold = module["v_oc"] * get_temperature_derating(t_min, beta_voc)
+    v_oc_hot = module["v_oc"] * get_temperature_derating(t_hot, beta_voc)
+    v_max_cold = module["v_max"] * get_temperature_derating(
+        t_min, module["ppt"]
+    )
+    v_max_hot = module["v_max"] * get_temperature_derating(
+        t_hot, module["ppt"]
+    )
+
+    v_upper = np.stack([inverter["v_dc_max"], inverter["v_mppt_max"]])
+    v_lower = np.stack([inverter["v_mppt_min"], inverter["v_dc_start"]])
+
+    shape = (len(module["v_oc"]), len(inverter["v_dc_max"]))
+    min_modules = np.empty(shape, dtype=np.int32)
+    max_modules = np.empty(shape, dtype=np.int32)
+
+    # Tolerance for lengths that reach a limit exactly:
+    tolerance = 1e-9
+    for start in range(0, shape[0], chunk_size):
+        rows = slice(start, start + chunk_size)
+
+        upper = np.stack([v_oc_cold[rows], v_max_cold[rows]])[:, :, None]
+        max_modules[rows] = np.floor(
+            np.min(v_upper[:, None, :] / upper, axis=0) + tolerance
+        )
+        lower = np.stack([v_max_hot[rows], v_oc_hot[rows]])[:, :, None]
+        min_modules[rows] = np.maximum(
+            np.ceil(np.max(v_lower[:, None, :] / lower, axis=0) - tolerance),
+            1,
+        )
+
+        overcurrent = module["i_sc"][rows, None] > inverter["i_dc_max"]
+        max_modules[rows][overcurrent] = 0
+
+    return StringSizing(min_modules, max_modules, v_oc_cold, v_max_hot)
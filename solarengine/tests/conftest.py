@@ -33,7 +33,7 @@ def fronius_5k_inverter():
         v_dc_max=1000,
         voltage_range_mppt="240-800 V",
         p_dc_max_input=7500,
-        v_dc_start=420,
+        v_dc_start=80,
         i_dc_max=36,
         string_count=2,
         p_max=5000,
@@ -57,7 +57,7 @@ def fronius_8k_inverter():
         v_dc_max=1000,
         voltage_range_mppt="270-800 V",
         p_dc_max_input=12300,
-        v_dc_start=420,
+        v_dc_start=80,
         i_dc_max=36,
         string_count=2,
         p_max=8200,
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import pytest
+
+from ...benchmarks.bench_import import IMPORT_BUDGETS, check_import_budget
+
+
+@pytest.mark.parametrize("module", list(IMPORT_BUDGETS))
+def test_import_dependencies(module):
+    # Only the loaded modules: import times vary too much between machines.
+    assert check_import_budget(module, check_time=False) == []
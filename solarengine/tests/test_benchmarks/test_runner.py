@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+from ...benchmarks.cases import get_benchmarks, get_scaled_plant
+from ...benchmarks.runner import (
+    compare_results,
+    merge_results,
+    run_benchmarks,
+)
+
+
+def test_compare_results_uses_case_threshold():
+    baseline = {
+        "cases": {
+            "a": {"median": 1.0},
+            "b": {"median": 1.0, "threshold": 2.0},
+            "c": {"median": 1.0},
+        }
+    }
+    results = {"cases": {"a": {"median": 1.3}, "b": {"median": 1.9}}}
+
+    regressions = compare_results(results, baseline, threshold=1.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("a:")
+
+
+def test_merge_results_keeps_median_of_runs():
+    runs = [
+        {
+            "machine": {},
+            "cases": {"a": {"min": m, "median": m, "max": m, "loops": 1}},
+        }
+        for m in (1.0, 3.0, 1.2)
+    ]
+
+    merged = merge_results(runs)["cases"]["a"]
+
+    assert merged["median"] == 1.2
+    assert (merged["min"], merged["max"], merged["loops"]) == (1.0, 3.0, 3)
+
+
+def test_scaled_plants_use_every_module():
+    plant = get_scaled_plant("5MW")
+
+    assert plant.string_layout.module_count.sum() == plant.module_count
+    assert len(plant.get_din_list_plant()) == len(plant.inverters)
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(
+        get_benchmarks(["residential"]), repeat=1, min_time=0, verbose=False
+    )
+
+    assert len(results["cases"]) == 7
+    assert all(case["median"] > 0 for case in results["cases"].values())
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import json
+
+import numpy as np
+import pytest
+
+from ...catalog.catalog import EquipmentCatalog, load_catalog, write_catalog
+from ...catalog.schema import MODULE_DTYPE
+from ...modeler.efficiency import EfficiencyCurve
+
+
+def test_inverter_catalog_round_trip(
+    tmp_path, fronius_5k_inverter, fronius_8k_inverter
+):
+    write_catalog(tmp_path, [fronius_8k_inverter, fronius_5k_inverter])
+    catalog = load_catalog(tmp_path)
+
+    assert isinstance(catalog.records, np.memmap)
+    assert len(catalog) == 2
+
+    inverter = catalog.get("Fronius", "PRIMO 5.0-1")
+    assert inverter.p_ac_nom == fronius_5k_inverter.p_ac_nom
+    assert inverter.string_count == fronius_5k_inverter.string_count
+    assert inverter.v_mppt_min == 240
+    assert inverter.physical_properties.weight == 21.5
+
+    assert catalog.lookup("Fronius", "PRIMO 99") is None
+    with pytest.raises(KeyError):
+        catalog.get("SMA", "PRIMO 5.0-1")
+
+
+def test_inverter_catalog_keeps_efficiency_curve(
+    tmp_path, fronius_5k_inverter, fronius_8k_inverter
+):
+    curve = EfficiencyCurve(
+        [0.1, 0.3, 1.0],
+        [[0.93, 0.96, 0.95], [0.92, 0.95, 0.94]],
+        [300, 600],
+        resolution=512,
+    )
+    fronius_5k_inverter.efficiency_curve = curve
+    write_catalog(tmp_path, [fronius_5k_inverter, fronius_8k_inverter])
+    catalog = load_catalog(tmp_path)
+
+    stored = catalog.get("Fronius", "PRIMO 5.0-1").efficiency_curve
+    assert np.array_equal(stored.efficiency, curve.efficiency)
+    assert np.array_equal(stored.voltage, curve.voltage)
+    assert np.array_equal(stored.table, curve.table)
+    assert catalog.get("Fronius", "PRIMO 8.2-1").efficiency_curve is None
+
+
+def test_inverter_catalog_range_queries(
+    tmp_path, fronius_5k_inverter, fronius_8k_inverter
+):
+    write_catalog(tmp_path, [fronius_5k_inverter, fronius_8k_inverter])
+    catalog = load_catalog(tmp_path)
+
+    positions = catalog.range_query("p_ac_nom", 6000, None)
+    assert [catalog[i].brand.model for i in positions] == ["PRIMO 8.2-1"]
+
+    assert len(catalog.query(p_ac_nom=(None, 10000), string_count=(2, 2))) == 2
+    assert len(catalog.query(p_ac_nom=(1000, 6000), v_dc_max=(0, 900))) == 0
+
+    with pytest.raises(Exception):
+        catalog.range_query("freq", 50, 60)
+
+
+def test_large_module_catalog(tmp_path):
+    n = 20000
+    records = np.zeros(n, dtype=MODULE_DTYPE)
+    records["brand"] = "Brand"
+    records["model"] = [f"M-{i:05d}" for i in range(n)]
+    records["nominal_power"] = np.random.default_rng(0).uniform(300, 700, n)
+
+    write_catalog(tmp_path, records[::-1])
+    catalog = load_catalog(tmp_path)
+
+    module = catalog.get("Brand", "M-01234")
+    assert module.nominal_power == records["nominal_power"][1234]
+
+    positions = catalog.range_query("nominal_power", 500, 550)
+    values = catalog.records["nominal_power"][positions]
+    assert np.all((values >= 500) & (values <= 550))
+    assert len(positions) == np.sum(
+        (records["nominal_power"] >= 500) & (records["nominal_power"] <= 550)
+    )
+
+
+def test_repeated_entries_are_rejected(tmp_path, trina_410_module):
+    with pytest.raises(Exception):
+        write_catalog(tmp_path, [trina_410_module, trina_410_module])
+
+
+def test_names_longer_than_their_field(tmp_path, trina_410_module):
+    # 32 bytes, since "ã" takes 2 bytes in UTF-8:
+    trina_410_module.brand.name = "Cooperativa de Energia Solar Sã"
+    write_catalog(tmp_path, [trina_410_module])
+    catalog = load_catalog(tmp_path)
+    assert catalog[0].brand.name == trina_410_module.brand.name
+
+    # A truncation at 32 bytes would split the "í":
+    trina_410_module.brand.name = "Energia Renovável do Vale do Açaí"
+    with pytest.raises(Exception, match="bytes"):
+        write_catalog(tmp_path, [trina_410_module])
+
+
+def test_unknown_catalog_kind_is_rejected(tmp_path, trina_410_module):
+    write_catalog(tmp_path, [trina_410_module])
+    with open(tmp_path / "metadata.json") as file:
+        metadata = json.load(file)
+    metadata["kind"] = "battery"
+    with open(tmp_path / "metadata.json", "w") as file:
+        json.dump(metadata, file)
+
+    with pytest.raises(Exception, match="battery"):
+        load_catalog(tmp_path)
+    with pytest.raises(TypeError):
+        EquipmentCatalog(tmp_path, [])
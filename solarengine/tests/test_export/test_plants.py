@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...export.plants import (
+    read_fleet,
+    read_plants,
+    read_power_outputs,
+    write_plants,
+    write_power_outputs,
+)
+from ...export.tables import write_table
+from ...modeler.plant import PowerPlantInfo
+from ...simulation.power import simulate_power
+
+
+def test_plants_round_trip(
+    tmp_path,
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_different,
+):
+    first = power_plant_single_central_inverter
+    second = power_plant_two_central_inverters_different
+
+    write_plants(tmp_path, [first])
+    assert list(write_plants(tmp_path, [second], append=True)) == [1]
+
+    plants = read_plants(tmp_path)
+    assert len(plants) == 2
+    assert plants[1].module.brand.model == second.module.brand.model
+    assert [inv.brand.model for inv in plants[1].inverters] == [
+        inv.brand.model for inv in second.inverters
+    ]
+    assert np.array_equal(plants[1].inverter_count, second.inverter_count)
+    assert plants[1].coordinates == list(second.coordinates)
+
+    _, _, strings = read_fleet(tmp_path)
+    assert len(strings) == len(first.string_layout) + len(second.string_layout)
+    assert np.sum(strings["module_count"][strings["plant_index"] == 1]) == (
+        second.module_count
+    )
+
+
+def test_write_no_plants(tmp_path, power_plant_single_central_inverter):
+    assert len(write_plants(tmp_path / "fleet", [])) == 0
+
+    write_plants(tmp_path / "fleet", [power_plant_single_central_inverter])
+    assert list(write_plants(tmp_path / "fleet", [], append=True)) == []
+    assert len(read_plants(tmp_path / "fleet")) == 1
+
+
+def test_plant_info_and_missing_coordinates(
+    tmp_path, power_plant_single_central_inverter
+):
+    plant = power_plant_single_central_inverter
+    plant.info = PowerPlantInfo(
+        address="Rua São João, 10", class_type="Residencial Monofásico"
+    )
+    write_plants(tmp_path, [plant])
+
+    plant.info, plant.coordinates = None, None
+    write_plants(tmp_path, [plant], append=True)
+
+    first, second = read_plants(tmp_path)
+    assert first.info.address == "Rua São João, 10"
+    assert first.info.class_type == "Residencial Monofásico"
+    assert first.info.plant_id is None
+    assert first.coordinates == [-22.02, -42.02]
+    assert second.info is None and second.coordinates is None
+
+
+def test_append_drops_rows_of_interrupted_append(
+    tmp_path,
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_different,
+):
+    first = power_plant_single_central_inverter
+    second = power_plant_two_central_inverters_different
+    write_plants(tmp_path, [first])
+
+    # Inverters of a plant whose append stopped before the plants table:
+    _, inverters, _ = read_fleet(tmp_path)
+    orphans = inverters.to_dict()
+    orphans["plant_index"] = np.array([1])
+    write_table(tmp_path / "inverters", orphans, append=True)
+
+    write_plants(tmp_path, [second], append=True)
+
+    plants = read_plants(tmp_path)
+    assert [len(plant.inverters) for plant in plants] == [1, 2]
+    assert [inv.brand.model for inv in plants[1].inverters] == [
+        inv.brand.model for inv in second.inverters
+    ]
+
+
+def test_power_outputs_round_trip(
+    tmp_path, power_plant_single_central_inverter
+):
+    irradiance = np.linspace(0, 1000, 24)
+    output = simulate_power(
+        power_plant_single_central_inverter, irradiance, np.full(24, 25.0)
+    )
+
+    without_clipping = simulate_power(
+        power_plant_single_central_inverter, irradiance, np.full(24, 25.0)
+    )
+    without_clipping.clipped_power = None
+
+    write_power_outputs(tmp_path, [output, without_clipping], [0, 1])
+
+    first, second = read_power_outputs(tmp_path)
+    assert np.array_equal(second.ac_power, output.ac_power)
+    assert first.ac_energy == output.ac_energy
+    assert np.array_equal(first.clipped_power, output.clipped_power)
+    assert second.clipped_power is None
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import os
+
+import numpy as np
+import pytest
+
+from ...export import tables
+from ...export.tables import (
+    read_table,
+    truncate_table,
+    write_records,
+    write_table,
+)
+
+
+def test_single_part_reads_are_memory_mapped(tmp_path):
+    write_table(tmp_path, {"a": np.arange(5), "b": np.ones((5, 12))})
+
+    table = read_table(tmp_path)
+
+    assert len(table) == 5
+    assert isinstance(table["b"], np.memmap)
+    assert table["b"].shape == (5, 12)
+
+
+def test_append_and_compact(tmp_path):
+    write_table(tmp_path, {"a": np.arange(3)})
+    write_table(tmp_path, {"a": np.arange(3, 5)}, append=True)
+
+    table = read_table(tmp_path)
+    assert np.array_equal(table["a"], np.arange(5))
+
+    table.compact()
+    assert isinstance(table["a"], np.memmap)
+    assert np.array_equal(read_table(tmp_path)["a"], np.arange(5))
+
+    with pytest.raises(Exception):
+        write_table(tmp_path, {"a": np.arange(2.0)}, append=True)
+
+
+def test_truncate_table(tmp_path):
+    write_table(tmp_path, {"a": np.arange(3)})
+    write_table(tmp_path, {"a": np.arange(3, 5)}, append=True)
+
+    truncate_table(tmp_path, 2)
+    assert np.array_equal(read_table(tmp_path)["a"], [0, 1])
+    assert not (tmp_path / "part-00001").exists()
+
+    write_table(tmp_path, {"a": np.arange(7, 9)}, append=True)
+    assert np.array_equal(read_table(tmp_path)["a"], [0, 1, 7, 8])
+
+    truncate_table(tmp_path, 0)
+    assert len(read_table(tmp_path)["a"]) == 0
+
+
+def test_write_replaces_only_tables(tmp_path):
+    write_table(tmp_path / "table", {"a": np.arange(3)})
+    write_table(tmp_path / "table", {"b": np.arange(2.0)})
+
+    table = read_table(tmp_path / "table")
+    assert table.columns == ["b"] and len(table) == 2
+    assert sorted(os.listdir(tmp_path / "table")) == [
+        "metadata.json",
+        "part-00001",
+    ]
+
+    (tmp_path / "results").mkdir()
+    (tmp_path / "results" / "report.txt").write_text("keep")
+    with pytest.raises(Exception):
+        write_table(tmp_path / "results", {"a": np.arange(3)})
+    assert (tmp_path / "results" / "report.txt").exists()
+
+
+def test_interrupted_compact_leaves_table_unchanged(tmp_path, monkeypatch):
+    write_table(tmp_path, {"a": np.arange(3)})
+    write_table(tmp_path, {"a": np.arange(3, 5)}, append=True)
+
+    def interrupt(*_):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(tables, "write_metadata", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        read_table(tmp_path).compact()
+    monkeypatch.undo()
+
+    assert np.array_equal(read_table(tmp_path)["a"], np.arange(5))
+    read_table(tmp_path).compact()
+    assert np.array_equal(read_table(tmp_path)["a"], np.arange(5))
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_records_round_trip(tmp_path):
+    records = np.zeros(4, dtype=[("x", float), ("y", int, (3,))])
+    records["y"] = np.arange(12).reshape(4, 3)
+
+    write_records(tmp_path, records)
+
+    assert np.array_equal(read_table(tmp_path).to_records(), records)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...modeler.arrays import InverterArray, ModuleArray
+from ...modeler.efficiency import EfficiencyCurve
+from ...modeler.plant import PowerPlant
+from ...simulation.power import simulate_power
+
+
+def test_module_array_views(trina_410_module):
+    modules = ModuleArray.from_modules([trina_410_module, trina_410_module])
+    view = modules[1]
+
+    assert len(modules) == 2
+    assert view.nominal_power == trina_410_module.nominal_power
+    assert view.brand.model == "TSM-410"
+    assert str(view) == str(trina_410_module)
+
+    view.nominal_power = 500
+    assert np.array_equal(modules["nominal_power"], [410, 500])
+    assert modules[-1].nominal_power == 500
+
+    with pytest.raises(IndexError):
+        modules[2]
+
+
+def test_inverter_array_views(fronius_5k_inverter, fronius_8k_inverter):
+    inverters = InverterArray.from_inverters(
+        [fronius_5k_inverter, fronius_8k_inverter]
+    )
+
+    large = inverters[inverters["p_ac_nom"] > 6000]
+    assert len(large) == 1
+    assert large[0].brand.model == "PRIMO 8.2-1"
+    assert large[0].physical_properties.weight == 21.5
+    assert large[0].v_mppt_min == 270
+
+    restored = inverters.to_inverters()
+    assert restored[0].i_ac_max == fronius_5k_inverter.i_ac_max
+
+
+def test_inverter_view_voltage_range_mppt(fronius_5k_inverter):
+    view = InverterArray.from_inverters([fronius_5k_inverter])[0]
+
+    view.voltage_range_mppt = "200-600 V"
+    assert view.voltage_range_mppt == "200-600 V"
+    assert (view.v_mppt_min, view.v_mppt_max) == (200, 600)
+
+    with pytest.raises(Exception):
+        view.voltage_range_mppt = "600 V"
+    assert view.voltage_range_mppt == "200-600 V"
+
+
+def test_views_can_be_used_in_power_plant(
+    trina_410_module, fronius_5k_inverter
+):
+    module = ModuleArray.from_modules([trina_410_module])[0]
+    inverter = InverterArray.from_inverters([fronius_5k_inverter])[0]
+
+    plant = PowerPlant(
+        module=module,
+        inverters=[inverter],
+        inverter_count=[1],
+        module_count=12,
+        din_padrao=60,
+        din_geral=60,
+        coordinates=[-22.02, -42.02],
+        inv_boolean=0,
+    )
+
+    assert plant.get_active_power() == 12 * 410
+    assert sum(s.v_oc for s in plant.pv_strings) == 12 * 50
+
+
+def test_views_simulate_like_objects(
+    power_plant_single_central_inverter,
+):
+    plant = power_plant_single_central_inverter
+    plant.inverters[0].efficiency_curve = EfficiencyCurve(
+        [0.1, 0.5, 1.0], [[0.94, 0.97, 0.96], [0.93, 0.96, 0.95]], [300, 600]
+    )
+    view_plant = PowerPlant(
+        module=ModuleArray.from_modules([plant.module])[0],
+        inverters=list(InverterArray.from_inverters(plant.inverters)),
+        inverter_count=[1],
+        module_count=12,
+        din_padrao=60,
+        din_geral=60,
+        coordinates=[-22.02, -42.02],
+        inv_boolean=0,
+    )
+
+    irradiance = np.linspace(0, 1100, 48)
+    ambient = np.full(48, 25.0)
+    expected = simulate_power(plant, irradiance, ambient)
+    output = simulate_power(view_plant, irradiance, ambient)
+
+    assert np.array_equal(output.ac_power, expected.ac_power)
+    assert np.array_equal(output.clipped_power, expected.clipped_power)
+
+
+def test_inverter_view_efficiency_curve(fronius_5k_inverter):
+    inverter = InverterArray.from_inverters([fronius_5k_inverter])[0]
+    assert inverter.efficiency_curve is None
+
+    inverter.efficiency_curve = EfficiencyCurve([0.2, 1.0], [0.95, 0.97])
+    assert np.array_equal(inverter.efficiency_curve.load, [0.2, 1.0])
+    assert inverter.efficiency_curve.voltage is None
+
+    with pytest.raises(Exception):
+        inverter.efficiency_curve = EfficiencyCurve(
+            np.linspace(0.1, 1, 9), np.full(9, 0.96)
+        )
+
+
+def test_equipment_has_no_attribute_dict(trina_410_module):
+    assert not hasattr(trina_410_module, "__dict__")
+    assert not hasattr(trina_410_module.brand, "__dict__")
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...modeler.diode import get_diode_parameters, get_max_power_point
+from ...modeler.strings import PVString
+
+
+def test_diode_fit_matches_datasheet(trina_410_module):
+    module = trina_410_module
+    parameters = get_diode_parameters(module)
+
+    assert np.isclose(parameters.v_oc, module.v_oc)
+    assert np.allclose(
+        parameters.get_current(np.array([0, module.v_max, module.v_oc])),
+        [module.i_sc, module.i_max, 0],
+        atol=1e-6,
+    )
+
+    voltage, current = parameters.get_iv_curve(10001)
+    _, _, power = parameters.get_max_power_point()
+    assert np.isclose(power, np.max(voltage * current), rtol=1e-6)
+    assert np.isclose(power, module.v_max * module.i_max, rtol=0.01)
+
+    _, _, hot_power = get_max_power_point(module, 1000, 26)
+    assert np.isclose(hot_power / power - 1, -module.ppt / 100)
+
+
+def test_max_power_point_is_vectorized(trina_410_module, fronius_5k_inverter):
+    rng = np.random.default_rng(0)
+    irradiance = rng.uniform(0, 1100, (24, 1))
+    temperature = rng.uniform(10, 70, (24, 3))
+    module_count = np.array([10, 11, 12])
+
+    voltage, current, power = get_max_power_point(
+        trina_410_module, irradiance, temperature, module_count
+    )
+    assert power.shape == (24, 3)
+    assert np.all(power >= 0)
+    assert np.allclose(power, voltage * current)
+
+    string = PVString(trina_410_module, 11, fronius_5k_inverter)
+    _, _, string_power = string.get_max_power_point(
+        irradiance[5, 0], temperature[5, 1]
+    )
+    assert np.isclose(string_power, power[5, 1])
+    assert get_max_power_point(trina_410_module, 0, 25)[2] == 0
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...modeler.efficiency import CEC_WEIGHTS, EfficiencyCurve
+from ...simulation.power import simulate_power
+
+LOAD = [0.1, 0.2, 0.3, 0.5, 0.75, 1.0]
+EFFICIENCY = [
+    [0.930, 0.955, 0.965, 0.970, 0.970, 0.965],
+    [0.920, 0.950, 0.960, 0.968, 0.968, 0.962],
+]
+
+
+def test_efficiency_curve_table():
+    curve = EfficiencyCurve(LOAD, EFFICIENCY, voltage=[300, 600])
+
+    dc_input = curve.get_dc_input(LOAD)
+    assert np.allclose(
+        curve.get_ac_fraction(dc_input[0], 300.0), LOAD, rtol=1e-4
+    )
+    assert np.allclose(
+        curve.get_ac_fraction(dc_input[1], 600.0), LOAD, rtol=1e-4
+    )
+
+    # Between the voltages and above nominal power:
+    ac_fraction = curve.get_ac_fraction(dc_input[0, 3], 450.0)
+    assert LOAD[3] > ac_fraction > LOAD[3] * 0.99
+    assert curve.get_ac_fraction(5.0) == 1.0
+    assert curve.get_ac_fraction(0.0) == 0.0
+
+    assert curve.get_weighted_efficiency(CEC_WEIGHTS)[0] == pytest.approx(
+        np.dot(np.interp(CEC_WEIGHTS[0], LOAD, EFFICIENCY[0]), CEC_WEIGHTS[1]),
+        abs=1e-3,
+    )
+
+
+def test_ac_fraction_of_invalid_input():
+    curve = EfficiencyCurve(LOAD, EFFICIENCY, voltage=[300, 600])
+
+    with np.errstate(all="raise"):
+        ac_fraction = curve.get_ac_fraction(
+            np.array([-0.5, np.nan, 0.5]), 450.0
+        )
+
+    assert ac_fraction[0] == 0.0
+    assert np.isnan(ac_fraction[1])
+    assert 0.45 < ac_fraction[2] < 0.5
+
+
+def test_clipping_of_high_dc_ac_ratio(
+    power_plant_two_central_inverters_equal,
+):
+    plant = power_plant_two_central_inverters_equal
+    for inverter in plant.inverters:
+        inverter.p_ac_nom = inverter.p_max = 3000
+        inverter.efficiency_curve = EfficiencyCurve(LOAD, EFFICIENCY[0])
+
+    hours = np.arange(8760)
+    irradiance = np.clip(1000 * np.sin((hours % 24 - 6) / 12 * np.pi), 0, None)
+    output = simulate_power(plant, irradiance, np.full(8760, 15.0))
+
+    ac_limit = 3000 * 2
+    assert np.max(output.ac_power) == pytest.approx(ac_limit)
+    clipping = output.ac_power == pytest.approx(ac_limit)
+    assert np.all(output.clipped_power[~clipping] == 0)
+    assert np.all(output.clipped_power[clipping] > 0)
+
+    # Harvested DC power at the limit, from the inverse of the curve:
+    harvested = output.dc_power - output.clipped_power
+    assert np.allclose(
+        harvested[output.ac_power == np.max(output.ac_power)],
+        ac_limit / EFFICIENCY[0][-1],
+    )
+    assert 0 < output.clipping_loss < output.dc_energy - output.ac_energy
+
+    # The inverters do not start below "v_dc_start":
+    for inverter in plant.inverters:
+        inverter.v_dc_start = 1000
+    assert (
+        simulate_power(plant, irradiance, np.full(8760, 15.0)).ac_energy == 0
+    )
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...modeler.fleet import Fleet
+from ...modeler.plant import PowerPlantInfo
+from ...utils import (
+    get_geracao_anual,
+    get_geracao_mensal,
+    get_irradiacao_mensal,
+)
+
+
+def get_fleet(*plants):
+    companies = ["CEMIG", "LIGHT", "CEMIG"]
+    for plant, company in zip(plants, companies):
+        plant.info = PowerPlantInfo(power_company=company, subgroup="B1")
+    return Fleet(plants)
+
+
+def test_fleet_matches_plants(
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_equal,
+    power_plant_two_central_inverters_different,
+):
+    plants = [
+        power_plant_single_central_inverter,
+        power_plant_two_central_inverters_equal,
+        power_plant_two_central_inverters_different,
+    ]
+    fleet = get_fleet(*plants)
+
+    assert np.allclose(
+        fleet.get_active_power(), [p.get_active_power() for p in plants]
+    )
+    assert np.allclose(
+        fleet.get_total_module_area(),
+        [p.get_total_module_area() for p in plants],
+    )
+    assert list(fleet.get_inverter_count()) == [1, 2, 2]
+
+    expected = [
+        get_geracao_mensal(
+            p.module.nominal_power, p.module_count, get_irradiacao_mensal()
+        )
+        for p in plants
+    ]
+    assert np.allclose(fleet.get_geracao_mensal(), expected)
+    assert np.allclose(
+        fleet.get_geracao_anual(25, 0.01),
+        [get_geracao_anual(g, 25, 0.01) for g in expected],
+    )
+
+
+def test_fleet_group_by(
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_equal,
+    power_plant_two_central_inverters_different,
+):
+    fleet = get_fleet(
+        power_plant_single_central_inverter,
+        power_plant_two_central_inverters_equal,
+        power_plant_two_central_inverters_different,
+    )
+    power = fleet.get_active_power()
+
+    by_company = fleet.aggregate(power, by="power_company")
+    assert by_company.keys() == {"CEMIG", "LIGHT"}
+    assert np.isclose(by_company["CEMIG"], power[0] + power[2])
+
+    monthly = fleet.aggregate(fleet.get_geracao_mensal(), by="subgroup")
+    assert np.allclose(
+        monthly["B1"], fleet.aggregate(fleet.get_geracao_mensal())
+    )
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import copy
+
+import numpy as np
+
+from ...modeler.graph import PlantGraph
+from ...utils import (
+    get_geracao_anual,
+    get_geracao_mensal,
+    get_irradiacao_mensal,
+)
+
+
+def test_plant_graph_matches_plant(
+    power_plant_two_central_inverters_different,
+):
+    plant = power_plant_two_central_inverters_different
+    graph = PlantGraph(plant, orientacao="NE")
+    values = graph.update()
+
+    geracao_mensal = get_geracao_mensal(
+        plant.module.nominal_power,
+        plant.module_count,
+        get_irradiacao_mensal("NE"),
+    )
+    assert np.allclose(values["geracao_mensal"], geracao_mensal)
+    assert np.allclose(
+        values["geracao_anual"], get_geracao_anual(geracao_mensal, 25, 0.01)
+    )
+    assert values["ac_limits"]["active_power"] == plant.get_active_power()
+    assert np.array_equal(values["breakers"], plant.get_din_list_plant())
+    assert np.array_equal(
+        values["string_layout"].module_count,
+        plant.string_layout.module_count,
+    )
+    assert values["protection"].tobytes() == plant.get_protection().tobytes()
+    assert set(graph.timings) == set(graph.functions)
+
+
+def test_plant_graph_recomputes_affected_nodes(
+    power_plant_two_central_inverters_different,
+):
+    graph = PlantGraph(power_plant_two_central_inverters_different)
+    graph.update()
+
+    graph.set(orientacao="S")
+    graph.update()
+    assert graph.computed == [
+        "irradiacao_mensal",
+        "geracao_mensal",
+        "geracao_anual",
+    ]
+
+    graph.set(orientacao="S", anos=25)
+    assert graph.update()["geracao_anual"] is graph.values["geracao_anual"]
+    assert graph.computed == [
+        "irradiacao_mensal",
+        "geracao_mensal",
+        "geracao_anual",
+    ]
+
+    graph.set(module_count=34)
+    graph.update()
+    assert "string_layout" in graph.computed
+    assert "breakers" not in graph.computed
+
+
+def test_plant_graph_cuts_off_equal_layout(
+    power_plant_two_central_inverters_different, fronius_5k_inverter
+):
+    graph = PlantGraph(power_plant_two_central_inverters_different)
+    layout = graph.get("string_layout")
+
+    inverter = copy.copy(fronius_5k_inverter)
+    inverter.v_ac_nom = 380
+    graph.swap_inverter(1, inverter)
+    values = graph.update()
+
+    assert "string_layout" not in graph.computed
+    assert "protection" in graph.computed
+    assert values["string_layout"] is layout
+
+
+def test_plant_graph_compares_inputs_by_content(
+    power_plant_two_central_inverters_different, fronius_5k_inverter
+):
+    graph = PlantGraph(power_plant_two_central_inverters_different)
+    graph.update()
+    revision = graph.revision
+
+    graph.swap_inverter(1, copy.deepcopy(fronius_5k_inverter))
+    graph.set(module=copy.deepcopy(graph.values["module"]))
+    graph.update()
+
+    assert graph.revision == revision
+
+
+def test_plant_graph_breakers_of_single_circuit(
+    power_plant_two_central_inverters_different,
+):
+    plant = power_plant_two_central_inverters_different
+    plant.inv_boolean = 1
+    graph = PlantGraph(plant)
+
+    assert np.array_equal(graph.get("breakers"), plant.get_din_list_plant())
+    assert len(graph.get("breakers")) == 1
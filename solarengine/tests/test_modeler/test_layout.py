@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...modeler.layout import get_string_layout, split_evenly
+
+
+def test_split_evenly():
+    assert split_evenly([10, 25], [3, 2]).tolist() == [3, 3, 4, 12, 13]
+    assert split_evenly([5, 7], [0, 1]).tolist() == [7]
+
+
+def test_module_conservation():
+    rng = np.random.default_rng(42)
+
+    for _ in range(200):
+        models = rng.integers(1, 5)
+        p_ac_nom = rng.uniform(1000, 100000, models)
+        inverter_count = rng.integers(1, 20, models)
+        string_count = rng.integers(1, 30, models)
+        module_count = int(rng.integers(1, 50000))
+
+        layout = get_string_layout(
+            module_count, p_ac_nom, inverter_count, string_count
+        )
+
+        assert np.sum(layout.module_count) == module_count
+        assert len(layout) == np.sum(inverter_count * string_count)
+        assert np.sum(layout.modules_per_inverter) == module_count
+        for unit in range(np.sum(inverter_count)):
+            strings = layout.module_count[layout.unit_index == unit]
+            assert np.max(strings) - np.min(strings) <= 1
+
+
+def test_power_plant_covers_every_inverter_unit(
+    power_plant_two_central_inverters_equal,
+):
+    plant = power_plant_two_central_inverters_equal
+
+    assert len(plant.pv_strings) == plant.get_number_of_strings()
+    assert [s.module_count for s in plant.pv_strings] == [6, 6, 6, 7]
+    assert plant.distribute_panels_by_inverter().tolist() == [25]
+
+
+def test_utility_scale_layout():
+    layout = get_string_layout(
+        module_count=12345678,
+        p_ac_nom=[250000, 125000],
+        inverter_count=[400, 100],
+        string_count=[24, 12],
+    )
+
+    assert len(layout) == 400 * 24 + 100 * 12
+    assert np.sum(layout.module_count) == 12345678
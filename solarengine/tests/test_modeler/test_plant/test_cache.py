@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+
+def test_pv_strings_are_computed_once(power_plant_single_central_inverter):
+    plant = power_plant_single_central_inverter
+
+    assert plant.pv_strings is plant.pv_strings
+    assert plant.get_din_list_plant() is plant.get_din_list_plant()
+
+
+def test_cache_is_invalidated_when_inputs_change(
+    power_plant_two_central_inverters_different, fronius_5k_inverter
+):
+    plant = power_plant_two_central_inverters_different
+    pv_strings = plant.pv_strings
+    inverter_output_power = plant.get_inverter_output_power()
+
+    plant.module_count = 40
+    assert plant.pv_strings is not pv_strings
+    assert np.sum([s.module_count for s in plant.pv_strings]) == 40
+
+    plant.inverters = [fronius_5k_inverter, fronius_5k_inverter]
+    assert plant.get_inverter_output_power() < inverter_output_power
+
+    plant.inverter_count = [2, 1]
+    assert plant.get_number_of_strings() == 6
+
+
+def test_inverter_count_cannot_be_edited_in_place(
+    power_plant_single_central_inverter,
+):
+    plant = power_plant_single_central_inverter
+
+    with pytest.raises(ValueError):
+        plant.inverter_count[0] = 2
+
+
+def test_different_pv_strings(power_plant_two_central_inverters_different):
+    plant = power_plant_two_central_inverters_different
+
+    assert plant.get_different_pv_strings() == [0, 2]
+
+
+def test_cache_is_invalidated_when_inv_boolean_changes(
+    power_plant_two_central_inverters_different,
+):
+    plant = power_plant_two_central_inverters_different
+    assert len(plant.get_din_list_plant()) == 2
+
+    plant.inv_boolean = 1
+    assert len(plant.get_din_list_plant()) == 1
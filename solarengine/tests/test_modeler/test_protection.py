@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...modeler.protection import (
+    CABLE_AMPACITIES,
+    CABLE_SECTIONS,
+    select_breaker,
+    select_breakers,
+    select_cables,
+    size_protection,
+)
+from ...utils import calculo_disjuntor, get_available_din
+
+
+def test_calculo_disjuntor_raises_without_breaker():
+    assert calculo_disjuntor(20.8, get_available_din(), 1.3) == 32
+
+    with pytest.raises(Exception):
+        calculo_disjuntor(500, get_available_din(), 1.3)
+
+
+def test_select_breakers_matches_calculo_disjuntor():
+    current = np.linspace(1, 172, 500)
+
+    expected = [
+        calculo_disjuntor(c, get_available_din(), 1.3) for c in current
+    ]
+
+    assert np.array_equal(
+        select_breakers(current, safety_factor=1.3), expected
+    )
+    assert np.isnan(select_breakers([200.0], safety_factor=1.3)[0])
+
+    assert [select_breaker(c, safety_factor=1.3) for c in current] == expected
+    assert np.isnan(select_breaker(200.0, safety_factor=1.3))
+
+
+def test_select_cables_by_ampacity_and_voltage_drop():
+    section, drop = select_cables(
+        current=[30.0, 30.0],
+        length=[1.0, 200.0],
+        voltage=220,
+        max_voltage_drop=0.03,
+    )
+
+    assert section[0] == 4
+    assert section[1] > section[0]
+    assert np.all(drop <= 0.03)
+
+
+def test_plant_protection(power_plant_single_central_inverter):
+    plant = power_plant_single_central_inverter
+
+    (protection,) = plant.get_protection()
+
+    assert protection["breaker"] == 32
+    assert protection["ac_section"] == 10  # voltage drop over 74 m
+    assert np.isclose(protection["ac_voltage_drop"], 0.02505, atol=1e-5)
+    assert protection["dc_section"] == 6
+    assert protection["ac_spd_voltage"] == 220
+    assert protection["ac_spd_poles"] == 2
+    assert protection["dc_spd_voltage"] == 600
+    assert plant.get_voltage_spd_poles() == (220, 2)
+
+
+def test_size_protection_batch():
+    rng = np.random.default_rng(0)
+    n = 100000
+
+    result = size_protection(
+        i_ac_max=rng.uniform(5, 200, n),
+        v_ac_nom=rng.choice([127, 220, 380], n),
+        i_sc_string=10.25,
+        i_max_string=9.63,
+        v_max_string=42.6 * rng.integers(6, 20, n),
+        v_oc_string=50.0 * rng.integers(6, 20, n),
+        dc_length=rng.uniform(20, 200, n),
+        ac_length=rng.uniform(5, 100, n),
+    )
+
+    assert result.shape == (n,)
+    fits = ~np.isnan(result["breaker"])
+    assert np.all(result["ac_voltage_drop"][fits] <= 0.03 + 1e-12)
+    ampacity = CABLE_AMPACITIES[
+        np.searchsorted(CABLE_SECTIONS, result["ac_section"][fits])
+    ]
+    assert np.all(result["breaker"][fits] <= ampacity)
+
+
+def test_plant_protection_of_model_without_strings(
+    power_plant_two_central_inverters_different,
+):
+    plant = power_plant_two_central_inverters_different
+    plant.inverter_count = [1, 0]
+
+    with np.errstate(all="raise"):
+        protection = plant.get_protection()
+
+    assert protection["dc_section"][0] > 0
+    assert np.isfinite(protection["dc_voltage_drop"][0])
+    for field in ("dc_section", "dc_voltage_drop", "dc_spd_voltage"):
+        assert np.isnan(protection[field][1])
+    assert protection["breaker"][1] > 0
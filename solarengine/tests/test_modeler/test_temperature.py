@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...modeler.fleet import Fleet
+from ...modeler.temperature import (
+    TEMPERATURE_MODELS,
+    get_cell_temperature,
+    get_noct_cell_temperature,
+)
+
+
+def test_cell_temperature_models_use_buffers():
+    rng = np.random.default_rng(0)
+    irradiance = rng.uniform(0, 1100, 1000)
+    ambient_temperature = rng.uniform(0, 40, 1000)
+    wind_speed = rng.uniform(0, 10, 1000)
+    buffer = np.empty(1000)
+
+    for model in TEMPERATURE_MODELS:
+        temperature = get_cell_temperature(
+            irradiance, ambient_temperature, wind_speed, model, out=buffer
+        )
+        assert temperature is buffer
+        assert np.all(temperature >= ambient_temperature)
+
+        # Wind cools the modules, except in the NOCT model:
+        calm = get_cell_temperature(
+            irradiance, ambient_temperature, 0.0, model
+        )
+        assert np.all(calm >= temperature - 1e-9)
+
+    assert get_noct_cell_temperature(800.0, 20.0, noct=45) == 45
+    with pytest.raises(Exception):
+        get_cell_temperature(irradiance, ambient_temperature, model="ross")
+
+
+def test_real_output_power_of_series(
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_equal,
+):
+    plants = [
+        power_plant_single_central_inverter,
+        power_plant_two_central_inverters_equal,
+    ]
+    temperature = np.array([[25.0, 35.0, 50.0], [15.0, 25.0, 45.0]])
+
+    power = Fleet(plants).get_real_module_output_power(temperature)
+
+    for plant, row, expected in zip(plants, temperature, power):
+        assert np.allclose(plant.get_real_module_output_power(row), expected)
+        assert np.allclose(
+            sum(s.power_output_real(row) for s in plant.pv_strings), expected
+        )
+    assert power[0, 0] == plants[0].get_ideal_module_output_power()
+    assert power[0, 1] < power[0, 0]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...simulation.batch import simulate_batch
+from ...utils import (
+    ORIENTATION_FACTORS,
+    get_geracao_anual,
+    get_geracao_mensal,
+    get_irradiacao_mensal,
+)
+
+
+def test_batch_matches_power_plant(
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_different,
+):
+    plants = [
+        power_plant_single_central_inverter,
+        power_plant_two_central_inverters_different,
+    ]
+
+    results = simulate_batch(
+        module_power=[plant.module.nominal_power for plant in plants],
+        module_count=[plant.module_count for plant in plants],
+        module_area=[plant.module.area for plant in plants],
+        inverter_p_ac_nom=[[5000, 0], [7900, 5000]],
+        inverter_i_ac_max=[[20.8, 0], [34.2, 20.8]],
+        inverter_count=[[1, 0], [1, 1]],
+    )
+
+    for plant, result in zip(plants, results):
+        monthly = get_geracao_mensal(
+            plant.module.nominal_power,
+            plant.module_count,
+            get_irradiacao_mensal(),
+        )
+
+        assert result["active_power"] == plant.get_active_power()
+        assert result["total_area"] == plant.get_total_module_area()
+        assert np.allclose(result["monthly_generation"], monthly)
+        assert np.allclose(
+            result["annual_generation"], get_geracao_anual(monthly, 25, 0.01)
+        )
+
+    assert results[0]["din"][0] == 32
+    assert np.isnan(results[0]["din"][1])
+    assert np.array_equal(results[1]["din"], [50, 32])
+
+
+def test_batch_orientation_and_chunks():
+    n = 1000
+    module_count = np.arange(n) + 1
+
+    results = simulate_batch(
+        module_power=np.full(n, 410.0),
+        module_count=module_count,
+        module_area=2.0,
+        inverter_p_ac_nom=np.full(n, 5000.0),
+        inverter_i_ac_max=np.full(n, 20.8),
+        inverter_count=np.ones(n),
+        orientation_factor=ORIENTATION_FACTORS["S"],
+        chunk_size=64,
+    )
+
+    expected = get_geracao_mensal(410, n, get_irradiacao_mensal("S"))
+    assert np.allclose(results["monthly_generation"][-1], expected)
+    assert np.array_equal(results["total_area"], 2.0 * module_count)
+
+
+def test_breaker_not_available_is_nan():
+    results = simulate_batch(
+        module_power=[410.0],
+        module_count=[10],
+        module_area=[2.0],
+        inverter_p_ac_nom=[5000.0],
+        inverter_i_ac_max=[500.0],
+        inverter_count=[1],
+    )
+
+    assert np.isnan(results["din_total"][0])
+    assert results["active_power"][0] == pytest.approx(4100)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import os
+
+import numpy as np
+
+from ...modeler.efficiency import EfficiencyCurve
+from ...simulation.cache import (
+    ResultCache,
+    get_cached_geracao_anual,
+    get_cached_geracao_mensal,
+    get_plant_fingerprint,
+)
+from ...utils import get_geracao_mensal, get_irradiacao_mensal
+
+
+def test_fingerprint_depends_on_plant_inputs(
+    power_plant_single_central_inverter, fronius_8k_inverter
+):
+    plant = power_plant_single_central_inverter
+    fingerprint = get_plant_fingerprint(plant, orientacao="N")
+
+    assert fingerprint == get_plant_fingerprint(plant, orientacao="N")
+    assert fingerprint != get_plant_fingerprint(plant, orientacao="S")
+
+    plant.module_count = 13
+    assert fingerprint != get_plant_fingerprint(plant, orientacao="N")
+
+    plant.module_count = 12
+    assert fingerprint == get_plant_fingerprint(plant, orientacao="N")
+
+    plant.inv_boolean = 1
+    assert fingerprint != get_plant_fingerprint(plant, orientacao="N")
+    plant.inv_boolean = 0
+
+    plant.inverters[0].efficiency_curve = EfficiencyCurve.flat(0.97)
+    assert fingerprint != get_plant_fingerprint(plant, orientacao="N")
+
+    plant.inverters = [fronius_8k_inverter]
+    assert fingerprint != get_plant_fingerprint(plant, orientacao="N")
+
+
+def test_lru_eviction_by_size():
+    cache = ResultCache(max_bytes=3 * 800)
+
+    for key in "abc":
+        cache.put(key, np.zeros(100))
+    cache.get("a")
+    cache.put("d", np.zeros(100))
+
+    assert "b" not in cache
+    assert "a" in cache and "d" in cache
+    assert cache.stats["bytes"] == 3 * 800
+
+    cache.put("e", np.zeros(1000))
+    assert "e" not in cache
+    assert cache.get("e") is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_cached_generation(power_plant_single_central_inverter):
+    plant = power_plant_single_central_inverter
+    cache = ResultCache()
+
+    monthly = get_cached_geracao_mensal(plant, "LO", cache)
+    assert np.array_equal(
+        monthly, get_geracao_mensal(410, 12, get_irradiacao_mensal("LO"))
+    )
+    assert get_cached_geracao_mensal(plant, "LO", cache) is monthly
+
+    annual = get_cached_geracao_anual(plant, 25, 0.01, "LO", cache)
+    assert annual[0] == np.sum(monthly)
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 2
+
+
+def test_disk_tier_is_shared_between_caches(
+    tmp_path, power_plant_single_central_inverter
+):
+    plant = power_plant_single_central_inverter
+    monthly = get_cached_geracao_mensal(
+        plant, cache=ResultCache(directory=tmp_path)
+    )
+
+    cache = ResultCache(directory=tmp_path)
+    assert np.array_equal(
+        get_cached_geracao_mensal(plant, cache=cache), monthly
+    )
+    assert cache.stats["disk_hits"] == 1
+    assert cache.stats["misses"] == 0
+
+
+def test_arrays_are_cached_as_read_only_copies():
+    cache = ResultCache()
+    value = np.zeros(10)
+
+    cached = cache.put("a", value)
+    value[0] = 1
+
+    assert value.flags.writeable
+    assert cache.get("a") is cached
+    assert cached[0] == 0 and not cached.flags.writeable
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    value = np.zeros(1000)
+    cache = ResultCache(directory=tmp_path, max_disk_bytes=3.5 * 8000)
+
+    for i, key in enumerate("abcd"):
+        cache.put(key, value)
+        os.utime(cache.get_path(key), (i, i))
+
+    assert sorted(os.listdir(tmp_path)) == ["b.pickle", "c.pickle", "d.pickle"]
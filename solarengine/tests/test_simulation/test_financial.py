@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...simulation.financial import (
+    FinancialProjection,
+    get_irr,
+    get_npv,
+    get_payback,
+    project_energy,
+)
+from ...utils import get_geracao_anual
+
+
+def test_project_energy_matches_recurrence():
+    expected = [1000.0]
+    for _ in range(24):
+        expected.append(expected[-1] * (1 - 0.007))
+
+    assert np.allclose(project_energy(1000.0, 25, 0.007), expected)
+    assert np.allclose(
+        get_geracao_anual([1000.0 / 12] * 12, 25, 0.007), expected
+    )
+
+
+def test_project_energy_broadcasts_plants_and_rates():
+    energy = project_energy([1000.0, 2000.0, 3000.0], 30, [[0.005], [0.01]])
+
+    assert energy.shape == (2, 3, 30)
+    assert np.isclose(energy[1, 2, 1], 3000.0 * 0.99)
+
+
+def test_npv_irr_and_payback():
+    cash_flows = np.array([[-1000.0] + [300.0] * 5, [-1000.0] + [100.0] * 5])
+
+    irr = get_irr(cash_flows)
+
+    assert np.allclose(get_npv(cash_flows, irr), 0.0, atol=1e-6)
+    assert np.isclose(irr[0], 0.15238, atol=1e-4)
+    assert irr[1] < 0
+    assert np.allclose(
+        get_payback(cash_flows), [1000 / 300, np.nan], equal_nan=True
+    )
+
+
+def test_financial_projection_scenarios():
+    projection = FinancialProjection(
+        first_year_energy=np.full(1000, 7000.0),
+        investment=20000.0,
+        tariff=0.8,
+        years=25,
+        degradation=0.01,
+        escalation=np.array([[0.0], [0.05]]),
+        discount_rate=0.08,
+    )
+
+    assert projection.cash_flows.shape == (2, 1000, 26)
+    assert np.all(projection.npv[1] > projection.npv[0])
+    assert np.all(projection.irr[1] > projection.irr[0])
+    assert np.all(projection.payback[1] < projection.payback[0])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...simulation.montecarlo import (
+    StreamingHistogram,
+    UncertaintyModel,
+    simulate_generation_distribution,
+)
+from ...utils import get_geracao_mensal, get_irradiacao_mensal
+
+
+def test_histogram_percentiles_match_numpy():
+    values = np.random.default_rng(1).normal(100.0, 10.0, 200000)
+    histogram = StreamingHistogram(0.0, 200.0, bins=20000)
+    for block in np.array_split(values, 7):
+        histogram.update(block)
+
+    assert len(histogram) == len(values)
+    assert np.isclose(histogram.mean, values.mean())
+    assert np.allclose(
+        histogram.percentile([10, 50, 90]),
+        np.percentile(values, [10, 50, 90]),
+        atol=0.01,
+    )
+
+
+def test_distribution_is_reproducible(power_plant_single_central_inverter):
+    plant = power_plant_single_central_inverter
+    first = simulate_generation_distribution(
+        plant, samples=50000, seed=7, block_size=8192
+    )
+    second = simulate_generation_distribution(
+        plant, samples=50000, seed=7, block_size=8192, processes=2
+    )
+
+    # 7 blocks, more than the 4 held at once by 2 processes:
+    assert len(first) == 50000
+    assert np.array_equal(first.counts, second.counts)
+    assert first.total == second.total
+
+
+def test_p50_and_p90(power_plant_single_central_inverter):
+    plant = power_plant_single_central_inverter
+    reference = np.sum(
+        get_geracao_mensal(
+            plant.module.nominal_power,
+            plant.module_count,
+            get_irradiacao_mensal(),
+        )
+    )
+
+    histogram = simulate_generation_distribution(
+        plant,
+        samples=100000,
+        uncertainty=UncertaintyModel(
+            temperature_std=0, performance_ratio_std=0, degradation_std=0
+        ),
+    )
+
+    p50, p90 = histogram.exceedance([50, 90])
+    assert np.isclose(p50, reference, rtol=0.002)
+    assert np.isclose(p90, reference * (1 - 1.2816 * 0.05), rtol=0.002)
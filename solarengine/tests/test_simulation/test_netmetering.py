@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...simulation.netmetering import (
+    get_min_availability,
+    get_monthly_energy,
+    run_credit_ledger,
+    simulate_net_metering,
+)
+
+
+def run_reference_ledger(imported, injected, min_availability, lifetime):
+    """
+    Ledger of a single customer with explicit FIFO credit buckets.
+    """
+    buckets = []  # [month created, credits]
+    results = []
+    for month, (consumption, injection) in enumerate(zip(imported, injected)):
+        expired = 0.0
+        while buckets and buckets[0][0] < month - lifetime:
+            expired += buckets.pop(0)[1]
+
+        compensable = max(consumption - min_availability, 0)
+        compensated = min(injection, compensable)
+        remaining = compensable - compensated
+        used = 0.0
+        while remaining > 0 and buckets:
+            amount = min(remaining, buckets[0][1])
+            buckets[0][1] -= amount
+            remaining -= amount
+            used += amount
+            if buckets[0][1] == 0:
+                buckets.pop(0)
+        buckets.append([month, injection - compensated])
+
+        results.append(
+            (
+                expired,
+                used,
+                sum(bucket[1] for bucket in buckets),
+                max(consumption - compensated - used, min_availability),
+            )
+        )
+    return np.array(results)
+
+
+def test_credit_ledger_matches_fifo_buckets():
+    rng = np.random.default_rng(0)
+    imported = rng.uniform(0, 500, (20, 40)) * (rng.random((20, 40)) < 0.7)
+    injected = rng.uniform(0, 600, (20, 40)) * (rng.random((20, 40)) < 0.5)
+    min_availability = get_min_availability(
+        ["Residencial Monofásico", "Comercial Bifásico", "Trifásico", 30] * 5
+    )
+
+    ledger = run_credit_ledger(
+        imported, injected, min_availability, tariff=0.9, lifetime=6
+    )
+
+    assert ledger.credits_expired.sum() > 0
+    for customer in range(20):
+        reference = run_reference_ledger(
+            imported[customer],
+            injected[customer],
+            min_availability[customer],
+            6,
+        )
+        assert np.allclose(reference[:, 0], ledger.credits_expired[customer])
+        assert np.allclose(reference[:, 1], ledger.credits_used[customer])
+        assert np.allclose(reference[:, 2], ledger.credit_balance[customer])
+        assert np.allclose(reference[:, 3], ledger.billed_energy[customer])
+    assert np.allclose(ledger.bill, ledger.billed_energy * 0.9)
+
+    with pytest.raises(Exception):
+        get_min_availability(["Residencial"])
+
+
+def test_net_metering_of_hourly_series():
+    hours = np.arange(8760)
+    generation = np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0, None)
+    load = np.full((2, 8760), 0.4)
+
+    monthly = get_monthly_energy(load, [generation * 2, generation * 0.1])
+    assert monthly["consumption"].shape == (2, 12)
+    assert np.allclose(monthly["consumption"].sum(axis=1), 0.4 * 8760)
+    assert np.allclose(
+        monthly["imported"] - monthly["injected"],
+        monthly["consumption"] - monthly["generation"],
+    )
+
+    ledger = simulate_net_metering(
+        load,
+        [generation * 2, generation * 0.1],
+        ["Residencial Bifásico", "Residencial Bifásico"],
+        tariff=[0.8, 0.9],
+    )
+    # A plant larger than the load pays only the min. availability:
+    assert np.allclose(ledger.billed_energy[0], 50)
+    assert ledger.credit_balance[0, -1] > 0
+    assert np.all(ledger.billed_energy[1] > 50)
+    assert np.allclose(ledger.bill[1], ledger.billed_energy[1] * 0.9)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+from copy import copy
+
+import numpy as np
+import pytest
+
+from ...modeler.diode import get_diode_parameters, get_max_power_point
+from ...modeler.temperature import (
+    get_noct_cell_temperature,
+    get_temperature_derating,
+)
+from ...simulation.power import simulate_power
+
+# Ambient temperature that results in a cell temperature of 25 C at STC:
+STC_AMBIENT_TEMPERATURE = 25 - 1000 * (45 - 20) / 800
+
+
+def test_no_irradiance_produces_no_power(power_plant_single_central_inverter):
+    output = simulate_power(
+        power_plant_single_central_inverter, np.zeros(24), np.full(24, 25.0)
+    )
+
+    assert np.all(output.dc_power == 0)
+    assert np.all(output.ac_power == 0)
+
+
+def test_dc_power_at_stc(power_plant_two_central_inverters_equal):
+    plant = power_plant_two_central_inverters_equal
+
+    output = simulate_power(plant, [1000.0], [STC_AMBIENT_TEMPERATURE])
+
+    assert output.dc_power[0] == pytest.approx(
+        plant.get_ideal_module_output_power()
+    )
+
+
+def test_ac_power_is_clipped_at_nominal_power(
+    power_plant_two_central_inverters_equal,
+):
+    plant = power_plant_two_central_inverters_equal
+
+    output = simulate_power(plant, [1200.0], [STC_AMBIENT_TEMPERATURE])
+
+    assert output.ac_power[0] == pytest.approx(
+        plant.get_inverter_output_power()
+    )
+
+
+def test_strings_below_mppt_range_operate_at_its_limit(
+    power_plant_single_central_inverter,
+):
+    plant = power_plant_single_central_inverter
+    module = plant.module
+
+    # 6 module strings fall below the 240 V MPPT range when hot:
+    output = simulate_power(plant, [800.0, 800.0], [0.0, 45.0])
+
+    cell_temperature = get_noct_cell_temperature(800.0, 45.0)
+    parameters = get_diode_parameters(module, 800.0, cell_temperature)
+    mpp_voltage, _, mpp_power = parameters.get_max_power_point()
+    assert 6 * mpp_voltage < 240
+
+    # Power of the I-V curve at 240 V, relative to the MPP:
+    fraction = 40 * parameters.get_current(40.0) / mpp_power
+    expected = (
+        800
+        / 1000
+        * module.nominal_power
+        * 12
+        * get_temperature_derating(cell_temperature, module.ppt)
+        * fraction
+    )
+    assert 0 < output.dc_power[1] == pytest.approx(expected)
+    assert output.ac_power[1] > 0
+
+
+def test_energy_of_hourly_series(power_plant_two_central_inverters_equal):
+    hours = np.arange(8760)
+    irradiance = np.clip(1000 * np.sin((hours % 24 - 6) / 12 * np.pi), 0, None)
+
+    output = simulate_power(
+        power_plant_two_central_inverters_equal,
+        irradiance,
+        np.full(8760, 25.0),
+    )
+
+    assert output.ac_energy == pytest.approx(np.sum(output.ac_power) * 1e-3)
+    assert 0 < output.ac_energy < output.dc_energy
+
+
+def test_same_inverter_object_listed_twice(
+    power_plant_two_central_inverters_equal, fronius_5k_inverter
+):
+    plant = power_plant_two_central_inverters_equal
+    plant.inverter_count = [1, 1]
+
+    plant.inverters = [fronius_5k_inverter, copy(fronius_5k_inverter)]
+    reference = simulate_power(plant, [800.0], [0.0])
+
+    plant.inverters = [fronius_5k_inverter, fronius_5k_inverter]
+    output = simulate_power(plant, [800.0], [0.0])
+
+    assert output.dc_power[0] > 0
+    assert output.dc_power[0] == pytest.approx(reference.dc_power[0])
+
+
+def test_inverter_model_without_units(
+    power_plant_two_central_inverters_different,
+):
+    plant = power_plant_two_central_inverters_different
+    plant.inverter_count = [1, 0]
+
+    with np.errstate(all="raise"):
+        output = simulate_power(plant, [800.0], [0.0])
+
+    assert output.ac_power[0] > 0
+    assert np.isfinite(output.clipped_power[0])
+
+
+def test_string_voltage_follows_single_diode_model(
+    power_plant_single_central_inverter,
+):
+    module = power_plant_single_central_inverter.module
+
+    voltage = get_max_power_point(module, [1000.0, 200.0], 25.0)[0]
+
+    # The MPP voltage depends on the irradiance, not only on temperature:
+    assert voltage[0] == pytest.approx(module.v_max, rel=0.01)
+    assert voltage[1] < 0.97 * module.v_max
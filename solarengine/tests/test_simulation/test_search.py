@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+from ...simulation.search import is_string_feasible, search_designs
+
+
+def test_search_returns_only_feasible_candidates(
+    trina_410_module, fronius_5k_inverter, fronius_8k_inverter
+):
+    catalog = [fronius_5k_inverter, fronius_8k_inverter]
+
+    candidates = search_designs(
+        trina_410_module,
+        catalog,
+        target_power=10000,
+        max_models=2,
+        processes=1,
+    )
+
+    assert len(candidates) > 0
+    for candidate in candidates:
+        plant = candidate.to_power_plant(trina_410_module, catalog)
+        assert all(is_string_feasible(s) for s in plant.pv_strings)
+        assert 9000 <= plant.get_ideal_module_output_power() <= 11000
+
+    generation = [c.annual_generation for c in candidates]
+    assert generation == sorted(generation, reverse=True)
+
+
+def test_search_by_cost_in_process_pool(
+    trina_410_module, fronius_5k_inverter, fronius_8k_inverter
+):
+    catalog = [fronius_5k_inverter, fronius_8k_inverter]
+    options = dict(
+        target_power=20000,
+        max_models=2,
+        rank_by="cost",
+        module_price=500,
+        inverter_prices=[4000, 6000],
+        chunk_size=1,
+    )
+
+    serial = search_designs(trina_410_module, catalog, processes=1, **options)
+    parallel = search_designs(
+        trina_410_module, catalog, processes=2, **options
+    )
+
+    assert [repr(c) for c in serial] == [repr(c) for c in parallel]
+    assert [c.cost for c in serial] == sorted(c.cost for c in serial)
+
+
+def test_search_without_feasible_inverters(
+    trina_410_module, fronius_5k_inverter
+):
+    fronius_5k_inverter.i_dc_max = 5
+
+    assert (
+        search_designs(
+            trina_410_module, [fronius_5k_inverter], 5000, processes=1
+        )
+        == []
+    )
+
+
+def test_search_checks_current_of_parallel_strings(
+    trina_410_module, fronius_5k_inverter
+):
+    # Each string fits, but the two strings of the inverter do not:
+    fronius_5k_inverter.i_dc_max = 1.5 * trina_410_module.i_sc
+
+    assert (
+        search_designs(
+            trina_410_module, [fronius_5k_inverter], 5000, processes=1
+        )
+        == []
+    )
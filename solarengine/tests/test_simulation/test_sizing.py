@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...modeler.arrays import InverterArray, ModuleArray
+from ...simulation.search import get_string_length_range
+from ...simulation.sizing import BETA_VOC, size_strings
+
+
+def test_size_strings_limits(trina_410_module, fronius_5k_inverter):
+    sizing = size_strings(
+        [trina_410_module], [fronius_5k_inverter], t_min=-5, t_max=35
+    )
+    lower = sizing.min_modules[0, 0]
+    upper = sizing.max_modules[0, 0]
+
+    assert lower <= upper
+    assert upper * sizing.v_oc_cold[0] <= fronius_5k_inverter.v_dc_max
+    v_max_cold = trina_410_module.v_max * (1 + trina_410_module.ppt * 0.3)
+    assert (upper + 1) * v_max_cold > fronius_5k_inverter.v_mppt_max
+    assert lower * sizing.v_max_hot[0] >= fronius_5k_inverter.v_mppt_min
+    assert sizing.v_oc_cold[0] > trina_410_module.v_oc
+    assert sizing.v_max_hot[0] < trina_410_module.v_max
+
+    # Temperature correction narrows the STC range:
+    stc_lower, stc_upper = get_string_length_range(
+        trina_410_module, fronius_5k_inverter
+    )
+    assert stc_lower <= lower and upper <= stc_upper
+    assert sizing.accepts(np.arange(30), 0, 0).sum() == upper - lower + 1
+
+
+def test_size_strings_cross_product(
+    trina_410_module, fronius_5k_inverter, fronius_8k_inverter
+):
+    rng = np.random.default_rng(0)
+    modules = ModuleArray.from_modules([trina_410_module] * 50)
+    modules.records["v_oc"] *= rng.uniform(0.5, 1.5, 50)
+    modules.records["v_max"] = modules.records["v_oc"] * 0.85
+    modules.records["i_sc"][0] = 40
+    inverters = InverterArray.from_inverters(
+        [fronius_5k_inverter, fronius_8k_inverter]
+    )
+
+    sizing = size_strings(modules, inverters, chunk_size=7)
+
+    assert sizing.min_modules.shape == (50, 2)
+    assert not np.any(sizing.compatible[0])
+    for i in range(1, 50):
+        for j in range(2):
+            single = size_strings(modules[i : i + 1], inverters[j : j + 1])
+            assert single.min_modules[0, 0] == sizing.min_modules[i, j]
+            assert single.max_modules[0, 0] == sizing.max_modules[i, j]
+
+
+def test_open_circuit_voltage_coefficient(
+    trina_410_module, fronius_5k_inverter
+):
+    sizing = size_strings([trina_410_module], [fronius_5k_inverter], t_min=-5)
+
+    # Not the power coefficient of the module:
+    assert sizing.v_oc_cold[0] == pytest.approx(
+        trina_410_module.v_oc * (1 + BETA_VOC * 0.3)
+    )
+
+    steeper = size_strings(
+        [trina_410_module], [fronius_5k_inverter], t_min=-5, beta_voc=0.4
+    )
+    assert steeper.v_oc_cold[0] > sizing.v_oc_cold[0]
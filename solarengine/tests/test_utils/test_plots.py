@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import os
+
+import pytest
+
+from ...simulation.cache import ResultCache, default_cache
+from ...utils import get_irradiacao_mensal
+from ...utils.plots import (
+    GenerationFigureRenderer,
+    previsao_geracao_figura,
+    render_plants,
+)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_render_plants_to_memory(
+    power_plant_single_central_inverter,
+    power_plant_two_central_inverters_different,
+):
+    results = render_plants(
+        [
+            power_plant_single_central_inverter,
+            power_plant_two_central_inverters_different,
+        ]
+    )
+
+    assert len(results) == 2
+    assert all(
+        image.startswith(PNG_SIGNATURE) for pair in results for image in pair
+    )
+    # Same figure, different data:
+    assert results[0][0] != results[1][0]
+
+
+def test_render_plants_to_directory(
+    tmp_path, power_plant_single_central_inverter
+):
+    plants = [power_plant_single_central_inverter] * 3
+
+    results = render_plants(
+        plants, directory=tmp_path / "output", processes=2, chunk_size=2
+    )
+
+    assert len(results) == 3
+    assert all(os.path.getsize(path) > 0 for pair in results for path in pair)
+    assert sorted(os.listdir(tmp_path / "output"))[0] == "0_geracao_anual.png"
+
+
+def test_render_plants_checks_names(power_plant_single_central_inverter):
+    with pytest.raises(Exception):
+        render_plants([power_plant_single_central_inverter] * 2, names=["a_"])
+
+
+def test_renderer_releases_figures():
+    with GenerationFigureRenderer() as renderer:
+        pass
+
+    assert renderer.monthly_figure is None and renderer.annual_figure is None
+
+
+def test_plotting_the_same_plant_twice_hits_the_cache(
+    power_plant_single_central_inverter,
+):
+    cache = ResultCache()
+
+    first = render_plants([power_plant_single_central_inverter], cache=cache)
+    misses = cache.stats["misses"]
+    second = render_plants([power_plant_single_central_inverter], cache=cache)
+
+    assert misses > 0
+    assert cache.stats["misses"] == misses
+    assert cache.stats["hits"] >= 2
+    assert first == second
+
+
+def test_previsao_geracao_figura_hits_the_cache(tmp_path):
+    default_cache.clear()
+    irradiacao_mensal = get_irradiacao_mensal()
+
+    for _ in range(2):
+        previsao_geracao_figura(400, 12, irradiacao_mensal, tmp_path)
+
+    assert default_cache.stats["misses"] == 1
+    assert default_cache.stats["hits"] == 1
+    assert os.path.getsize(tmp_path / "geracao_mensal.png") > 0
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...utils import get_irradiacao_mensal
+from ...weather.grid import load_irradiance_grid, write_irradiance_grid
+
+
+@pytest.fixture
+def linear_grid(tmp_path):
+    # Values are linear in latitude and longitude, so bilinear interpolation
+    # is exact:
+    latitudes = 5.0 - 0.5 * np.arange(80)
+    longitudes = -75.0 + 0.5 * np.arange(90)
+    values = (
+        3.0
+        + 0.01 * latitudes[:, None, None]
+        + 0.02 * longitudes[None, :, None]
+        + 0.1 * np.arange(12)
+    )
+    write_irradiance_grid(tmp_path, values, (5.0, -0.5), (-75.0, 0.5))
+    return load_irradiance_grid(tmp_path)
+
+
+def expected(latitude, longitude):
+    return 3.0 + 0.01 * latitude + 0.02 * longitude + 0.1 * np.arange(12)
+
+
+def test_single_lookup(linear_grid):
+    assert np.allclose(
+        linear_grid.interpolate(-22.02, -42.02), expected(-22.02, -42.02)
+    )
+
+
+def test_batch_lookup(linear_grid):
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(-34, 5, 5000)
+    longitudes = rng.uniform(-75, -31, 5000)
+
+    values = linear_grid.interpolate(latitudes, longitudes)
+
+    assert values.shape == (5000, 12)
+    assert np.allclose(
+        values, expected(latitudes[:, None], longitudes[:, None]), atol=1e-4
+    )
+    assert np.all(np.isnan(linear_grid.interpolate([40.0], [-50.0])))
+
+
+def test_plant_irradiation(linear_grid, power_plant_single_central_inverter):
+    irradiacao_mensal = linear_grid.get_irradiacao_mensal(
+        power_plant_single_central_inverter, "S"
+    )
+
+    assert np.allclose(
+        irradiacao_mensal,
+        expected(-22.02, -42.02)
+        * get_irradiacao_mensal("S")
+        / get_irradiacao_mensal("N"),
+    )
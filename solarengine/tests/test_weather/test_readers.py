@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+import pytest
+
+from ...simulation.power import simulate_power, simulate_power_stream
+from ...weather.readers import (
+    WeatherChunk,
+    read_csv,
+    read_epw,
+    read_npy,
+    read_tmy3,
+    write_npy,
+)
+
+
+@pytest.fixture
+def hourly_weather():
+    hours = np.arange(8760)
+    irradiance = np.clip(900 * np.sin((hours % 24 - 6) / 12 * np.pi), 0, None)
+    temperature = 20 + 8 * np.sin((hours % 24 - 9) / 12 * np.pi)
+    wind_speed = np.full(8760, 2.5)
+    return irradiance.round(1), temperature.round(1), wind_speed
+
+
+def test_csv_is_read_in_chunks(tmp_path, hourly_weather):
+    irradiance, temperature, wind_speed = hourly_weather
+    path = tmp_path / "weather.csv"
+    with open(path, "w") as file:
+        file.write("time,ghi,temp_air,wind\n")
+        for i in range(len(irradiance)):
+            file.write(
+                f"{i},{irradiance[i]},{temperature[i]},{wind_speed[i]}\n"
+            )
+
+    chunks = list(read_csv(path, "ghi", "temp_air", "wind", chunk_size=1000))
+
+    assert [len(chunk) for chunk in chunks] == [1000] * 8 + [760]
+    assert np.array_equal(
+        np.concatenate([c.irradiance for c in chunks]), irradiance
+    )
+    assert np.array_equal(
+        np.concatenate([c.ambient_temperature for c in chunks]), temperature
+    )
+
+    with pytest.raises(Exception):
+        next(read_csv(path, "dni", "temp_air"))
+
+
+def test_tmy3_and_epw_formats(tmp_path):
+    tmy3 = tmp_path / "weather.tmy3"
+    tmy3.write_text(
+        "690150,TWENTYNINE PALMS,CA,-8.0,34.300,-116.167,626\n"
+        "Date (MM/DD/YYYY),Time (HH:MM),GHI (W/m^2),Dry-bulb (C),"
+        "Wspd (m/s)\n"
+        "01/01/1988,01:00,0,10.5,3.1\n"
+        "01/01/1988,02:00,250,12.0,2.0\n"
+    )
+    chunks = list(read_tmy3(tmy3))
+    assert chunks[0].irradiance.tolist() == [0, 250]
+    assert chunks[0].wind_speed.tolist() == [3.1, 2.0]
+
+    epw = tmp_path / "weather.epw"
+    row = [1999, 1, 1, 1, 0, "?", 18.5] + [0] * 6 + [420] + [0] * 7 + [4.0]
+    epw.write_text(
+        "HEADER\n" * 8 + ",".join(str(value) for value in row) + "\n"
+    )
+    chunk = next(read_epw(epw))
+    assert chunk.irradiance.tolist() == [420]
+    assert chunk.ambient_temperature.tolist() == [18.5]
+    assert chunk.wind_speed.tolist() == [4.0]
+
+
+def test_streamed_simulation_matches_full_series(
+    tmp_path, hourly_weather, power_plant_two_central_inverters_equal
+):
+    plant = power_plant_two_central_inverters_equal
+    irradiance, temperature, wind_speed = hourly_weather
+
+    path = tmp_path / "weather.npy"
+    chunks = (
+        WeatherChunk(
+            irradiance[i : i + 500],
+            temperature[i : i + 500],
+            wind_speed[i : i + 500],
+        )
+        for i in range(0, 8760, 500)
+    )
+    write_npy(path, chunks, 8760)
+
+    streamed = sum(
+        output.ac_energy
+        for output in simulate_power_stream(
+            plant, read_npy(path, chunk_size=777)
+        )
+    )
+    full = simulate_power(plant, irradiance, temperature).ac_energy
+
+    assert streamed == pytest.approx(full)
+
+
+def test_npy_without_wind_speed(
+    tmp_path, hourly_weather, power_plant_two_central_inverters_equal
+):
+    plant = power_plant_two_central_inverters_equal
+    irradiance, temperature, _ = hourly_weather
+
+    path = tmp_path / "weather.npy"
+    write_npy(path, [WeatherChunk(irradiance, temperature)], 8760)
+
+    chunks = list(read_npy(path))
+    assert chunks[0].wind_speed is None
+
+    streamed = sum(
+        output.ac_energy
+        for output in simulate_power_stream(
+            plant, chunks, temperature_model="faiman"
+        )
+    )
+    full = simulate_power(
+        plant, irradiance, temperature, temperature_model="faiman"
+    ).ac_energy
+
+    assert np.isfinite(streamed)
+    assert streamed == pytest.approx(full)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+import numpy as np
+
+from ...weather.solar import (
+    get_plant_site_table,
+    get_poa_irradiance,
+    get_site_table,
+    get_solar_position,
+)
+
+
+def test_solar_noon_at_solstices():
+    times = np.datetime64("2023-06-21T00:00") + np.arange(
+        2 * 1440
+    ) * np.timedelta64(1, "m")
+    times[1440:] += np.timedelta64(183, "D")
+
+    zenith, azimuth = get_solar_position(times, -22.9, -43.2)
+
+    june, december = np.argmin(zenith[:1440]), 1440 + np.argmin(zenith[1440:])
+    assert np.isclose(zenith[june], 22.9 + 23.44, atol=0.05)
+    assert np.isclose(zenith[december], 23.44 - 22.9, atol=0.05)
+    assert min(azimuth[june], 360 - azimuth[june]) < 1
+
+
+def test_interpolated_position_matches_direct():
+    times = np.datetime64("2023-01-01T00:00") + np.arange(
+        0, 525600, 7
+    ) * np.timedelta64(1, "m")
+
+    zenith, azimuth = get_solar_position(times, 10.0, 20.0)
+    direct = [
+        get_solar_position(times[i : i + 1], 10.0, 20.0)
+        for i in range(0, len(times), 5003)
+    ]
+
+    assert np.allclose([z[0] for z, _ in direct], zenith[::5003], atol=1e-4)
+    assert np.allclose([a[0] for _, a in direct], azimuth[::5003], atol=1e-3)
+
+
+def test_poa_irradiance(power_plant_single_central_inverter):
+    table = get_plant_site_table(
+        power_plant_single_central_inverter, "2023-01-01T00:00"
+    )
+    ghi = np.clip(1000 * np.cos(np.radians(table.zenith)), 0, None)
+
+    poa = table.get_poa_irradiance(ghi, np.array([[0], [22], [90]]), 0)
+
+    assert len(table) == 8760
+    assert np.allclose(poa[0], ghi)
+    assert np.sum(poa[1]) > np.sum(ghi) > np.sum(poa[2])
+    assert np.all(
+        poa[1]
+        == get_poa_irradiance(
+            ghi,
+            table.zenith,
+            table.azimuth,
+            22,
+            0,
+            extraterrestrial=table.extraterrestrial,
+        )
+    )
+
+
+def test_site_tables_are_shared():
+    table = get_site_table(-22.02, -42.02, "2023-01-01", periods=24)
+
+    assert get_site_table(-22.020001, -42.02, "2023-01-01T00:00", 24) is table
+    assert not table.zenith.flags.writeable
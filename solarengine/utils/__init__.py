@@ -4,6 +4,20 @@
 
 import numpy as np
 
+PERFORMANCE_RATIO = 0.78
+
+# Fraction of the north oriented irradiation received by each orientation:
+ORIENTATION_FACTORS = {
+    "N": 1.0,
+    "NE": (100 - 4) / 100,
+    "NO": (100 - 4) / 100,
+    "LO": (100 - 8.84) / 100,
+    "S": (100 - 26.31) / 100,
+    "SE": (100 - 20) / 100,
+    "SO": (100 - 20) / 100,
+    "H": (100 - 4.63) / 100,
+}
+
 
 def get_irradiacao_mensal():
     return [
@@ -91,19 +105,18 @@ def calculo_disjuntor(corrente_max, disjuntores, sf):
     Calcula o disjuntor adequado de acordo com a corrente máxima, o fator de
     segurança e a lista de disjuntores disponíveis.
     :return: Disjuntor adequado a operar
+    :raises Exception: Se nenhum disjuntor suporta a corrente do projeto
     """
     # Fonte:
     # https://www.solaredge.com/sites/default/files/determining-the-circuit-breaker-size-for-three-phase-inverters.pdf
-    disjuntores_disponiveis = disjuntores[
-        np.where(disjuntores >= corrente_max * sf)
-    ]
-    try:
-        return disjuntores_disponiveis[0]
-    except:
-        print(
-            f"Erro: disjuntores não são compatíveis com a corrente do projeto "
+    disjuntores = np.sort(disjuntores)
+    indice = np.searchsorted(disjuntores, corrente_max * sf, side="left")
+    if indice >= len(disjuntores):
+        raise Exception(
+            f"Disjuntores não são compatíveis com a corrente do projeto "
             f"de {corrente_max * sf:.2f} A."
         )
+    return disjuntores[indice]
 
 
 def get_geracao_mensal(P_modulo, n_modulos, irradiacao_mensal):
@@ -119,28 +132,23 @@ def get_geracao_mensal(P_modulo, n_modulos, irradiacao_mensal):
     assert (
         len(irradiacao_mensal) == 12
     ), "Irradiação mensal deve ser lista de comprimento 12."
-    geracao_mensal = np.zeros(
-        np.size(irradiacao_mensal)
-    )  # inicializando vetor de geração com 12 elementos 0s
-    PR = 0.78  # performance ratio
-    for i in range(np.size(irradiacao_mensal)):  # iterando meses do ano
-        geracao_mensal[i] = (
-            irradiacao_mensal[i]
-            * float(P_modulo)
-            * 30
-            * PR
-            * int(n_modulos)
-            * 1e-3
-        )  # em kWh
+    geracao_mensal = (
+        np.asarray(irradiacao_mensal, dtype=float)
+        * P_modulo
+        * 30
+        * PERFORMANCE_RATIO
+        * n_modulos
+        * 1e-3
+    )  # em kWh
     return geracao_mensal
 
 
 def get_geracao_anual(geracao_mensal, anos, taxa):
-    geracao_anual = np.zeros(anos)  # inicializando vetor com 0s
-    geracao_anual[0] = np.sum(geracao_mensal)
-    for i in range(1, anos):
-        geracao_anual[i] = geracao_anual[i - 1] * (1 - taxa)  # em kWh
-    return geracao_anual
+    """
+    Retorna vetor numpy com a geração de cada ano, em kWh, considerando a
+    taxa de degradação anual dos módulos.
+    """
+    return np.sum(geracao_mensal) * (1 - taxa) ** np.arange(anos)
 
 
 def get_geracao_mensal_media(geracao_mensal):
@@ -170,23 +178,11 @@ def get_irradiacao_mensal(orientacao="N"):
         ]
     )  # irradiação base usada para orientação ao Norte
 
-    if orientacao == "N":  # inclinação Norte
-        irradiacao_mensal = irradiacao_mensal_base
-    elif (
-        orientacao == "NE" or orientacao == "NO"
-    ):  # inclinação Nordeste e Noroeste
-        irradiacao_mensal = irradiacao_mensal_base * (100 - 4) / 100
-    elif orientacao == "LO":  # inclinação Leste/Oeste
-        irradiacao_mensal = irradiacao_mensal_base * (100 - 8.84) / 100
-    elif orientacao == "S":  # inclinação Sul
-        irradiacao_mensal = irradiacao_mensal_base * (100 - 26.31) / 100
-    elif (
-        orientacao == "SE" or orientacao == "SO"
-    ):  # inclinação Sudeste e Sudoeste
-        irradiacao_mensal = irradiacao_mensal_base * (100 - 20) / 100
-    elif orientacao == "H":  # inclinação horizontal
-        irradiacao_mensal = irradiacao_mensal_base * (100 - 4.63) / 100
-    else:
+    try:
+        irradiacao_mensal = (
+            irradiacao_mensal_base * ORIENTATION_FACTORS[orientacao]
+        )
+    except KeyError:
         raise Exception("Orientacao dos paineis nao identificada.")
 
     return irradiacao_mensal
@@ -2,38 +2,256 @@
 # Copyright © Felipe Bogaerts de Mattos
 # Contact: me@felipebm.com
 
-import matplotlib.pyplot as plt
+"""
+Headless rendering of the generation figures of plants. Figures are drawn
+with the Agg canvas directly, without pyplot, so no global figure registry
+keeps them alive, and a renderer reuses the same figure and artists for
+every plant, only updating their data. matplotlib, the process pool and the
+result cache are imported on first use, since loading matplotlib dominates
+start up.
+"""
 
+import io
+import os
 
-def previsao_geracao_figura(P_modulo, n_modulos, irradiacao_mensal):
+from . import get_geracao_anual, get_geracao_mensal
+from .datetime import get_mes_ano
+
+FIGURE_SIZE = (15, 8)  # in
+FIGURE_DPI = 100
+# zlib level of the PNG images. Encoding at the default level (6) takes as
+# long as drawing the figure, for files only slightly smaller:
+PNG_COMPRESSION = 1
+
+
+class GenerationFigureRenderer:
+    """
+    Renders the monthly and annual generation figures. Use as a context
+    manager, or call "close", to free the figures deterministically.
+    """
+
+    def __init__(
+        self, anos: int = 25, figsize=FIGURE_SIZE, dpi: int = FIGURE_DPI
+    ) -> None:
+        """
+        :param int anos: Number of years of the annual figure
+        :param figsize: Figure size (in)
+        :param int dpi: Resolution of the images
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        meses = [get_mes_ano(i, True) for i in range(12)]
+
+        self.monthly_figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.monthly_figure)
+        self.monthly_axes = self.monthly_figure.add_subplot()
+        (self.monthly_line,) = self.monthly_axes.plot(meses, [0] * 12)
+        self.monthly_axes.set_ylabel("Energia gerada por mês (kWh)")
+        self.monthly_axes.set_xlabel("Meses do ano")
+        self.monthly_axes.grid()
+
+        self.annual_figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.annual_figure)
+        self.annual_axes = self.annual_figure.add_subplot()
+        self.annual_bars = self.annual_axes.bar(range(anos), [0] * anos)
+        self.annual_axes.set_ylabel("Energia gerada por ano (kWh)")
+        self.annual_axes.set_xlabel("Anos")
+        self.annual_axes.grid()
+
+    def __enter__(self) -> "GenerationFigureRenderer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for figure in (self.monthly_figure, self.annual_figure):
+            figure.clear()
+        self.monthly_figure = self.annual_figure = None
+
+    def render_monthly(self, geracao_mensal, file) -> None:
+        """
+        :param geracao_mensal: Generation of each month (kWh)
+        :param file: Path or binary file object of the PNG image
+        """
+        self.monthly_line.set_ydata(geracao_mensal)
+        self.monthly_axes.relim()
+        self.monthly_axes.autoscale_view()
+        self.monthly_figure.savefig(
+            file, format="png", pil_kwargs={"compress_level": PNG_COMPRESSION}
+        )
+
+    def render_annual(self, geracao_anual, file) -> None:
+        """
+        :param geracao_anual: Generation of each year (kWh)
+        :param file: Path or binary file object of the PNG image
+        """
+        for bar, height in zip(self.annual_bars, geracao_anual):
+            bar.set_height(height)
+        self.annual_axes.relim()
+        self.annual_axes.autoscale_view()
+        self.annual_figure.savefig(
+            file, format="png", pil_kwargs={"compress_level": PNG_COMPRESSION}
+        )
+
+
+def get_figure_files(directory: str | None, name: str) -> tuple:
+    """
+    :return: Paths of the monthly and annual figures in the directory, or
+        in-memory buffers if directory is None
+    :rtype: tuple
+    """
+    if directory is None:
+        return io.BytesIO(), io.BytesIO()
+    return (
+        os.path.join(directory, f"{name}geracao_mensal.png"),
+        os.path.join(directory, f"{name}geracao_anual.png"),
+    )
+
+
+def render_generation_figures(
+    jobs: list[tuple[str, object, object]],
+    directory: str | None = None,
+    anos: int = 25,
+) -> list[tuple]:
     """
-    Salva as figuras de geração anual e mensal.
+    Renders the figures of many plants with a single renderer. Also the
+    worker task of "render_plants".
+
+    :param jobs: Name prefix, monthly generation (kWh) and annual
+        generation (kWh) of each plant
+    :param str | None directory: Output directory, None for memory
+    :param int anos: Number of years of the annual figure
+    :return: Paths, or PNG bytes, of the monthly and annual figures
+    :rtype: list[tuple]
+    """
+    results = []
+    with GenerationFigureRenderer(anos) as renderer:
+        for name, geracao_mensal, geracao_anual in jobs:
+            monthly, annual = get_figure_files(directory, name)
+            renderer.render_monthly(geracao_mensal, monthly)
+            renderer.render_annual(geracao_anual, annual)
+            if directory is None:
+                monthly, annual = monthly.getvalue(), annual.getvalue()
+            results.append((monthly, annual))
+    return results
+
+
+def render_plants(
+    plants: list,
+    directory: str | None = None,
+    names: list[str] | None = None,
+    orientacao: str = "N",
+    anos: int = 25,
+    taxa: float = 0.01,
+    processes: int | None = 1,
+    chunk_size: int = 64,
+    cache=None,
+) -> list[tuple]:
+    """
+    Renders the generation figures of many plants, in chunks that each
+    reuse one renderer. The generation of each plant comes from the result
+    cache, so plants rendered before, or already simulated, are not
+    computed again.
+
+    :param list plants: PowerPlant class objects
+    :param str | None directory: Output directory, created if needed; None
+        returns the PNG images as bytes
+    :param list[str] | None names: File name prefix of each plant,
+        defaults to "<index>_"
+    :param str orientacao: Orientation of the modules
+    :param int anos: Number of years of the annual figure
+    :param float taxa: Yearly degradation rate
+    :param int | None processes: Worker processes; 1 renders in this
+        process and None uses every CPU
+    :param int chunk_size: Plants rendered per task
+    :param ResultCache | None cache: Cache of the generation, defaults to
+        default_cache
+    :return: Paths, or PNG bytes, of the monthly and annual figure of each
+        plant
+    :rtype: list[tuple]
+    :raises Exception: If names and plants have different lengths
+    """
+    if names is None:
+        names = [f"{i}_" for i in range(len(plants))]
+    elif len(names) != len(plants):
+        raise Exception(
+            f"{len(names)} names were given for {len(plants)} plants."
+        )
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+    from ..simulation.cache import (
+        get_cached_geracao_anual,
+        get_cached_geracao_mensal,
+    )
+
+    jobs = [
+        (
+            name,
+            get_cached_geracao_mensal(plant, orientacao, cache),
+            get_cached_geracao_anual(plant, anos, taxa, orientacao, cache),
+        )
+        for name, plant in zip(names, plants)
+    ]
+    chunks = [
+        jobs[start : start + chunk_size]
+        for start in range(0, len(jobs), chunk_size)
+    ]
+
+    results = []
+    if processes == 1:
+        for chunk in chunks:
+            results += render_generation_figures(chunk, directory, anos)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(
+                    render_generation_figures, chunk, directory, anos
+                )
+                for chunk in chunks
+            ]
+            for future in futures:
+                results += future.result()
+
+    return results
+
+
+def previsao_geracao_figura(
+    P_modulo,
+    n_modulos,
+    irradiacao_mensal,
+    diretorio="automacao/automacao_files/output",
+):
+    """
+    Salva as figuras de geração anual e mensal. A geração é guardada no
+    cache de resultados.
     :param P_modulo: Potência do módulo
     :param n_modulos: Quantidade de módulos
     :param irradiacao_mensal: Vetor com irradiação mensal no local
+    :param diretorio: Diretório de saída das figuras
     :return: None
     """
+    from ..simulation.cache import default_cache, get_fingerprint
 
-    meses_ano_abreviados = []
-    for i in range(12):
-        meses_ano_abreviados.append(get_mes_ano(i, True))
-
-    geracao_mensal = get_geracao_mensal(P_modulo, n_modulos, irradiacao_mensal)
-    figura_geracao_mensal = plt.figure(figsize=(15, 8))
-    plt.plot(meses_ano_abreviados, geracao_mensal, 0, 0)
-    plt.ylabel("Energia gerada por mês (kWh)")
-    plt.xlabel("Meses do ano")
-    plt.grid()
-    figura_geracao_mensal.savefig(
-        "automacao/automacao_files/output/geracao_mensal.png"
-    )
-    figura_geracao_anual = plt.figure(figsize=(15, 8))
-    anos = np.arange(0, 25)
-    geracao_anual = get_geracao_anual(geracao_mensal, 25, 0.01)
-    plt.grid()
-    plt.bar(anos, geracao_anual)
-    plt.ylabel("Energia gerada por ano (kWh)")
-    plt.xlabel("Anos")
-    figura_geracao_anual.savefig(
-        "automacao/automacao_files/output/geracao_anual.png"
+    irradiacao_mensal = [float(value) for value in irradiacao_mensal]
+    key = get_fingerprint(
+        {
+            "result": "previsao_geracao",
+            "P_modulo": P_modulo,
+            "n_modulos": n_modulos,
+            "irradiacao_mensal": irradiacao_mensal,
+        }
     )
+
+    def compute():
+        geracao_mensal = get_geracao_mensal(
+            P_modulo, n_modulos, irradiacao_mensal
+        )
+        return geracao_mensal, get_geracao_anual(geracao_mensal, 25, 0.01)
+
+    geracao_mensal, geracao_anual = default_cache.get_or_compute(key, compute)
+    render_generation_figures([("", geracao_mensal, geracao_anual)], diretorio)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Gridded irradiance dataset.
+
+A grid is a directory with a regular latitude/longitude grid of monthly
+(12) or hourly (8760) irradiance values per cell:
+
+- metadata.json: start, step and size of each axis, number of periods
+- values.npy: float32 array of shape (latitudes, longitudes, periods)
+
+The array is memory-mapped on load, so a lookup only reads the 4 cells
+around each coordinate. Since the grid is regular, the cells are found
+arithmetically, in constant time.
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+from ..modeler.plant import PowerPlant
+from ..utils import ORIENTATION_FACTORS
+
+
+def write_irradiance_grid(
+    directory: str,
+    values: np.ndarray,
+    latitude: tuple[float, float],
+    longitude: tuple[float, float],
+) -> None:
+    """
+    :param str directory: Grid directory, created if needed
+    :param np.ndarray values: Irradiance of each cell and period, with
+        shape (latitudes, longitudes, periods)
+    :param tuple[float, float] latitude: First latitude and step; the step
+        may be negative
+    :param tuple[float, float] longitude: First longitude and step
+    :raises Exception: If values does not have 3 dimensions
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim != 3 or min(values.shape[:2]) < 2:
+        raise Exception(
+            "Irradiance grid must have shape (latitudes, longitudes, "
+            "periods), with at least 2 latitudes and longitudes."
+        )
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "values.npy"), values)
+    with open(os.path.join(directory, "metadata.json"), "w") as file:
+        json.dump(
+            {
+                "latitude": [float(latitude[0]), float(latitude[1])],
+                "longitude": [float(longitude[0]), float(longitude[1])],
+                "shape": list(values.shape),
+            },
+            file,
+        )
+
+
+class IrradianceGrid:
+    def __init__(self, directory: str) -> None:
+        """
+        :param str directory: Grid directory, see "write_irradiance_grid"
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "metadata.json")) as file:
+            metadata = json.load(file)
+
+        self.latitude_start, self.latitude_step = metadata["latitude"]
+        self.longitude_start, self.longitude_step = metadata["longitude"]
+        self.values = np.load(
+            os.path.join(directory, "values.npy"), mmap_mode="r"
+        )
+
+    @property
+    def periods(self) -> int:
+        return self.values.shape[2]
+
+    def get_cells(
+        self, coordinate: np.ndarray, start: float, step: float, size: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :return: Index of the lower cell, weight of the upper cell and
+            whether the coordinate is inside the grid
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        position = (coordinate - start) / step
+        inside = (position >= 0) & (position <= size - 1)
+        index = np.clip(np.floor(position).astype(np.intp), 0, size - 2)
+        return index, position - index, inside
+
+    def interpolate(self, latitude, longitude) -> np.ndarray:
+        """
+        Bilinear interpolation of the grid at any number of coordinates.
+        Coordinates outside the grid result in NaN.
+
+        :param latitude: Latitude(s), positive to the north
+        :param longitude: Longitude(s), positive to the east
+        :return: Irradiance of each period, with shape (periods,) for a
+            single coordinate or (N, periods)
+        :rtype: np.ndarray
+        """
+        if np.ndim(latitude) == 0 and np.ndim(longitude) == 0:
+            return self.interpolate_point(float(latitude), float(longitude))
+
+        latitude, longitude = np.broadcast_arrays(
+            np.atleast_1d(latitude), np.atleast_1d(longitude)
+        )
+
+        i, u, inside_latitude = self.get_cells(
+            latitude,
+            self.latitude_start,
+            self.latitude_step,
+            self.values.shape[0],
+        )
+        j, v, inside_longitude = self.get_cells(
+            longitude,
+            self.longitude_start,
+            self.longitude_step,
+            self.values.shape[1],
+        )
+        u, v = u[:, None], v[:, None]
+
+        result = (1 - u) * (1 - v) * self.values[i, j]
+        result += (1 - u) * v * self.values[i, j + 1]
+        result += u * (1 - v) * self.values[i + 1, j]
+        result += u * v * self.values[i + 1, j + 1]
+        result[~(inside_latitude & inside_longitude)] = np.nan
+
+        return result
+
+    def interpolate_point(self, latitude: float, longitude: float):
+        """
+        Scalar path of "interpolate", which reads the 2 x 2 block of cells
+        around the coordinate with a single slice.
+        """
+        latitudes, longitudes = self.values.shape[:2]
+        y = (latitude - self.latitude_start) / self.latitude_step
+        x = (longitude - self.longitude_start) / self.longitude_step
+        if not (0 <= y <= latitudes - 1 and 0 <= x <= longitudes - 1):
+            return np.full(self.periods, np.nan)
+
+        i = min(math.floor(y), latitudes - 2)
+        j = min(math.floor(x), longitudes - 2)
+        u, v = y - i, x - j
+
+        block = self.values[i : i + 2, j : j + 2].astype(float)
+        return (1 - u) * ((1 - v) * block[0, 0] + v * block[0, 1]) + u * (
+            (1 - v) * block[1, 0] + v * block[1, 1]
+        )
+
+    def get_irradiacao_mensal(
+        self, plant: PowerPlant, orientacao: str = "N"
+    ) -> np.ndarray:
+        """
+        Site-specific replacement of "get_irradiacao_mensal", read at the
+        coordinates of the plant from a monthly grid (kWh/m ** 2 per day).
+
+        :param PowerPlant plant: PowerPlant class object
+        :param str orientacao: Orientation of the modules
+        :return: Irradiation of the 12 months
+        :rtype: np.ndarray
+        :raises Exception: If the grid is not monthly, the plant is outside
+            the grid or the orientation is unknown
+        """
+        if self.periods != 12:
+            raise Exception("Irradiance grid does not have monthly values.")
+
+        irradiacao_mensal = self.interpolate(*plant.coordinates)
+        if np.any(np.isnan(irradiacao_mensal)):
+            raise Exception(
+                f"Coordinates {plant.coordinates} are outside the "
+                "irradiance grid."
+            )
+
+        try:
+            return irradiacao_mensal * ORIENTATION_FACTORS[orientacao]
+        except KeyError:
+            raise Exception("Orientacao dos paineis nao identificada.")
+
+
+def load_irradiance_grid(directory: str) -> IrradianceGrid:
+    return IrradianceGrid(directory)
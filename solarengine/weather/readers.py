@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Chunked readers for weather time series. Every reader is a generator of
+WeatherChunk objects holding at most chunk_size rows, so files of any length
+are processed in bounded memory.
+"""
+
+import itertools
+from typing import Iterator
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 100000
+
+WEATHER_DTYPE = np.dtype(
+    [
+        ("irradiance", "f8"),  # W/m ** 2
+        ("ambient_temperature", "f8"),  # C
+        ("wind_speed", "f8"),  # m/s
+    ]
+)
+
+# Columns of the EnergyPlus weather format, counting from 0:
+EPW_COLUMNS = {"ambient_temperature": 6, "irradiance": 13, "wind_speed": 21}
+EPW_HEADER_LINES = 8
+
+TMY3_COLUMNS = {
+    "irradiance": "GHI (W/m^2)",
+    "ambient_temperature": "Dry-bulb (C)",
+    "wind_speed": "Wspd (m/s)",
+}
+
+
+class WeatherChunk:
+    """
+    Consecutive rows of a weather time series.
+    """
+
+    def __init__(
+        self,
+        irradiance: np.ndarray,
+        ambient_temperature: np.ndarray,
+        wind_speed: np.ndarray | None = None,
+    ) -> None:
+        """
+        :param np.ndarray irradiance: Irradiance (W/m ** 2)
+        :param np.ndarray ambient_temperature: Ambient temperature (C)
+        :param np.ndarray | None wind_speed: Wind speed (m/s)
+        """
+        self.irradiance = irradiance
+        self.ambient_temperature = ambient_temperature
+        self.wind_speed = wind_speed
+
+    def __len__(self) -> int:
+        return len(self.irradiance)
+
+
+def read_csv(
+    path: str,
+    irradiance: str | int,
+    ambient_temperature: str | int,
+    wind_speed: str | int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    delimiter: str = ",",
+    skip_lines: int = 0,
+    header: bool = True,
+) -> Iterator[WeatherChunk]:
+    """
+    Reads a delimited text file, chunk_size lines at a time.
+
+    :param str path: Path of the file
+    :param str | int irradiance: Name or index of the irradiance column
+    :param str | int ambient_temperature: Name or index of the temperature
+        column
+    :param str | int | None wind_speed: Name or index of the wind column
+    :param int chunk_size: Max. rows per chunk
+    :param str delimiter: Column delimiter
+    :param int skip_lines: Lines to skip before the header (or the data)
+    :param bool header: True if the file has a line with column names
+    :return: Generator of weather chunks
+    :raises Exception: If a column name is not in the header
+    """
+    with open(path) as file:
+        for _ in range(skip_lines):
+            next(file)
+
+        names = None
+        if header:
+            names = [name.strip() for name in next(file).split(delimiter)]
+
+        def get_index(column):
+            if column is None or isinstance(column, int):
+                return column
+            try:
+                return names.index(column)
+            except (AttributeError, ValueError):
+                raise Exception(f'Column "{column}" not found in {path}.')
+
+        columns = [
+            get_index(column)
+            for column in (irradiance, ambient_temperature, wind_speed)
+        ]
+        usecols = [column for column in columns if column is not None]
+
+        while lines := list(itertools.islice(file, chunk_size)):
+            data = np.loadtxt(
+                lines, delimiter=delimiter, usecols=usecols, ndmin=2
+            )
+            yield WeatherChunk(
+                irradiance=data[:, 0],
+                ambient_temperature=data[:, 1],
+                wind_speed=data[:, 2] if len(usecols) == 3 else None,
+            )
+
+
+def read_tmy3(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[WeatherChunk]:
+    """
+    Reads a TMY3 file (one metadata line, then a header line). Uses global
+    horizontal irradiance.
+    """
+    return read_csv(path, **TMY3_COLUMNS, chunk_size=chunk_size, skip_lines=1)
+
+
+def read_epw(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[WeatherChunk]:
+    """
+    Reads an EnergyPlus weather (EPW) file. Uses global horizontal
+    irradiance.
+    """
+    return read_csv(
+        path,
+        **EPW_COLUMNS,
+        chunk_size=chunk_size,
+        skip_lines=EPW_HEADER_LINES,
+        header=False,
+    )
+
+
+def read_parquet(
+    path: str,
+    irradiance: str,
+    ambient_temperature: str,
+    wind_speed: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[WeatherChunk]:
+    """
+    Reads a Parquet file one record batch at a time. Requires pyarrow.
+
+    :raises Exception: If pyarrow is not installed
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Reading Parquet files requires pyarrow.")
+
+    columns = [irradiance, ambient_temperature]
+    if wind_speed is not None:
+        columns.append(wind_speed)
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(
+        batch_size=chunk_size, columns=columns
+    ):
+        data = [
+            batch.column(i).to_numpy(zero_copy_only=False).astype(float)
+            for i in range(len(columns))
+        ]
+        yield WeatherChunk(*data)
+
+
+def read_npy(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[WeatherChunk]:
+    """
+    Reads a ".npy" file with WEATHER_DTYPE through a memory map, so only the
+    chunk being processed is paged in. Chunks are views of the file. Wind
+    speed is None in chunks without any wind sample, as written by
+    "write_npy" for sources without wind.
+    """
+    records = np.load(path, mmap_mode="r")
+    if records.dtype != WEATHER_DTYPE:
+        raise Exception(f"{path} does not have the weather dtype.")
+
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start : start + chunk_size]
+        wind_speed = chunk["wind_speed"]
+        yield WeatherChunk(
+            irradiance=chunk["irradiance"],
+            ambient_temperature=chunk["ambient_temperature"],
+            wind_speed=None if np.all(np.isnan(wind_speed)) else wind_speed,
+        )
+
+
+def write_npy(path: str, chunks: Iterator[WeatherChunk], length: int) -> None:
+    """
+    Writes a stream of chunks to a ".npy" file readable by "read_npy",
+    without holding the series in memory. Converting a large text file once
+    makes every later read memory-mapped.
+
+    :param str path: Path of the file
+    :param chunks: Weather chunks, e.g. from "read_csv"
+    :param int length: Total number of rows of the stream
+    :raises Exception: If the stream length differs from length
+    """
+    records = np.lib.format.open_memmap(
+        path, mode="w+", dtype=WEATHER_DTYPE, shape=(length,)
+    )
+
+    start = 0
+    for chunk in chunks:
+        stop = start + len(chunk)
+        if stop > length:
+            raise Exception("Weather stream is longer than expected.")
+        records["irradiance"][start:stop] = chunk.irradiance
+        records["ambient_temperature"][start:stop] = chunk.ambient_temperature
+        records["wind_speed"][start:stop] = (
+            np.nan if chunk.wind_speed is None else chunk.wind_speed
+        )
+        start = stop
+
+    records.flush()
+    if start != length:
+        raise Exception("Weather stream is shorter than expected.")
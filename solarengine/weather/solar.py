@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# Copyright © Felipe Bogaerts de Mattos
+# Contact: me@felipebm.com
+
+"""
+Solar position and plane of array (POA) irradiance. Sun position uses the
+low precision algorithm of the Astronomical Almanac (accurate to about 0.01
+degree between 1950 and 2050) and transposition uses the Erbs decomposition
+and the isotropic sky model. Every function is vectorized over timestamps
+and surface orientations.
+
+Angles are in degrees; azimuths are measured clockwise from north.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from ..modeler.plant import PowerPlant
+
+SOLAR_CONSTANT = 1367.0  # W/m ** 2
+J2000 = np.datetime64("2000-01-01T12:00:00")
+
+
+def get_days_since_j2000(times: np.ndarray) -> np.ndarray:
+    """
+    :param np.ndarray times: UTC timestamps (datetime64)
+    :return: Days since 2000-01-01 12:00 UTC
+    :rtype: np.ndarray
+    """
+    return (np.asarray(times, dtype="datetime64[s]") - J2000) / np.timedelta64(
+        1, "D"
+    )
+
+
+def get_solar_coordinates(n: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param np.ndarray n: Days since 2000-01-01 12:00 UTC
+    :return: Right ascension and declination of the sun (rad)
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    mean_longitude = np.radians((280.460 + 0.9856474 * n) % 360)
+    mean_anomaly = np.radians((357.528 + 0.9856003 * n) % 360)
+    ecliptic_longitude = (
+        mean_longitude
+        + np.radians(1.915) * np.sin(mean_anomaly)
+        + np.radians(0.020) * np.sin(2 * mean_anomaly)
+    )
+    obliquity = np.radians(23.439 - 4e-7 * n)
+
+    sin_longitude = np.sin(ecliptic_longitude)
+    right_ascension = np.arctan2(
+        np.cos(obliquity) * sin_longitude, np.cos(ecliptic_longitude)
+    )
+    declination = np.arcsin(np.sin(obliquity) * sin_longitude)
+    return right_ascension, declination
+
+
+def get_solar_position(
+    times: np.ndarray, latitude: float, longitude: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The right ascension and declination of the sun change slowly, so for
+    long series they are computed hourly and interpolated; only the hour
+    angle is computed at every timestamp.
+
+    :param np.ndarray times: UTC timestamps (datetime64)
+    :param float latitude: Latitude, positive to the north
+    :param float longitude: Longitude, positive to the east
+    :return: Zenith and azimuth of the sun
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    n = get_days_since_j2000(times)
+
+    grid = np.arange(np.floor(np.min(n)), np.ceil(np.max(n)) + 1 / 24, 1 / 24)
+    if len(grid) < len(n):
+        grid_ascension, grid_declination = get_solar_coordinates(grid)
+        right_ascension = np.interp(n, grid, np.unwrap(grid_ascension))
+        sin_declination = np.interp(n, grid, np.sin(grid_declination))
+    else:
+        right_ascension, declination = get_solar_coordinates(n)
+        sin_declination = np.sin(declination)
+    # The declination is always within +- 23.5 degrees:
+    cos_declination = np.sqrt(1 - sin_declination**2)
+
+    # Large arrays are updated in place to avoid temporaries:
+    hour_angle = n * 360.98564736629
+    hour_angle += 280.46061837 + longitude
+    np.remainder(hour_angle, 360, out=hour_angle)
+    np.radians(hour_angle, out=hour_angle)
+    hour_angle -= right_ascension
+
+    phi = np.radians(latitude)
+    cos_hour_angle = np.cos(hour_angle)
+
+    north = np.cos(phi) * sin_declination
+    north -= np.sin(phi) * cos_declination * cos_hour_angle
+    cos_zenith = cos_hour_angle
+    cos_zenith *= cos_declination * np.cos(phi)
+    cos_zenith += np.sin(phi) * sin_declination
+    np.clip(cos_zenith, -1, 1, out=cos_zenith)
+    zenith = np.degrees(np.arccos(cos_zenith, out=cos_zenith), out=cos_zenith)
+
+    east = np.sin(hour_angle, out=hour_angle)
+    east *= cos_declination
+    np.negative(east, out=east)
+    azimuth = np.degrees(np.arctan2(east, north, out=east), out=east)
+    np.remainder(azimuth, 360, out=azimuth)
+
+    return zenith, azimuth
+
+
+def get_extraterrestrial_irradiance(times: np.ndarray) -> np.ndarray:
+    """
+    :param np.ndarray times: UTC timestamps (datetime64)
+    :return: Normal irradiance at the top of the atmosphere (W/m ** 2)
+    :rtype: np.ndarray
+    """
+    day_angle = 2 * np.pi * get_days_since_j2000(times) / 365.25
+    return SOLAR_CONSTANT * (1 + 0.033 * np.cos(day_angle))
+
+
+def get_angle_of_incidence_cosine(
+    zenith: np.ndarray,
+    azimuth: np.ndarray,
+    tilt,
+    surface_azimuth,
+) -> np.ndarray:
+    """
+    :param np.ndarray zenith: Zenith of the sun
+    :param np.ndarray azimuth: Azimuth of the sun
+    :param tilt: Tilt of the surface from the horizontal
+    :param surface_azimuth: Azimuth the surface faces
+    :return: Cosine of the angle between the sun and the surface normal
+    :rtype: np.ndarray
+    """
+    zenith = np.radians(zenith)
+    tilt = np.radians(tilt)
+    return np.cos(zenith) * np.cos(tilt) + np.sin(zenith) * np.sin(
+        tilt
+    ) * np.cos(np.radians(np.subtract(azimuth, surface_azimuth)))
+
+
+def decompose_irradiance(
+    ghi: np.ndarray, zenith: np.ndarray, extraterrestrial: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Splits global horizontal irradiance in direct normal and diffuse
+    horizontal irradiance with the Erbs model.
+
+    :param np.ndarray ghi: Global horizontal irradiance (W/m ** 2)
+    :param np.ndarray zenith: Zenith of the sun
+    :param np.ndarray extraterrestrial: See
+        "get_extraterrestrial_irradiance" (W/m ** 2)
+    :return: Direct normal and diffuse horizontal irradiance (W/m ** 2)
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    ghi = np.asarray(ghi, dtype=float)
+    cos_zenith = np.cos(np.radians(zenith))
+    daylight = cos_zenith > 0.0175  # sun higher than 1 degree
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kt = np.where(
+            daylight, np.clip(ghi / (extraterrestrial * cos_zenith), 0, 1), 0
+        )
+    diffuse_fraction = np.select(
+        [kt <= 0.22, kt <= 0.8],
+        [
+            1 - 0.09 * kt,
+            0.9511
+            - 0.1604 * kt
+            + 4.388 * kt**2
+            - 16.638 * kt**3
+            + 12.336 * kt**4,
+        ],
+        0.165,
+    )
+
+    dhi = ghi * diffuse_fraction
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dni = np.where(daylight, (ghi - dhi) / cos_zenith, 0.0)
+    return np.maximum(dni, 0.0), dhi
+
+
+def get_poa_irradiance(
+    ghi: np.ndarray,
+    zenith: np.ndarray,
+    azimuth: np.ndarray,
+    tilt,
+    surface_azimuth,
+    extraterrestrial: np.ndarray | None = None,
+    dni: np.ndarray | None = None,
+    dhi: np.ndarray | None = None,
+    albedo: float = 0.2,
+) -> np.ndarray:
+    """
+    Irradiance on a tilted surface with the isotropic sky model. If DNI and
+    DHI are not given, they are estimated from GHI. Tilt and surface azimuth
+    may be arrays: with shape (M, 1), e.g., the result has one row per
+    orientation.
+
+    :param np.ndarray ghi: Global horizontal irradiance (W/m ** 2)
+    :param np.ndarray zenith: Zenith of the sun
+    :param np.ndarray azimuth: Azimuth of the sun
+    :param tilt: Tilt of the surface from the horizontal
+    :param surface_azimuth: Azimuth the surface faces
+    :param np.ndarray | None extraterrestrial: Required without DNI/DHI
+    :param np.ndarray | None dni: Direct normal irradiance (W/m ** 2)
+    :param np.ndarray | None dhi: Diffuse horizontal irradiance (W/m ** 2)
+    :param float albedo: Reflectance of the ground
+    :return: Plane of array irradiance (W/m ** 2)
+    :rtype: np.ndarray
+    :raises Exception: If neither DNI/DHI nor extraterrestrial are given
+    """
+    if dni is None or dhi is None:
+        if extraterrestrial is None:
+            raise Exception(
+                "Extraterrestrial irradiance is required to decompose GHI."
+            )
+        dni, dhi = decompose_irradiance(ghi, zenith, extraterrestrial)
+
+    cos_tilt = np.cos(np.radians(tilt))
+    cos_incidence = get_angle_of_incidence_cosine(
+        zenith, azimuth, tilt, surface_azimuth
+    )
+    beam = dni * np.maximum(cos_incidence, 0)
+    sky = dhi * (1 + cos_tilt) / 2
+    ground = np.asarray(ghi, dtype=float) * albedo * (1 - cos_tilt) / 2
+    return beam + sky + ground
+
+
+class SiteTable:
+    """
+    Solar position and extraterrestrial irradiance of a site over a regular
+    time grid. Tables are immutable and shared by every plant at the same
+    site, see "get_site_table".
+    """
+
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        start: str,
+        periods: int,
+        step: int,
+    ) -> None:
+        """
+        :param float latitude: Latitude, positive to the north
+        :param float longitude: Longitude, positive to the east
+        :param str start: First UTC timestamp, e.g. "2023-01-01T00:00"
+        :param int periods: Number of timestamps
+        :param int step: Time step (minutes)
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.times = np.datetime64(start, "m") + np.arange(
+            periods
+        ) * np.timedelta64(step, "m")
+        self.zenith, self.azimuth = get_solar_position(
+            self.times, latitude, longitude
+        )
+        self.extraterrestrial = get_extraterrestrial_irradiance(self.times)
+
+        for array in (
+            self.times,
+            self.zenith,
+            self.azimuth,
+            self.extraterrestrial,
+        ):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def get_poa_irradiance(
+        self, ghi: np.ndarray, tilt, surface_azimuth, albedo: float = 0.2
+    ) -> np.ndarray:
+        """
+        :param np.ndarray ghi: Global horizontal irradiance on the time grid
+            (W/m ** 2)
+        :param tilt: Tilt of the surface from the horizontal
+        :param surface_azimuth: Azimuth the surface faces
+        :param float albedo: Reflectance of the ground
+        :return: Plane of array irradiance (W/m ** 2)
+        :rtype: np.ndarray
+        """
+        return get_poa_irradiance(
+            ghi,
+            self.zenith,
+            self.azimuth,
+            tilt,
+            surface_azimuth,
+            extraterrestrial=self.extraterrestrial,
+            albedo=albedo,
+        )
+
+
+@lru_cache(maxsize=32)
+def get_cached_site_table(
+    latitude: float, longitude: float, start: str, periods: int, step: int
+) -> SiteTable:
+    return SiteTable(latitude, longitude, start, periods, step)
+
+
+def get_site_table(
+    latitude: float,
+    longitude: float,
+    start: str,
+    periods: int = 8760,
+    step: int = 60,
+) -> SiteTable:
+    """
+    Site table from a cache. Coordinates are rounded to 4 decimal places
+    (about 10 m), so plants at the same site share a table.
+
+    :param float latitude: Latitude, positive to the north
+    :param float longitude: Longitude, positive to the east
+    :param str start: First UTC timestamp, e.g. "2023-01-01T00:00"
+    :param int periods: Number of timestamps
+    :param int step: Time step (minutes)
+    :return: Cached site table
+    :rtype: SiteTable
+    """
+    return get_cached_site_table(
+        round(float(latitude), 4),
+        round(float(longitude), 4),
+        str(np.datetime64(start, "m")),
+        int(periods),
+        int(step),
+    )
+
+
+def get_plant_site_table(
+    plant: PowerPlant, start: str, periods: int = 8760, step: int = 60
+) -> SiteTable:
+    """
+    :param PowerPlant plant: PowerPlant class object
+    :return: Cached site table at the coordinates of the plant
+    :rtype: SiteTable
+    """
+    latitude, longitude = plant.coordinates
+    return get_site_table(latitude, longitude, start, periods, step)